@@ -12,4 +12,5 @@ setup(
     package_dir={"": "src"},
     entry_points={"console_scripts": ["prem=premierleague.cli.app:main"]},
     install_requires=requirements,
+    extras_require={"fast": ["orjson", "ijson"]},
 )
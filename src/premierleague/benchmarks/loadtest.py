@@ -0,0 +1,221 @@
+"""Load test the api client against the local stand-in server.
+
+Run with ``python -m premierleague.benchmarks.loadtest``. Many concurrent
+clients build the league, and optionally score predictions, against a
+``StandInServer`` and the latency percentiles and throughput are reported, so
+changes to caching and transport can be measured under contention.
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from premierleague.benchmarks import synthetic
+from premierleague.benchmarks.server import StandInServer, synthetic_payloads
+from premierleague.fantasyapi.api import AsyncPremierLeagueAPI
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.cache import SnapshotCache
+from premierleague.fantasyapi.transport import Transport
+from premierleague.scoring import PredictionScorer
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _scenario(name: str, predictions: Optional[List[dict]]) -> Callable[[], object]:
+    """Call made by each client: build the league, then score if asked."""
+    columns = [
+        [prediction[key] for prediction in predictions or []]
+        for key in ("name", "table", "top_scorer", "top_assister", "top_keeper")
+    ]
+
+    def league():
+        return pl_api.get_league()
+
+    def score():
+        return PredictionScorer(pl_api.get_league()).score_ids(*columns)
+
+    return {"league": league, "score": score}[name]
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> Dict[str, float]:
+    """Latency percentiles in milliseconds, throughput and error count."""
+    summary = {"calls": len(latencies), "errors": errors, "seconds": seconds}
+    summary["calls_per_second"] = len(latencies) / seconds if seconds else 0.0
+    if latencies:
+        values = np.percentile(np.array(latencies) * 1000, PERCENTILES)
+        summary.update(
+            {
+                f"p{percentile}_ms": value
+                for percentile, value in zip(PERCENTILES, values)
+            }
+        )
+        summary["max_ms"] = max(latencies) * 1000
+    return summary
+
+
+def run_threads(call: Callable[[], object], clients: int, calls: int) -> dict:
+    """Run ``calls`` calls from each of ``clients`` threads."""
+
+    def client() -> tuple:
+        latencies, errors = [], 0
+        for _ in range(calls):
+            start = time.perf_counter()
+            try:
+                call()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(lambda _: client(), range(clients)))
+    seconds = time.perf_counter() - start
+    return summarize(
+        [latency for latencies, _ in results for latency in latencies],
+        sum(errors for _, errors in results),
+        seconds,
+    )
+
+
+def run_async(clients: int, calls: int) -> dict:
+    """Run ``calls`` league builds from each of ``clients`` asyncio tasks."""
+
+    async def client() -> tuple:
+        latencies, errors = [], 0
+        for _ in range(calls):
+            start = time.perf_counter()
+            try:
+                await AsyncPremierLeagueAPI.get_league()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+        return latencies, errors
+
+    async def main() -> List[tuple]:
+        return await asyncio.gather(*(client() for _ in range(clients)))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    seconds = time.perf_counter() - start
+    return summarize(
+        [latency for latencies, _ in results for latency in latencies],
+        sum(errors for _, errors in results),
+        seconds,
+    )
+
+
+def run(
+    server: StandInServer,
+    clients: int = 8,
+    calls: int = 20,
+    scenario: str = "league",
+    mode: str = "threads",
+    cache_ttl: float = 0.0,
+    pool_size: Optional[int] = None,
+    predictions: Optional[List[dict]] = None,
+) -> dict:
+    """Load test the client against a running stand-in server.
+
+    The api client is pointed at the server with a memory-only cache and its
+    own transport for the duration of the test.
+
+    Args:
+        server (StandInServer): started server.
+        clients (int): concurrent clients.
+        calls (int): calls made by each client.
+        scenario (str): ``league`` or ``score``.
+        mode (str): ``threads`` or ``async`` clients, async clients only
+            build the league.
+        cache_ttl (float): seconds a fetched payload is served without
+            revalidating, 0 to revalidate on every call.
+        pool_size (Optional[int]): pooled connections, defaults to clients.
+        predictions (Optional[List[dict]]): predictions, as ids, scored by
+            each call of the score scenario.
+
+    Returns:
+        dict: latency percentiles, throughput, errors and the server's and
+            cache's counters.
+    """
+    saved = (pl_api.BASE_URL, pl_api.cache, pl_api.transport, pl_api.replay_payloads)
+    pl_api.BASE_URL = server.url
+    pl_api.cache = SnapshotCache(ttl=cache_ttl, cache_dir=None)
+    pl_api.transport = Transport(pool_maxsize=pool_size or clients)
+    pl_api.replay_payloads = None
+    server.stats.clear()
+    try:
+        if mode == "async":
+            summary = run_async(clients, calls)
+        else:
+            summary = run_threads(_scenario(scenario, predictions), clients, calls)
+        summary["server"] = dict(server.stats)
+        summary["cache"] = pl_api.cache.stats
+    finally:
+        pl_api.transport.close()
+        pl_api.BASE_URL, pl_api.cache, pl_api.transport, pl_api.replay_payloads = saved
+    return summary
+
+
+def main():
+    """Print the load test results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=20, help="calls per client")
+    parser.add_argument("--scenario", choices=("league", "score"), default="league")
+    parser.add_argument("--mode", choices=("threads", "async"), default="threads")
+    parser.add_argument("--cache-ttl", type=float, default=0.0)
+    parser.add_argument("--pool-size", type=int)
+    parser.add_argument("--predictions", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=700)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-etag", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payloads = synthetic_payloads(player_count=args.players, seed=args.seed)
+    server = StandInServer(
+        payloads,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        etag=not args.no_etag,
+        seed=args.seed,
+    )
+    with server:
+        summary = run(
+            server,
+            clients=args.clients,
+            calls=args.calls,
+            scenario=args.scenario,
+            mode=args.mode,
+            cache_ttl=args.cache_ttl,
+            pool_size=args.pool_size,
+            predictions=synthetic.predictions(
+                payloads["bootstrap-static/"], args.predictions, args.seed
+            ),
+        )
+    print(
+        f"{summary['calls']} call(s), {summary['errors']} error(s) in "
+        f"{summary['seconds']:.2f}s ({summary['calls_per_second']:.1f} calls/s)"
+    )
+    print("\t".join(f"P{percentile}" for percentile in PERCENTILES) + "\tMAX (ms)")
+    if summary["calls"]:
+        print(
+            "\t".join(
+                f"{summary[f'p{percentile}_ms']:.1f}" for percentile in PERCENTILES
+            )
+            + f"\t{summary['max_ms']:.1f}"
+        )
+    print(f"server: {summary['server']}")
+    print(f"cache: {summary['cache']}")
+
+
+if __name__ == "__main__":
+    main()
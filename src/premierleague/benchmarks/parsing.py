@@ -0,0 +1,89 @@
+"""Benchmark validated and trusted model construction.
+
+Run with ``python -m premierleague.benchmarks.parsing``.
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from premierleague.benchmarks import synthetic
+from premierleague.fantasyapi.objects import AllPlayers, Fixture, Team
+
+
+def measure(build: Callable[[], object], repeat: int = 5) -> Dict[str, float]:
+    """Time a build and measure its peak memory.
+
+    Args:
+        build (Callable[[], object]): builds the models.
+        repeat (int): timed runs, the best is reported.
+
+    Returns:
+        Dict[str, float]: best seconds and peak traced memory in bytes.
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build()
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    built = build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del built
+    return {"seconds": min(seconds), "peak_bytes": peak}
+
+
+def run(player_count: int = 700, team_count: int = 20, repeat: int = 5) -> dict:
+    """Benchmark both construction paths on synthetic payloads.
+
+    Args:
+        player_count (int): players in the bootstrap-static payload.
+        team_count (int): teams, which also sets the number of fixtures.
+        repeat (int): timed runs per measurement.
+
+    Returns:
+        dict: measurements per path and payload.
+    """
+    bootstrap = synthetic.bootstrap_static(team_count, player_count)
+    fixtures_raw = synthetic.fixtures(team_count)
+    builds = {
+        "validated": {
+            "players": lambda: AllPlayers(bootstrap["elements"]),
+            "teams": lambda: [Team(**team) for team in bootstrap["teams"]],
+            "fixtures": lambda: [Fixture(**fixture) for fixture in fixtures_raw],
+        },
+        "trusted": {
+            "players": lambda: AllPlayers(bootstrap["elements"], trusted=True),
+            "teams": lambda: [Team.from_trusted(team) for team in bootstrap["teams"]],
+            "fixtures": lambda: [
+                Fixture.from_trusted(fixture) for fixture in fixtures_raw
+            ],
+        },
+    }
+    return {
+        path: {name: measure(build, repeat) for name, build in path_builds.items()}
+        for path, path_builds in builds.items()
+    }
+
+
+def main():
+    """Print the parse benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=700)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.players, args.teams, args.repeat)
+    print("PATH\tPAYLOAD\tMS\tPEAK KB")
+    for path, measurements in results.items():
+        for name, measurement in measurements.items():
+            print(
+                f"{path}\t{name}\t{measurement['seconds'] * 1000:.2f}\t"
+                f"{measurement['peak_bytes'] / 1024:.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
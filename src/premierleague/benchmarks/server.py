@@ -0,0 +1,228 @@
+"""Local stand-in for the fantasy premier league api.
+
+Serves synthetic or recorded ``bootstrap-static/``, ``fixtures/`` and
+``element-summary/{id}/`` payloads with configurable latency, errors and ETag behaviour. Run with
+``python -m premierleague.benchmarks.server`` and point the client at it with
+``PREMIERLEAGUE_API_URL``.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from premierleague.benchmarks import synthetic
+
+API_PREFIX = "/api"
+
+
+def synthetic_payloads(
+    team_count: int = 20,
+    player_count: int = 700,
+    seed: int = 0,
+    element_summaries: bool = False,
+) -> Dict[str, Any]:
+    """Synthetic payloads of every served endpoint, with each player's
+    ``element-summary/{id}/`` if asked."""
+    bootstrap = synthetic.bootstrap_static(team_count, player_count, seed)
+    payloads = {
+        "bootstrap-static/": bootstrap,
+        "fixtures/": synthetic.fixtures(team_count, seed=seed),
+    }
+    if element_summaries:
+        for player_id, summary in synthetic.element_summaries(
+            bootstrap, seed=seed
+        ).items():
+            payloads[f"element-summary/{player_id}/"] = summary
+    return payloads
+
+
+def recorded_payloads(name: str = "latest") -> Dict[str, Any]:
+    """Payloads of a recorded snapshot (id, prefix or ``latest``)."""
+    from premierleague.fantasyapi.snapshot import SnapshotStore
+
+    return SnapshotStore().load(name)
+
+
+class StandInServer:
+    """Threaded http server answering api requests from fixed payloads.
+
+    Every response can be delayed by ``latency`` seconds plus up to
+    ``jitter`` more, and a ``error_rate`` fraction of requests fail with
+    ``error_status``. With ``etag`` set, responses carry an ETag and matching
+    ``If-None-Match`` requests get a 304.
+    """
+
+    def __init__(
+        self,
+        payloads: Optional[Dict[str, Any]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        etag: bool = True,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.etag = etag
+        self.stats: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, bytes] = {}
+        self._etags: Dict[str, str] = {}
+        self.set_payloads(payloads or synthetic_payloads())
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base url to point the client at."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def set_payloads(self, payloads: Dict[str, Any]):
+        """Replace the served payloads, as a matchday update would."""
+        bodies = {
+            f"{API_PREFIX}/{endpoint}": json.dumps(payload).encode()
+            for endpoint, payload in payloads.items()
+        }
+        with self._lock:
+            self._bodies = bodies
+            self._etags = {
+                path: f'"{hashlib.sha1(body).hexdigest()}"'
+                for path, body in bodies.items()
+            }
+
+    def _count(self, name: str, value: int = 1):
+        """Add to a request counter."""
+        with self._lock:
+            self.stats[name] += value
+
+    def _delay(self) -> float:
+        """Seconds to hold the next response for."""
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def _fails(self) -> bool:
+        """Whether the next request should fail."""
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _handler(self):
+        """Request handler class bound to this server."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", etag: Optional[str] = None):
+                self.send_response(status)
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                server._count("requests")
+                time.sleep(server._delay())
+                with server._lock:
+                    body = server._bodies.get(self.path)
+                    etag = server._etags.get(self.path) if server.etag else None
+                if body is None:
+                    server._count("not_found")
+                    self._send(404)
+                elif server._fails():
+                    server._count("errors")
+                    self._send(server.error_status)
+                elif etag is not None and self.headers.get("If-None-Match") == etag:
+                    server._count("not_modified")
+                    self._send(304, etag=etag)
+                else:
+                    server._count("ok")
+                    server._count("bytes_sent", len(body))
+                    self._send(200, body, etag)
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """Serve the stand-in api until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--snapshot", help="serve a recorded snapshot instead")
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--players", type=int, default=700)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-etag", action="store_true")
+    parser.add_argument(
+        "--element-summaries",
+        action="store_true",
+        help="also serve a synthetic element-summary of every player",
+    )
+    args = parser.parse_args()
+
+    payloads = (
+        recorded_payloads(args.snapshot)
+        if args.snapshot
+        else synthetic_payloads(
+            args.teams, args.players, element_summaries=args.element_summaries
+        )
+    )
+    server = StandInServer(
+        payloads,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        etag=not args.no_etag,
+    )
+    print(f"export PREMIERLEAGUE_API_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(dict(server.stats))
+
+
+if __name__ == "__main__":
+    main()
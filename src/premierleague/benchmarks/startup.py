@@ -0,0 +1,122 @@
+"""Check the startup cost of the prem cli against a budget.
+
+Run with ``python -m premierleague.benchmarks.startup``. Exits with status 1
+when the cli imports over budget or loads a heavy module at startup, so it
+can gate a change in CI.
+"""
+import argparse
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+CLI_MODULE = "premierleague.cli.app"
+# modules only sub-commands may import
+HEAVY_MODULES = (
+    "requests",
+    "urllib3",
+    "pydantic",
+    "numpy",
+    "sqlite3",
+    "premierleague.render",
+)
+# cumulative import time of the cli module in milliseconds
+DEFAULT_BUDGET_MS = 30.0
+
+
+def import_times(module: str = CLI_MODULE) -> Dict[str, Tuple[int, int]]:
+    """Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module (str): module to import.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: self and cumulative import time in
+            microseconds of every module imported.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def help_seconds(repeat: int = 5) -> float:
+    """Best wall clock time of ``prem --help`` in a fresh interpreter."""
+    command = [
+        sys.executable,
+        "-c",
+        f"import sys; from {CLI_MODULE} import main; sys.argv[1:] = ['--help']; main()",
+    ]
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def check(budget_ms: float = DEFAULT_BUDGET_MS, repeat: int = 5) -> List[str]:
+    """Check the cli import against the budget.
+
+    The import is measured ``repeat`` times and the best run is used, as the
+    first can include filling the bytecode cache.
+
+    Args:
+        budget_ms (float): most milliseconds the cli module may take to import.
+        repeat (int): measured imports.
+
+    Returns:
+        List[str]: problems found, empty when within budget.
+    """
+    runs = [import_times() for _ in range(repeat)]
+    best = min(runs, key=lambda times: times[CLI_MODULE][1])
+    problems = []
+    cumulative_ms = best[CLI_MODULE][1] / 1000
+    if cumulative_ms > budget_ms:
+        problems.append(
+            f"{CLI_MODULE} took {cumulative_ms:.1f}ms to import, "
+            f"over the {budget_ms:.1f}ms budget"
+        )
+    for module in HEAVY_MODULES:
+        if module in best:
+            problems.append(f"{module} is imported at startup")
+    return problems
+
+
+def main():
+    """Print the startup cost and fail when it is over budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports shown")
+    args = parser.parse_args()
+
+    times = import_times()
+    print("SELF MS\tCUM MS\tMODULE")
+    for name, (self_us, cumulative_us) in sorted(
+        times.items(), key=lambda item: item[1][0], reverse=True
+    )[: args.top]:
+        print(f"{self_us / 1000:.2f}\t{cumulative_us / 1000:.2f}\t{name}")
+    print(f"prem --help: {help_seconds(args.repeat) * 1000:.1f}ms")
+
+    problems = check(args.budget_ms, args.repeat)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"OK: within the {args.budget_ms:.1f}ms import budget")
+
+
+if __name__ == "__main__":
+    main()
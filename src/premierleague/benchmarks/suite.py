@@ -0,0 +1,271 @@
+"""Benchmark suite of the hot paths on synthetic payloads.
+
+Run with ``python -m premierleague.benchmarks.suite``. Every run is appended
+as one JSON line to a history file and compared with the last run at the
+same scale, so regressions show up from run to run.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from premierleague.benchmarks import synthetic
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.objects import AllPlayers
+from premierleague.predictions import Validator
+from premierleague.scoring import PredictionScorer
+
+DEFAULT_HISTORY = Path(
+    os.environ.get("PREMIERLEAGUE_BENCHMARK_HISTORY", "benchmark-history.jsonl")
+)
+# slowdown over the previous run reported as a regression
+REGRESSION_THRESHOLD = 0.2
+
+
+@dataclass
+class Scale:
+    """Size of the synthetic payloads."""
+
+    teams: int = 20
+    players: int = 700
+    rounds: int = 2
+    predictions: int = 10000
+    seed: int = 0
+
+
+class Workload:
+    """Synthetic payloads and the models built from them.
+
+    The payloads are served to the api client as a replayed snapshot, so the
+    benchmarks go through the same code paths as the cli without a network.
+    """
+
+    def __init__(self, scale: Scale):
+        self.bootstrap = synthetic.bootstrap_static(
+            scale.teams, scale.players, scale.seed
+        )
+        self.fixtures_raw = synthetic.fixtures(
+            scale.teams, scale.rounds, seed=scale.seed
+        )
+        self.predictions = synthetic.predictions(
+            self.bootstrap, scale.predictions, scale.seed
+        )
+        pl_api.replay_payloads = {
+            "bootstrap-static/": self.bootstrap,
+            "fixtures/": self.fixtures_raw,
+        }
+        self.league = pl_api.get_league()
+        self.players = self.league.players
+        self.scorer = PredictionScorer(self.league)
+        self.validator = Validator()
+        names = [player.name for player in self.players.players]
+        # exact, differently cased and accent-free spellings, then typos
+        self.lookups = names[::3] + [name.upper() for name in names[1::3]]
+        self.lookups += [name.replace("ø", "o").replace("á", "a") for name in names]
+        self.typos = [
+            name[:-2] + name[-1:] for name in names[:: max(1, len(names) // 50)]
+        ]
+
+    def benchmarks(self) -> Dict[str, Callable[[], object]]:
+        """Hot paths to time by name."""
+        return {
+            "parse_players": lambda: AllPlayers(self.bootstrap["elements"]),
+            "parse_players_trusted": lambda: AllPlayers(
+                self.bootstrap["elements"], trusted=True
+            ),
+            "get_fixtures": pl_api.get_fixtures,
+            "calculate_team_stats": self.league.calculate_team_stats,
+            "league_table": self.league_table,
+            "top_n": self.top_n,
+            "validate_names": self.validate_names,
+            "suggest_names": self.suggest_names,
+            "score_predictions": self.score_predictions,
+        }
+
+    def league_table(self) -> list:
+        """Sort the table from scratch."""
+        self.league._stats_changed()
+        return self.league.table
+
+    def top_n(self) -> list:
+        """Every top-N query of the cli."""
+        return [
+            self.players.get_top_scorers(),
+            self.players.get_top_assisters(),
+            self.players.get_keepers_with_most_clean_sheets(),
+            self.players.top_k("total_points", 10),
+        ]
+
+    def validate_names(self) -> int:
+        """Look up every player name in some spelling."""
+        index = self.validator.player_index
+        return sum(name in index for name in self.lookups)
+
+    def suggest_names(self) -> list:
+        """Suggest names for mistyped players."""
+        index = self.validator.player_index
+        return [index.suggest(name) for name in self.typos]
+
+    def score_predictions(self) -> list:
+        """Score every prediction."""
+        return self.scorer.score_ids(
+            *(
+                [prediction[key] for prediction in self.predictions]
+                for key in ("name", "table", "top_scorer", "top_assister", "top_keeper")
+            )
+        )
+
+
+def time_call(call: Callable[[], object], repeat: int = 5) -> Dict[str, float]:
+    """Best and mean milliseconds of a call."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - start)
+    return {
+        "best_ms": min(seconds) * 1000,
+        "mean_ms": sum(seconds) / len(seconds) * 1000,
+    }
+
+
+def _commit() -> Optional[str]:
+    """Short hash of the checked out commit, if in a git repository."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def run(scale: Scale, repeat: int = 5, only: Optional[List[str]] = None) -> dict:
+    """Time the benchmarks at a scale.
+
+    Args:
+        scale (Scale): size of the synthetic payloads.
+        repeat (int): timed runs of each benchmark.
+        only (Optional[List[str]]): names of the benchmarks to run, all if
+            not given.
+
+    Returns:
+        dict: history record with the environment, scale and timings.
+    """
+    replay_payloads = pl_api.replay_payloads
+    try:
+        workload = Workload(scale)
+        results = {
+            name: time_call(call, repeat)
+            for name, call in workload.benchmarks().items()
+            if not only or name in only
+        }
+    finally:
+        pl_api.replay_payloads = replay_payloads
+    return {
+        "timestamp": time.time(),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": asdict(scale),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def read_history(path: Path = DEFAULT_HISTORY) -> List[dict]:
+    """Read every recorded run, oldest first."""
+    if not path.exists():
+        return []
+    with open(path, "r") as history_file:
+        return [json.loads(line) for line in history_file if line.strip()]
+
+
+def append_history(record: dict, path: Path = DEFAULT_HISTORY):
+    """Append a run to the history."""
+    with open(path, "a") as history_file:
+        history_file.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def regressions(
+    record: dict, previous: dict, threshold: float = REGRESSION_THRESHOLD
+) -> List[str]:
+    """Benchmarks that got slower than a previous run by over a threshold.
+
+    Args:
+        record (dict): the new run.
+        previous (dict): run to compare with.
+        threshold (float): relative slowdown reported.
+
+    Returns:
+        List[str]: description of each regression.
+    """
+    found = []
+    for name, result in record["results"].items():
+        before = previous["results"].get(name)
+        if before is None or not before["best_ms"]:
+            continue
+        change = result["best_ms"] / before["best_ms"] - 1
+        if change > threshold:
+            found.append(
+                f"{name}: {before['best_ms']:.3f}ms -> {result['best_ms']:.3f}ms "
+                f"(+{change:.0%}) since {previous.get('commit') or 'last run'}"
+            )
+    return found
+
+
+def main():
+    """Run the suite, record it and report regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=Scale.teams)
+    parser.add_argument("--players", type=int, default=Scale.players)
+    parser.add_argument("--rounds", type=int, default=Scale.rounds)
+    parser.add_argument("--predictions", type=int, default=Scale.predictions)
+    parser.add_argument("--seed", type=int, default=Scale.seed)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="benchmarks to run")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument(
+        "--no-record", action="store_true", help="do not append to the history"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="relative slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+
+    scale = Scale(args.teams, args.players, args.rounds, args.predictions, args.seed)
+    record = run(scale, args.repeat, args.only)
+    print("BENCHMARK\tBEST MS\tMEAN MS")
+    for name, result in record["results"].items():
+        print(f"{name}\t{result['best_ms']:.3f}\t{result['mean_ms']:.3f}")
+
+    comparable = [
+        previous
+        for previous in read_history(args.history)
+        if previous["scale"] == record["scale"]
+    ]
+    if not args.no_record:
+        append_history(record, args.history)
+    if not comparable:
+        return
+    found = regressions(record, comparable[-1], args.threshold)
+    for regression in found:
+        print(f"REGRESSION: {regression}")
+    if found:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""Synthetic fantasy premier league api payloads."""
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+FIRST_NAMES = [
+    "Bukayo",
+    "Martin",
+    "Mohamed",
+    "Erling",
+    "Kevin",
+    "Heung-Min",
+    "Ollie",
+    "Bruno",
+    "Alisson",
+    "José",
+    "Emiliano",
+    "Jordan",
+    "Virgil",
+    "Trent",
+    "Kieran",
+    "Declan",
+    "Rodrigo",
+    "Phil",
+    "Marcus",
+    "Bernardo",
+]
+SECOND_NAMES = [
+    "Saka",
+    "Ødegaard",
+    "Salah",
+    "Haaland",
+    "De Bruyne",
+    "Son",
+    "Watkins",
+    "Fernandes",
+    "Becker",
+    "Sá",
+    "Martínez",
+    "Pickford",
+    "van Dijk",
+    "Alexander-Arnold",
+    "Trippier",
+    "Rice",
+    "Hernández",
+    "Foden",
+    "Rashford",
+    "Silva",
+]
+# integer stats sent for every player by bootstrap-static
+INT_STATS = [
+    "chance_of_playing_next_round",
+    "chance_of_playing_this_round",
+    "code",
+    "cost_change_event",
+    "cost_change_event_fall",
+    "cost_change_start",
+    "cost_change_start_fall",
+    "dreamteam_count",
+    "event_points",
+    "now_cost",
+    "squad_number",
+    "team_code",
+    "total_points",
+    "transfers_in",
+    "transfers_in_event",
+    "transfers_out",
+    "transfers_out_event",
+    "minutes",
+    "goals_conceded",
+    "own_goals",
+    "penalties_saved",
+    "penalties_missed",
+    "yellow_cards",
+    "red_cards",
+    "saves",
+    "bonus",
+    "bps",
+    "starts",
+    "influence_rank",
+    "influence_rank_type",
+    "creativity_rank",
+    "creativity_rank_type",
+    "threat_rank",
+    "threat_rank_type",
+    "ict_index_rank",
+    "ict_index_rank_type",
+    "now_cost_rank",
+    "form_rank",
+    "selected_rank",
+]
+# decimal stats bootstrap-static sends as strings
+STRING_STATS = [
+    "ep_next",
+    "ep_this",
+    "form",
+    "points_per_game",
+    "selected_by_percent",
+    "value_form",
+    "value_season",
+    "influence",
+    "creativity",
+    "threat",
+    "ict_index",
+    "expected_goals",
+    "expected_assists",
+    "expected_goal_involvements",
+    "expected_goals_conceded",
+]
+
+
+def teams(rng: random.Random, team_count: int = 20) -> List[dict]:
+    """Raw teams as sent in bootstrap-static."""
+    return [
+        {
+            "id": team_id,
+            "code": team_id * 3,
+            "name": f"Team {team_id:03d}",
+            "short_name": f"T{team_id:02d}"[-3:],
+            "played": 0,
+            "points": 0,
+            "position": 0,
+            "draw": 0,
+            "win": 0,
+            "loss": 0,
+            "form": None,
+            "strength": rng.randint(2, 5),
+            "strength_overall_home": rng.randint(1000, 1400),
+            "strength_overall_away": rng.randint(1000, 1400),
+            "pulse_id": team_id,
+            "unavailable": False,
+        }
+        for team_id in range(1, team_count + 1)
+    ]
+
+
+def players(
+    rng: random.Random, player_count: int = 700, team_count: int = 20
+) -> List[dict]:
+    """Raw players as sent in bootstrap-static."""
+    elements = []
+    for player_id in range(1, player_count + 1):
+        element_type = rng.choices((1, 2, 3, 4), weights=(1, 3, 4, 2))[0]
+        element = {
+            "id": player_id,
+            "first_name": rng.choice(FIRST_NAMES),
+            "second_name": f"{rng.choice(SECOND_NAMES)} {player_id}",
+            "web_name": f"Player {player_id}",
+            "element_type": element_type,
+            "team": rng.randint(1, team_count),
+            "goals_scored": rng.randint(0, 4 * element_type),
+            "assists": rng.randint(0, 3 * element_type),
+            "clean_sheets": rng.randint(0, 15),
+            "status": "a",
+            "news": "",
+            "news_added": None,
+            "photo": f"{player_id}.jpg",
+            "in_dreamteam": False,
+            "special": False,
+        }
+        element.update({stat: rng.randint(0, 3000) for stat in INT_STATS})
+        element.update({stat: f"{rng.uniform(0, 100):.1f}" for stat in STRING_STATS})
+        elements.append(element)
+    return elements
+
+
+def bootstrap_static(
+    team_count: int = 20, player_count: int = 700, seed: int = 0
+) -> dict:
+    """Synthetic bootstrap-static payload.
+
+    Args:
+        team_count (int): number of teams.
+        player_count (int): number of players.
+        seed (int): random seed.
+
+    Returns:
+        dict: payload with the sections and fields of the real endpoint.
+    """
+    rng = random.Random(seed)
+    return {
+        "events": [
+            {"id": event, "name": f"Gameweek {event}", "finished": False}
+            for event in range(1, 2 * (team_count - 1) + 1)
+        ],
+        "game_settings": {"league_join_private_max": 25},
+        "phases": [{"id": 1, "name": "Overall"}],
+        "teams": teams(rng, team_count),
+        "total_players": 10000000,
+        "elements": players(rng, player_count, team_count),
+        "element_stats": [{"label": stat, "name": stat} for stat in INT_STATS],
+        "element_types": [
+            {"id": position, "singular_name": name}
+            for position, name in enumerate(
+                ("Goalkeeper", "Defender", "Midfielder", "Forward"), 1
+            )
+        ],
+    }
+
+
+def fixtures(
+    team_count: int = 20,
+    rounds: int = 2,
+    played_fraction: float = 0.6,
+    seed: int = 0,
+) -> List[dict]:
+    """Synthetic fixtures payload of round robin seasons.
+
+    Args:
+        team_count (int): number of teams, made even by adding a bye.
+        rounds (int): times every team plays every other, alternating venue.
+        played_fraction (float): fraction of gameweeks already finished.
+        seed (int): random seed.
+
+    Returns:
+        List[dict]: fixtures with the fields of the real endpoint.
+    """
+    rng = random.Random(seed)
+    team_ids = list(range(1, team_count + 1)) + ([None] if team_count % 2 else [])
+    start = datetime(2023, 8, 11, 19, tzinfo=timezone.utc)
+    events = rounds * (len(team_ids) - 1)
+    played_events = int(events * played_fraction)
+    raw_fixtures = []
+    # circle method, rotating every team but the first each gameweek
+    rotation = team_ids[:]
+    for event in range(1, events + 1):
+        half = len(rotation) // 2
+        for home, away in zip(rotation[:half], reversed(rotation[half:])):
+            if home is None or away is None:
+                continue
+            if ((event - 1) // (len(team_ids) - 1)) % 2:
+                home, away = away, home
+            finished = event <= played_events
+            kickoff = start + timedelta(
+                days=7 * (event - 1), hours=len(raw_fixtures) % 5
+            )
+            raw_fixtures.append(
+                {
+                    "code": 2000000 + len(raw_fixtures),
+                    "event": event,
+                    "finished": finished,
+                    "finished_provisional": finished,
+                    "id": len(raw_fixtures) + 1,
+                    "kickoff_time": kickoff.isoformat().replace("+00:00", "Z"),
+                    "minutes": 90 if finished else 0,
+                    "provisional_start_time": False,
+                    "started": finished,
+                    "team_a": away,
+                    "team_a_score": rng.randint(0, 3) if finished else None,
+                    "team_h": home,
+                    "team_h_score": rng.randint(0, 4) if finished else None,
+                    "stats": [],
+                    "team_h_difficulty": rng.randint(2, 5),
+                    "team_a_difficulty": rng.randint(2, 5),
+                    "pulse_id": 90000 + len(raw_fixtures),
+                }
+            )
+        rotation = [rotation[0], rotation[-1]] + rotation[1:-1]
+    return raw_fixtures
+
+
+def element_summaries(
+    bootstrap: dict, gameweeks: int = 38, seed: int = 0
+) -> Dict[int, dict]:
+    """Synthetic element-summary payloads of every player in a bootstrap-static.
+
+    Args:
+        bootstrap (dict): payload whose players get a match history.
+        gameweeks (int): gameweeks played so far.
+        seed (int): random seed.
+
+    Returns:
+        Dict[int, dict]: payload of each player id, with a ``history`` of one
+            fixture per gameweek the player appeared in.
+    """
+    rng = random.Random(seed)
+    summaries = {}
+    for player in bootstrap["elements"]:
+        attacking = player["element_type"] - 1
+        history = []
+        for gameweek in range(1, gameweeks + 1):
+            if rng.random() < 0.2:
+                continue
+            minutes = rng.choice((90, 90, 90, 75, 60, 20))
+            goals_conceded = rng.randint(0, 3)
+            goals = rng.choices((0, 1, 2), weights=(12 - 3 * attacking, attacking, 1))[
+                0
+            ]
+            assists = rng.choices((0, 1), weights=(10 - 2 * attacking, attacking + 1))[
+                0
+            ]
+            history.append(
+                {
+                    "element": player["id"],
+                    "fixture": gameweek * 10 + player["team"] % 10,
+                    "opponent_team": rng.randint(1, len(bootstrap["teams"])),
+                    "round": gameweek,
+                    "was_home": rng.random() < 0.5,
+                    "minutes": minutes,
+                    "goals_scored": goals,
+                    "assists": assists,
+                    "clean_sheets": int(goals_conceded == 0 and minutes >= 60),
+                    "goals_conceded": goals_conceded,
+                    "own_goals": 0,
+                    "penalties_saved": 0,
+                    "penalties_missed": 0,
+                    "yellow_cards": int(rng.random() < 0.1),
+                    "red_cards": 0,
+                    "saves": rng.randint(0, 6) if player["element_type"] == 1 else 0,
+                    "bonus": rng.randint(0, 3),
+                    "bps": rng.randint(0, 40),
+                    "total_points": rng.randint(1, 15),
+                    "influence": f"{rng.uniform(0, 60):.1f}",
+                    "value": player["now_cost"],
+                }
+            )
+        summaries[player["id"]] = {
+            "fixtures": [],
+            "history": history,
+            "history_past": [],
+        }
+    return summaries
+
+
+def predictions(
+    bootstrap: dict, prediction_count: int = 1000, seed: int = 0
+) -> List[dict]:
+    """Synthetic predictions of a bootstrap-static payload, as ids.
+
+    Args:
+        bootstrap (dict): payload whose teams and players are predicted.
+        prediction_count (int): number of predictions.
+        seed (int): random seed.
+
+    Returns:
+        List[dict]: predictions with a name, team ids in table order and the
+            ids of the predicted top scorer, assister and keeper.
+    """
+    rng = random.Random(seed)
+    team_ids = [team["id"] for team in bootstrap["teams"]]
+    player_ids = [player["id"] for player in bootstrap["elements"]]
+    keeper_ids = [
+        player["id"] for player in bootstrap["elements"] if player["element_type"] == 1
+    ] or player_ids
+    raw_predictions = []
+    for number in range(prediction_count):
+        table = team_ids[:]
+        rng.shuffle(table)
+        raw_predictions.append(
+            {
+                "name": f"Predictor {number:06d}",
+                "table": table,
+                "top_scorer": rng.choice(player_ids),
+                "top_assister": rng.choice(player_ids),
+                "top_keeper": rng.choice(keeper_ids),
+            }
+        )
+    return raw_predictions
+
+
+def season_archive(
+    directory: Path,
+    season_count: int = 20,
+    team_count: int = 20,
+    player_count: int = 700,
+    seed: int = 0,
+) -> List[Path]:
+    """Write an archive of finished synthetic seasons.
+
+    Args:
+        directory (Path): archive directory to write the seasons to.
+        season_count (int): number of seasons.
+        team_count (int): teams per season.
+        player_count (int): players per season.
+        seed (int): random seed.
+
+    Returns:
+        List[Path]: directory of each season.
+    """
+    season_dirs = []
+    for number in range(season_count):
+        year = 2000 + number
+        season_dir = Path(directory) / f"{year}-{(year + 1) % 100:02d}"
+        season_dir.mkdir(parents=True, exist_ok=True)
+        bootstrap = bootstrap_static(team_count, player_count, seed + number)
+        raw_fixtures = fixtures(team_count, played_fraction=1.0, seed=seed + number)
+        with open(season_dir / "bootstrap-static.json", "w") as bootstrap_file:
+            json.dump(
+                {key: bootstrap[key] for key in ("teams", "elements")}, bootstrap_file
+            )
+        with open(season_dir / "fixtures.json", "w") as fixtures_file:
+            json.dump(raw_fixtures, fixtures_file)
+        season_dirs.append(season_dir)
+    return season_dirs
@@ -1,39 +1,132 @@
-"""Cli application."""
+"""Cli application.
+
+Only argparse is imported at module load. The api client pulls in requests,
+pydantic and numpy, so it and everything built on it are imported inside the
+sub-commands that use them, keeping ``prem --help`` and invalid commands fast.
+Check the startup cost with ``python -m premierleague.benchmarks.startup``.
+"""
 import argparse
+import sys
+
+# output formats of premierleague.render, which is imported only when used
+FORMATS = ("text", "json", "csv")
+
+
+def positive_int(value: str) -> int:
+    """Argparse type of integers of at least one."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def pl_api():
+    """Import the api client on first use."""
+    from premierleague.fantasyapi.api import PremierLeagueAPI
+
+    return PremierLeagueAPI
 
-from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
 
+def snapshot_id(args):
+    """Id of the snapshot the command runs against, without recording one.
 
-def display_table():
+    The replayed snapshot, or the stored snapshot of the current api payloads.
+    None if those were never recorded with ``prem snapshot record``.
+    """
+    if args.replay:
+        from premierleague.fantasyapi.snapshot import SnapshotStore
+
+        return SnapshotStore().resolve(args.replay)
+    return pl_api().recorded_id()
+
+
+def display_table(fmt: str = "text"):
     """Display premier league table."""
-    pl_api.get_league().display_table()
+    pl_api().get_league().display_table(fmt)
+
 
+def display_gameweek_tables(fmt: str = "text"):
+    """Display the premier league table after every gameweek."""
+    pl_api().get_league().display_gameweek_tables(fmt)
 
-def top_scorers():
+
+def top_scorers(fmt: str = "text"):
     """Display top scorers."""
-    pl_api.get_players().display_top_scorers()
+    pl_api().get_players().display_top_scorers(fmt)
 
 
-def top_assisters():
+def top_assisters(fmt: str = "text"):
     """Display top assisters."""
-    pl_api.get_players().display_top_assisters()
+    pl_api().get_players().display_top_assisters(fmt)
 
 
-def top_keepers():
+def top_keepers(fmt: str = "text"):
     """Display keepers with most clean sheets."""
-    pl_api.get_players().display_keepers_with_most_clean_sheets()
+    pl_api().get_players().display_keepers_with_most_clean_sheets(fmt)
+
+
+def simulate(runs: int, workers: int = None, benchmark: bool = False):
+    """Simulate the rest of the season."""
+    from premierleague.predictions import Prediction
+    from premierleague.simulation import SeasonSimulator
+
+    simulator = SeasonSimulator(pl_api().get_league())
+    if benchmark:
+        print("WORKERS\tSECONDS\tRUNS/S\tSPEEDUP")
+        for result in simulator.benchmark(runs, workers):
+            print(
+                f"{result['workers']}\t{result['seconds']:.2f}\t"
+                f"{result['runs_per_second']:.0f}\t{result['speedup']:.2f}"
+            )
+    else:
+        simulator.run(runs, workers).display(Prediction.read_all())
+
+
+def ratings(gameweek: int = None, backtest: bool = False, fmt: str = "text"):
+    """Display team ratings, or backtest rating parameters on the season."""
+    from premierleague import render
+    from premierleague.fantasyapi.objects import FixtureColumns
+    from premierleague.ratings import RatingsEngine, grid_search
+
+    league = pl_api().get_league()
+    if backtest:
+        finished = [fixture for fixture in league.fixtures if fixture.finished]
+        columns = FixtureColumns.from_fixtures(finished, league.team_index)
+        results = grid_search(
+            columns,
+            len(league.teams),
+            ks=[10, 15, 20, 30, 40],
+            home_advantages=[0, 30, 60, 90],
+            poisson_rates=[0.01, 0.02, 0.05, 0.1],
+        )
+        print("K\tHOME\tRATE\tBRIER\tLOG LOSS")
+        for params, brier, log_loss in results[:10]:
+            print(
+                f"{params.k:.0f}\t{params.home_advantage:.0f}\t"
+                f"{params.poisson_rate:.2f}\t{brier:.4f}\t{log_loss:.4f}"
+            )
+        return
+    engine = RatingsEngine(league.teams)
+    engine.update(league.fixtures)
+    render.ratings(engine.table(gameweek)).write(fmt)
 
 
 def league(args):
     """Handles league commands."""
     if args.option == "table":
-        display_table()
+        display_table(args.format)
+    elif args.option == "gameweeks":
+        display_gameweek_tables(args.format)
     elif args.option == "topscorer":
-        top_scorers()
+        top_scorers(args.format)
     elif args.option == "topassister":
-        top_assisters()
+        top_assisters(args.format)
     elif args.option == "topkeeper":
-        top_keepers()
+        top_keepers(args.format)
+    elif args.option == "ratings":
+        ratings(args.gameweek, args.backtest, args.format)
+    elif args.option == "simulate":
+        simulate(args.runs, args.workers, args.benchmark)
     else:
         print(f"{args.option} is an invalid argument.")
 
@@ -42,24 +135,291 @@ def prediction(args):
     """Handles predictions."""
     if args.option == "add":
         print("This would do something...")
+    elif args.option == "score":
+        from premierleague.scoring import PredictionScorer
+        from premierleague.store import PredictionStore
+
+        scorer = PredictionScorer.from_api()
+        if args.file is not None:
+            report = scorer.score_directory(args.file)
+        else:
+            with PredictionStore() as store:
+                report = scorer.score_store(store)
+        report.display(args.format)
+    elif args.option == "leaderboard":
+        from premierleague.leaderboard import Leaderboard
+        from premierleague.scoring import PredictionScorer
+        from premierleague.store import PredictionStore
+
+        with PredictionStore() as store:
+            Leaderboard(store, PredictionScorer.from_api()).rank().display(args.format)
+    elif args.option == "migrate":
+        from premierleague.store import PredictionStore
+
+        snapshot = snapshot_id(args)
+        with PredictionStore() as store:
+            imported = store.import_json(snapshot=snapshot)
+            print(f"Imported {imported} prediction(s) into {store.path}")
+    elif args.option == "import":
+        from premierleague.importer import Reference, import_predictions
+        from premierleague.store import PredictionStore
+
+        if args.file is None:
+            print("Give a .csv or .jsonl file of predictions to import.")
+            return
+        reference = Reference.from_api(snapshot_id(args))
+        with PredictionStore() as store:
+            import_predictions(args.file, store, reference, args.workers).display()
+    else:
+        print(f"{args.option} is an invalid argument.")
+
+
+def snapshot(args):
+    """Handles snapshot commands."""
+    if args.option == "record":
+        print(pl_api().record())
+    elif args.option == "list":
+        from premierleague.fantasyapi.snapshot import SnapshotStore
+
+        for snapshot_id in SnapshotStore().list():
+            print(snapshot_id)
+    else:
+        print(f"{args.option} is an invalid argument.")
+
+
+def history(args):
+    """Summarize archived seasons and backtest table predictions on them."""
+    from premierleague.history import STRATEGIES, SeasonArchive, backtest
+
+    summaries = SeasonArchive(args.directory).load(workers=args.workers)
+    print("SEASON\tCHAMPION\tPOINTS\tTOP SCORER\tGOALS")
+    for season, summary in summaries.items():
+        champion = summary.final_table()[0]
+        scorers = summary.leader_names["goals_scored"]
+        goals = summary.leader_values["goals_scored"]
+        print(
+            f"{season}\t{champion[0]}\t{champion[-1]}\t"
+            + (f"{scorers[0]}\t{goals[0]}" if len(scorers) else "-\t-")
+        )
+    for name, strategy in STRATEGIES.items():
+        results = backtest(summaries, strategy)
+        if results:
+            correct = sum(teams for _, teams in results) / len(results)
+            print(
+                f"{name}: {correct:.2f} teams in the correct position per season "
+                f"over {len(results)} season(s)"
+            )
+
+
+def players(args):
+    """Ingest per-gameweek player stats or rank players over gameweeks."""
+    from premierleague.player_history import PlayerHistoryStore
+
+    if args.option == "ingest":
+        import asyncio
+
+        from premierleague.player_history import PlayerHistoryIngester
+
+        store = PlayerHistoryStore.create(pl_api().get_players_raw_data())
+        ingester = PlayerHistoryIngester(store, args.concurrency, args.rate)
+        ingested = asyncio.run(ingester.run())
+        print(
+            f"Ingested {ingested} player(s) into {store.directory}, "
+            f"{len(store.pending())} left"
+        )
+        for player_id, error in ingester.failed.items():
+            print(f"{player_id}: {error}")
+    elif args.option == "top":
+        try:
+            store = PlayerHistoryStore()
+        except FileNotFoundError:
+            print("No player history yet, run `prem players ingest` first.")
+            return
+        last = args.last if args.last is not None else store.gameweeks
+        print(f"PLAYER\t{args.stat.upper()} (GW {args.first}-{last})")
+        for _, name, value in store.top_k(
+            args.stat, args.count, args.first, last, args.position
+        ):
+            print(f"{name}\t{value}")
+    else:
+        print(f"{args.option} is an invalid argument.")
+
+
+def serve(args):
+    """Serve the table, stats and leaderboard over local http."""
+    import asyncio
+
+    from premierleague.serve import LeagueServer
+
+    server = LeagueServer(args.host, args.port, args.interval)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
 
 
 def main():
     """Main method accessed by cli."""
     # top-level parser
     parser = argparse.ArgumentParser(description="View premier league statistics.")
+    parser.add_argument(
+        "--replay",
+        metavar="SNAPSHOT",
+        help="run from a recorded snapshot (id, prefix or 'latest') without network",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print where the command spent its time",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=("text", "json", "chrome"),
+        default="text",
+        help="span tree (default), json or chrome trace event format",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="write the profile to a file instead of stderr",
+    )
     subparsers = parser.add_subparsers(help="sub-command help")
 
     # league sub-command parser
     league_parser = subparsers.add_parser("league", help="TODO: add league help")
     league_parser.add_argument("option", help="TODO: list options")
+    league_parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="output of table, gameweeks and the top player options",
+    )
+    league_parser.add_argument(
+        "--gameweek", type=int, help="ratings as they were after a gameweek"
+    )
+    league_parser.add_argument(
+        "--backtest",
+        action="store_true",
+        help="score rating parameters on the results so far",
+    )
+    league_parser.add_argument(
+        "--runs", type=positive_int, default=10000, help="seasons to simulate"
+    )
+    league_parser.add_argument(
+        "--workers", type=int, help="simulation processes, defaults to cpu count"
+    )
+    league_parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="time the simulation with increasing numbers of workers",
+    )
     league_parser.set_defaults(func=league)
 
     # predictions sub-command parser
     prediction_parser = subparsers.add_parser("prediction")
     prediction_parser.add_argument("option", help="TODO: add help for predictions")
+    prediction_parser.add_argument(
+        "file",
+        nargs="?",
+        help="csv or jsonl file of predictions to import, or directory of saved "
+        "prediction JSON files to score instead of the store",
+    )
+    prediction_parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="output of score and leaderboard",
+    )
+    prediction_parser.add_argument(
+        "--workers", type=int, help="validation processes, defaults to cpu count"
+    )
     prediction_parser.set_defaults(func=prediction)
 
+    # snapshot sub-command parser
+    snapshot_parser = subparsers.add_parser(
+        "snapshot",
+        help="record api payloads for offline replay",
+        description="Record api payloads for offline replay. Only the teams "
+        "and players of bootstrap-static are kept, with the fields the models "
+        "use and every numeric field; events, element types and the other "
+        "player fields are dropped. Snapshots recorded by older versions with "
+        "the full payload cannot be replayed.",
+    )
+    snapshot_parser.add_argument("option", help="record or list")
+    snapshot_parser.set_defaults(func=snapshot)
+
+    # history sub-command parser
+    history_parser = subparsers.add_parser(
+        "history", help="analyse a directory of archived seasons"
+    )
+    history_parser.add_argument("directory", help="one subdirectory per season")
+    history_parser.add_argument(
+        "--workers", type=int, help="processes, defaults to cpu count"
+    )
+    history_parser.set_defaults(func=history)
+
+    # players sub-command parser
+    players_parser = subparsers.add_parser("players", help="per-gameweek player stats")
+    players_parser.add_argument("option", help="ingest or top")
+    players_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="requests in flight, capped at the connection pool size",
+    )
+    players_parser.add_argument(
+        "--rate", type=float, default=10.0, help="requests started per second"
+    )
+    players_parser.add_argument("--stat", default="goals_scored")
+    players_parser.add_argument("--from", dest="first", type=int, default=1)
+    players_parser.add_argument("--to", dest="last", type=int)
+    players_parser.add_argument("--count", type=int, default=10)
+    players_parser.add_argument(
+        "--position", type=int, choices=(1, 2, 3, 4), help="element type"
+    )
+    players_parser.set_defaults(func=players)
+
+    # serve sub-command parser
+    serve_parser = subparsers.add_parser(
+        "serve", help="serve the table, stats and leaderboard as local json"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument(
+        "--interval", type=float, default=60.0, help="seconds between refreshes"
+    )
+    serve_parser.set_defaults(func=serve)
+
     # handle args
     args = parser.parse_args()
+    if args.profile:
+        profile(args)
+    else:
+        run(args)
+
+
+def run(args):
+    """Run the parsed command."""
+    if args.replay:
+        pl_api().replay(args.replay)
     args.func(args)
+
+
+def profile(args):
+    """Run the parsed command with tracing on and write out the spans."""
+    from premierleague import tracing
+
+    tracing.enable()
+    try:
+        with tracing.span("prem", argv=" ".join(sys.argv[1:])):
+            # otherwise hidden in the first span that uses the api
+            with tracing.span("import api"):
+                pl_api()
+            run(args)
+    finally:
+        report = tracing.tracer.export(args.profile_format)
+        if args.profile_output:
+            with open(args.profile_output, "w") as profile_file:
+                profile_file.write(report + "\n")
+        else:
+            print(report, file=sys.stderr)
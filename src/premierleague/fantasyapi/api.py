@@ -1,48 +1,242 @@
 """Premier league api."""
-from typing import List
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import requests
 
-from premierleague.fantasyapi.objects import AllPlayers, Fixture, League, Team
+from premierleague import tracing
+from premierleague.fantasyapi.cache import CacheEntry, SnapshotCache
+from premierleague.fantasyapi.decoding import (
+    STREAMING,
+    decode_bootstrap,
+    decode_json,
+    is_decoded_bootstrap,
+)
+from premierleague.fantasyapi.objects import (
+    AllPlayers,
+    Fixture,
+    League,
+    ModelT,
+    Team,
+)
+from premierleague.fantasyapi.snapshot import SnapshotStore, snapshot_id
+from premierleague.fantasyapi.transport import Transport
 
 
 class PremierLeagueAPI:
     """Class to interact with fantasy premier league api."""
 
-    BASE_URL = "https://fantasy.premierleague.com/api"
+    BASE_URL = os.environ.get(
+        "PREMIERLEAGUE_API_URL", "https://fantasy.premierleague.com/api"
+    )
+    SNAPSHOT_ENDPOINTS = ("bootstrap-static/", "fixtures/")
+    DECODERS = {"bootstrap-static/": decode_bootstrap}
+    cache = SnapshotCache()
+    transport = Transport()
+    # api payloads are built into models without validation unless set
+    validate_payloads = bool(os.environ.get("PREMIERLEAGUE_VALIDATE"))
+    replay_payloads: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def record(cls, store: Optional[SnapshotStore] = None) -> str:
+        """Fetch every snapshot endpoint and record it.
+
+        Payloads are recorded as decoded, so bootstrap-static keeps only the
+        teams and players with their model and numeric fields.
+
+        Args:
+            store (Optional[SnapshotStore]): store to record to.
+
+        Returns:
+            str: id of the recorded snapshot.
+        """
+        store = store or SnapshotStore()
+        return store.record(cls._snapshot_payloads())
+
+    @classmethod
+    def recorded_id(cls, store: Optional[SnapshotStore] = None) -> Optional[str]:
+        """Get the id of the stored snapshot of the current payloads.
+
+        Nothing is recorded, so read-only commands can reference the snapshot
+        they ran against without writing one on every run.
+
+        Args:
+            store (Optional[SnapshotStore]): store to look the snapshot up in.
+
+        Returns:
+            Optional[str]: id of the snapshot, None if it was never recorded.
+        """
+        store = store or SnapshotStore()
+        snap_id = snapshot_id(cls._snapshot_payloads())
+        return snap_id if snap_id in store.list() else None
+
+    @classmethod
+    def _snapshot_payloads(cls) -> Dict[str, Any]:
+        """Current payload of every snapshot endpoint."""
+        return {
+            endpoint: cls._get_json(endpoint) for endpoint in cls.SNAPSHOT_ENDPOINTS
+        }
+
+    @classmethod
+    def replay(cls, name: str, store: Optional[SnapshotStore] = None):
+        """Serve every request from a recorded snapshot instead of the network.
+
+        Snapshots recorded with the full bootstrap-static payload, before it
+        was decoded to the used sections, are rejected so a replay always
+        sees the same data as a live run.
+
+        Args:
+            name (str): snapshot id, prefix of one, or ``latest``.
+            store (Optional[SnapshotStore]): store to replay from.
+        """
+        store = store or SnapshotStore()
+        payloads = store.load(name)
+        if not is_decoded_bootstrap(payloads.get("bootstrap-static/")):
+            raise ValueError(
+                f"{name} holds a full bootstrap-static payload from an older "
+                "version, record a new snapshot to replay."
+            )
+        cls.replay_payloads = payloads
+
+    @classmethod
+    def _get_json(cls, endpoint: str) -> Any:
+        """Get the parsed payload of an endpoint, going through the cache.
+
+        Args:
+            endpoint (str): endpoint path relative to the base url.
+
+        Returns:
+            Any: parsed json payload, shared between all callers.
+        """
+        if cls.replay_payloads is not None:
+            return cls._replayed(endpoint)
+        url = f"{cls.BASE_URL}/{endpoint}"
+        entry = cls.cache.fresh(url)
+        if entry is not None:
+            return entry.payload
+        stale = cls.cache.get(url)
+        response, payload = cls._fetch(endpoint, url, stale)
+        return cls._store(url, stale, response, payload)
+
+    @classmethod
+    def _fetch(
+        cls, endpoint: str, url: str, stale: Optional[CacheEntry]
+    ) -> Tuple[requests.Response, Any]:
+        """Request an endpoint and decode its payload.
+
+        Args:
+            endpoint (str): endpoint path relative to the base url.
+            url (str): url of the endpoint.
+            stale (Optional[CacheEntry]): cached entry to revalidate.
+
+        Returns:
+            Tuple[requests.Response, Any]: response and decoded payload, None
+                if the stale entry is still valid.
+        """
+        decode = cls.DECODERS.get(endpoint, decode_json)
+        with tracing.span("http GET", endpoint=endpoint):
+            response = cls.transport.get(
+                url,
+                headers=cls._validators(stale),
+                stream=decode is decode_bootstrap and STREAMING,
+            )
+        if response.status_code == 304 and stale is not None:
+            return response, None
+        response.raise_for_status()
+        with tracing.span("decode", endpoint=endpoint):
+            payload = decode(response)
+        # bytes read off the wire, before any content decoding
+        tracing.count("bytes_downloaded", response.raw.tell())
+        return response, payload
+
+    @classmethod
+    def _replayed(cls, endpoint: str) -> Any:
+        """Get the payload of an endpoint from the replayed snapshot."""
+        if endpoint not in cls.replay_payloads:
+            raise ValueError(f"{endpoint} is not in the replayed snapshot.")
+        tracing.count("replayed")
+        return cls.replay_payloads[endpoint]
+
+    @staticmethod
+    def _validators(stale: Optional[CacheEntry]) -> Dict[str, str]:
+        """Conditional request headers for a stale cache entry."""
+        return stale.validators if stale is not None else {}
+
+    @classmethod
+    def _store(
+        cls,
+        url: str,
+        stale: Optional[CacheEntry],
+        response: requests.Response,
+        payload: Any,
+    ) -> Any:
+        """Cache a fetched payload and return it.
+
+        Args:
+            url (str): requested url.
+            stale (Optional[CacheEntry]): entry the request revalidated.
+            response (requests.Response): response to the request.
+            payload (Any): decoded payload, None if the entry was revalidated.
+
+        Returns:
+            Any: parsed json payload.
+        """
+        if response.status_code == 304 and stale is not None:
+            cls.cache.revalidated(stale)
+            return stale.payload
+        entry = CacheEntry(
+            url=url,
+            payload=payload,
+            fetched_at=time.time(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        cls.cache.put(entry)
+        return entry.payload
+
+    @classmethod
+    def _models(cls, model: Type[ModelT], raw_objects: List[dict]) -> List[ModelT]:
+        """Build models from raw api objects, validating them if configured."""
+        tracing.count("objects_built", len(raw_objects))
+        with tracing.span(f"build {model.__name__}", objects=len(raw_objects)):
+            if cls.validate_payloads:
+                return [model(**raw) for raw in raw_objects]
+            return [model.from_trusted(raw) for raw in raw_objects]
 
     @classmethod
     def get_players_raw_data(cls) -> List[dict]:
         """Get raw data for all players."""
-        return requests.get(f"{cls.BASE_URL}/bootstrap-static/").json().get("elements")
+        return cls._get_json("bootstrap-static/").get("elements")
 
     @classmethod
     def get_teams_raw_data(cls) -> List[dict]:
         """Get raw data for all teams."""
-        return requests.get(f"{cls.BASE_URL}/bootstrap-static/").json().get("teams")
+        return cls._get_json("bootstrap-static/").get("teams")
 
     @classmethod
     def get_fixtures_raw_data(cls) -> List[dict]:
         """Get all raw data for all fixtures."""
-        return requests.get(f"{cls.BASE_URL}/fixtures/").json()
+        return cls._get_json("fixtures/")
 
     @classmethod
     def get_players(cls) -> AllPlayers:
         """Get all players."""
         players_raw = cls.get_players_raw_data()
-        return AllPlayers(players_raw)
+        return AllPlayers(players_raw, trusted=not cls.validate_payloads)
 
     @classmethod
     def get_teams(cls) -> List[Team]:
         """Get all teams."""
         teams_raw = cls.get_teams_raw_data()
-        return [Team(**team) for team in teams_raw]
+        return cls._models(Team, teams_raw)
 
     @classmethod
     def get_fixtures(cls) -> List[Fixture]:
         """Get all fixtures."""
         fixtures_raw = cls.get_fixtures_raw_data()
-        return [Fixture(**fixture) for fixture in fixtures_raw]
+        return cls._models(Fixture, fixtures_raw)
 
     @classmethod
     def get_league(cls) -> League:
@@ -52,3 +246,104 @@ class PremierLeagueAPI:
             fixtures=cls.get_fixtures(),
             players=cls.get_players(),
         )
+
+    @classmethod
+    def refresh_league(cls, league: League) -> List[int]:
+        """Apply the fixtures that changed since the league was built.
+
+        Args:
+            league (League): league to update in place.
+
+        Returns:
+            List[int]: ids of the fixtures that changed the table.
+        """
+        return league.update_fixtures(cls.get_fixtures())
+
+    @classmethod
+    def league_from_raw_data(cls, bootstrap: dict, fixtures_raw: List[dict]) -> League:
+        """Build the league from already fetched payloads.
+
+        Args:
+            bootstrap (dict): bootstrap-static payload.
+            fixtures_raw (List[dict]): fixtures payload.
+
+        Returns:
+            League: the league.
+        """
+        return League(
+            teams=cls._models(Team, bootstrap.get("teams")),
+            fixtures=cls._models(Fixture, fixtures_raw),
+            players=AllPlayers(
+                bootstrap.get("elements"), trusted=not cls.validate_payloads
+            ),
+        )
+
+
+class AsyncPremierLeagueAPI:
+    """Asyncio variant of PremierLeagueAPI fetching endpoints concurrently.
+
+    Shares the cache, transport and replayed snapshot of ``api``. Requests run
+    on worker threads over the pooled session, and concurrent requests for
+    the same endpoint share a single fetch.
+    """
+
+    api = PremierLeagueAPI
+    _inflight: Dict[str, "asyncio.Future"] = {}
+
+    @classmethod
+    async def _get_json(cls, endpoint: str) -> Any:
+        """Get the parsed payload of an endpoint, going through the cache."""
+        api = cls.api
+        if api.replay_payloads is not None:
+            return api._replayed(endpoint)
+        url = f"{api.BASE_URL}/{endpoint}"
+        entry = api.cache.fresh(url)
+        if entry is not None:
+            return entry.payload
+        if url in cls._inflight:
+            return await asyncio.shield(cls._inflight[url])
+        future = asyncio.get_running_loop().create_future()
+        cls._inflight[url] = future
+        try:
+            stale = api.cache.get(url)
+            response, payload = await asyncio.to_thread(
+                api._fetch, endpoint, url, stale
+            )
+            payload = api._store(url, stale, response, payload)
+            future.set_result(payload)
+            return payload
+        except Exception as error:
+            future.set_exception(error)
+            # the awaiting caller re-raises, avoid "never retrieved" warnings
+            future.exception()
+            raise
+        finally:
+            del cls._inflight[url]
+
+    @classmethod
+    async def get_players(cls) -> AllPlayers:
+        """Get all players."""
+        bootstrap = await cls._get_json("bootstrap-static/")
+        return AllPlayers(
+            bootstrap.get("elements"), trusted=not cls.api.validate_payloads
+        )
+
+    @classmethod
+    async def get_teams(cls) -> List[Team]:
+        """Get all teams."""
+        bootstrap = await cls._get_json("bootstrap-static/")
+        return cls.api._models(Team, bootstrap.get("teams"))
+
+    @classmethod
+    async def get_fixtures(cls) -> List[Fixture]:
+        """Get all fixtures."""
+        fixtures_raw = await cls._get_json("fixtures/")
+        return cls.api._models(Fixture, fixtures_raw)
+
+    @classmethod
+    async def get_league(cls) -> League:
+        """Get the league, fetching bootstrap-static and fixtures concurrently."""
+        bootstrap, fixtures_raw = await asyncio.gather(
+            cls._get_json("bootstrap-static/"), cls._get_json("fixtures/")
+        )
+        return cls.api.league_from_raw_data(bootstrap, fixtures_raw)
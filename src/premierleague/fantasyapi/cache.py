@@ -0,0 +1,162 @@
+"""Snapshot cache for fantasy premier league api responses."""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from premierleague import tracing
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get(
+        "PREMIERLEAGUE_CACHE_DIR", Path.home() / ".cache" / "premierleague" / "http"
+    )
+)
+DEFAULT_TTL = float(os.environ.get("PREMIERLEAGUE_CACHE_TTL", 300))
+
+
+@dataclass
+class CacheEntry:
+    """Parsed payload of a single endpoint with its validators."""
+
+    url: str
+    payload: Any
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Whether the entry is younger than the time to live."""
+        return time.time() - self.fetched_at < ttl
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers to revalidate the entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SnapshotCache:
+    """Two tier (memory and disk) cache of parsed endpoint payloads.
+
+    Entries are kept in memory up to ``max_entries`` with least recently used
+    eviction and mirrored to ``cache_dir`` so that separate invocations share
+    them. Stale entries are kept so they can be revalidated with their ETag or
+    Last-Modified header instead of being downloaded again.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = 8,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and revalidation counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "entries": len(self._memory),
+        }
+
+    def _path(self, url: str) -> Path:
+        """Disk location of the entry for a url."""
+        return self.cache_dir / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+    def _read_disk(self, url: str) -> Optional[CacheEntry]:
+        """Read an entry from the disk tier."""
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._path(url), "r") as cache_file:
+                return CacheEntry(**json.load(cache_file))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write_disk(self, entry: CacheEntry):
+        """Write an entry to the disk tier, ignoring unwritable directories."""
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path(entry.url).with_suffix(".tmp")
+            with open(tmp_path, "w") as cache_file:
+                json.dump(asdict(entry), cache_file)
+            os.replace(tmp_path, self._path(entry.url))
+        except OSError:
+            pass
+
+    def _remember(self, entry: CacheEntry):
+        """Store entry in memory, evicting the least recently used."""
+        self._memory[entry.url] = entry
+        self._memory.move_to_end(entry.url)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Get the entry for a url, fresh or stale.
+
+        Args:
+            url (str): endpoint url.
+
+        Returns:
+            Optional[CacheEntry]: cached entry if one exists in either tier.
+        """
+        entry = self._memory.get(url)
+        if entry is not None:
+            self._memory.move_to_end(url)
+            return entry
+        entry = self._read_disk(url)
+        if entry is not None:
+            self._remember(entry)
+        return entry
+
+    def fresh(self, url: str) -> Optional[CacheEntry]:
+        """Get the entry for a url only if it is within the ttl.
+
+        Counts a hit when a fresh entry is found and a miss otherwise.
+        """
+        entry = self.get(url)
+        if entry is not None and entry.is_fresh(self.ttl):
+            self.hits += 1
+            tracing.count("cache_hits")
+            return entry
+        self.misses += 1
+        tracing.count("cache_misses")
+        return None
+
+    def put(self, entry: CacheEntry):
+        """Store a newly fetched entry in both tiers."""
+        self._remember(entry)
+        self._write_disk(entry)
+
+    def revalidated(self, entry: CacheEntry):
+        """Mark a stale entry as confirmed unchanged by the server."""
+        self.revalidations += 1
+        tracing.count("cache_revalidations")
+        entry.fetched_at = time.time()
+        self.put(entry)
+
+    def clear(self, disk: bool = False):
+        """Drop memory entries and optionally the disk tier."""
+        self._memory.clear()
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink()
@@ -0,0 +1,147 @@
+"""Decoding of api responses, keeping only the data the models use."""
+import json
+import os
+from typing import Any, Dict, Iterable, List, Type
+
+import requests
+
+from premierleague.fantasyapi.objects import ApiModel, Player, Team
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast backend
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional streaming backend
+    ijson = None
+
+# bootstrap-static sections that are kept and the models that read them
+BOOTSTRAP_SECTIONS: Dict[str, Type[ApiModel]] = {"elements": Player, "teams": Team}
+# streaming keeps peak memory to the kept fields but parses several times
+# slower than orjson, so it is only used when asked for
+STREAMING = ijson is not None and bool(os.environ.get("PREMIERLEAGUE_STREAM_JSON"))
+
+
+def loads(data: bytes) -> Any:
+    """Parse json with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a value is a number or a number sent as a string."""
+    kind = type(value)
+    if kind is int or kind is float:
+        return True
+    if kind is not str:
+        return False
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+class FieldSelector:
+    """Keep the declared fields of a model and every numeric field.
+
+    Numeric fields are kept for the columnar player stats. They are picked
+    per object rather than from the first one, so a field that is null or
+    blank on some objects is still kept on those where it is a number.
+    """
+
+    def __init__(self, model: Type[ApiModel]):
+        self.model = model
+        self.declared = frozenset(model.field_names())
+
+    def __call__(self, objects: Iterable[dict]) -> List[dict]:
+        """Select the fields of raw api objects of one section.
+
+        Args:
+            objects (Iterable[dict]): raw api objects.
+
+        Returns:
+            List[dict]: objects with only the selected fields.
+        """
+        declared = self.declared
+        return [
+            {
+                name: value
+                for name, value in raw.items()
+                if name in declared or _is_number(value)
+            }
+            for raw in objects
+        ]
+
+
+def is_decoded_bootstrap(payload: Any) -> bool:
+    """Whether a bootstrap-static payload holds only the kept sections.
+
+    Snapshots recorded before bootstrap-static was decoded this way hold the
+    full payload instead.
+    """
+    return isinstance(payload, dict) and set(payload) <= set(BOOTSTRAP_SECTIONS)
+
+
+def _stream_sections(stream, chunk_size: int = 64 * 1024) -> Dict[str, List[dict]]:
+    """Build the selected objects of the kept sections from a byte stream.
+
+    Fields are selected as each chunk is parsed, so the unused fields of only
+    one chunk's worth of objects are held at a time.
+    """
+    kept = {section: [] for section in BOOTSTRAP_SECTIONS}
+    parsed = {section: ijson.sendable_list() for section in BOOTSTRAP_SECTIONS}
+    selectors = {
+        section: FieldSelector(model) for section, model in BOOTSTRAP_SECTIONS.items()
+    }
+    parsers = {
+        section: ijson.items_coro(objects, f"{section}.item", use_float=True)
+        for section, objects in parsed.items()
+    }
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        for section, parser in parsers.items():
+            parser.send(chunk)
+            kept[section].extend(selectors[section](parsed[section]))
+            del parsed[section][:]
+    for section, parser in parsers.items():
+        parser.close()
+        kept[section].extend(selectors[section](parsed[section]))
+    return kept
+
+
+def decode_json(response: requests.Response) -> Any:
+    """Decode a whole json response."""
+    return loads(response.content)
+
+
+def decode_bootstrap(response: requests.Response) -> dict:
+    """Decode only the sections and fields of bootstrap-static that are used.
+
+    By default the body is parsed whole, with orjson when it is installed, and
+    everything but the kept sections and fields is dropped straight away so
+    only those stay cached and recorded in snapshots. With ``PREMIERLEAGUE_STREAM_JSON`` set and ijson
+    installed, the response is streamed instead so the full payload, over a
+    megabyte with events and dozens of unused player fields, is never held
+    in memory at once.
+
+    Args:
+        response (requests.Response): bootstrap-static response, requested
+            with ``stream=True`` when ``STREAMING``.
+
+    Returns:
+        dict: the kept sections with their selected fields.
+    """
+    if STREAMING and not response.raw.closed:
+        response.raw.decode_content = True
+        try:
+            return _stream_sections(response.raw)
+        finally:
+            response.close()
+    payload = loads(response.content)
+    return {
+        section: FieldSelector(model)(payload.get(section, []))
+        for section, model in BOOTSTRAP_SECTIONS.items()
+    }
@@ -1,13 +1,56 @@
 """Objects for premier league results guesser."""
 from dataclasses import dataclass
 from datetime import datetime
-from functools import cmp_to_key
-from typing import List, Optional
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple, Type, TypeVar, Union
 
+import numpy as np
 from pydantic import BaseModel
 
+from premierleague import render, tracing
 
-class Player(BaseModel):
+ModelT = TypeVar("ModelT", bound="ApiModel")
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+class ApiModel(BaseModel):
+    """Model of an object sent by the api."""
+
+    @classmethod
+    def from_trusted(cls: Type[ModelT], raw: dict) -> ModelT:
+        """Build the model from data known to be well formed.
+
+        Pydantic 2 validates the raw dict in compiled code, about twice as
+        fast as the keyword constructor, which copies every field into
+        arguments first. Pydantic 1 only copies the declared fields, without
+        validation. Use for api payloads, recorded snapshots and archived
+        seasons, and keep the keyword constructor for untrusted input such as
+        saved prediction files.
+
+        Args:
+            raw (dict): raw api object.
+
+        Returns:
+            ApiModel: the model.
+        """
+        if hasattr(cls, "model_validate"):
+            # pydantic 2 validates in compiled code, faster than constructing
+            return cls.model_validate(raw)
+        return cls.construct(
+            **{name: raw[name] for name in cls.field_names() if name in raw}
+        )
+
+    @classmethod
+    def field_names(cls) -> Tuple[str, ...]:
+        """Names of the declared fields."""
+        if cls not in _FIELD_NAMES:
+            _FIELD_NAMES[cls] = tuple(
+                getattr(cls, "model_fields", None) or cls.__fields__
+            )
+        return _FIELD_NAMES[cls]
+
+
+class Player(ApiModel):
     """Hold information about each player."""
 
     id: int
@@ -24,53 +67,210 @@ class Player(BaseModel):
         return f"{self.first_name} {self.second_name}"
 
 
+KEEPER, DEFENDER, MIDFIELDER, ATTACKER = 1, 2, 3, 4
+
+
+class PlayerColumns:
+    """Struct of arrays over every numeric field of the raw player data.
+
+    Fields that are numeric for every player (including numbers sent as
+    strings, such as ``form``) become one NumPy array each, with an index from
+    player id to row and from position (element type) to rows.
+    """
+
+    def __init__(self, players_raw: List[dict]):
+        self.ids = np.array([player["id"] for player in players_raw], dtype=np.int64)
+        self.row_of_id = {player_id: row for row, player_id in enumerate(self.ids)}
+        self.columns: Dict[str, np.ndarray] = {}
+        fields = list(players_raw[0]) if players_raw else []
+        try:
+            # transpose rows to columns in one pass when every player has
+            # every field, the common case for bootstrap-static
+            get_row = itemgetter(*fields) if len(fields) > 1 else None
+            values_by_field = zip(*map(get_row, players_raw)) if get_row else ()
+        except KeyError:
+            values_by_field = (
+                [player.get(name) for player in players_raw] for name in fields
+            )
+        for name, values in zip(fields, values_by_field):
+            column = self._numeric_column(list(values))
+            if column is not None:
+                self.columns[name] = column
+        element_types = self.columns.get("element_type", np.zeros(0, dtype=np.int64))
+        self.positions = {
+            position: np.flatnonzero(element_types == position)
+            for position in (KEEPER, DEFENDER, MIDFIELDER, ATTACKER)
+        }
+
+    @staticmethod
+    def _numeric_column(values: list) -> Optional[np.ndarray]:
+        """Array of the values if they are all numbers, else None."""
+        types = set(map(type, values))
+        if types == {int}:
+            return np.array(values, dtype=np.int64)
+        if types <= {int, float} or types == {str}:
+            try:
+                return np.array(values, dtype=float)
+            except ValueError:
+                return None
+        return None
+
+    def rows(self, position: Optional[int] = None) -> np.ndarray:
+        """Rows of all players or of the players in one position."""
+        if position is None:
+            return np.arange(len(self.ids))
+        return self.positions.get(position, np.zeros(0, dtype=np.int64))
+
+    def column(self, stat: str) -> np.ndarray:
+        """Array of a numeric stat for every player."""
+        if not len(self.ids):
+            return np.zeros(0, dtype=np.int64)
+        if stat not in self.columns:
+            raise KeyError(f"{stat} is not a numeric player field.")
+        return self.columns[stat]
+
+    def top_k(self, stat: str, k: int, position: Optional[int] = None) -> np.ndarray:
+        """Rows of the k players with the highest value of a stat.
+
+        Ties are ordered by row so results are stable between calls.
+        """
+        rows = self.rows(position)
+        values = self.column(stat)[rows]
+        k = min(k, len(rows))
+        if k <= 0:
+            return rows[:0]
+        if k < len(rows):
+            candidates = np.argpartition(-values, k - 1)[:k]
+            # include every row tied with the k-th value before ordering
+            candidates = np.flatnonzero(values >= values[candidates].min())
+        else:
+            candidates = np.arange(len(rows))
+        order = np.lexsort((rows[candidates], -values[candidates]))[:k]
+        return rows[candidates[order]]
+
+    def leaders(
+        self, stat: str, position: Optional[int] = None
+    ) -> Tuple[float, np.ndarray]:
+        """Highest value of a stat and the rows of every player with it.
+
+        The highest value is never below zero, matching a count of goals or
+        clean sheets when nobody has any yet.
+        """
+        rows = self.rows(position)
+        values = self.column(stat)[rows]
+        best = values.max(initial=0)
+        return best.item(), rows[values == best]
+
+
 # TODO: change players to all for better readability
 class AllPlayers:
     """Holds all players."""
 
-    def __init__(self, players_raw: List[dict]):
-        self.players = [Player(**player) for player in players_raw]
+    def __init__(self, players_raw: List[dict], trusted: bool = False):
+        tracing.count("objects_built", len(players_raw))
+        with tracing.span("build Player", objects=len(players_raw)):
+            if trusted:
+                self.players = [Player.from_trusted(player) for player in players_raw]
+            else:
+                self.players = [Player(**player) for player in players_raw]
+        with tracing.span("build PlayerColumns"):
+            self.stats = PlayerColumns(players_raw)
+
+    def _players_at(self, rows: np.ndarray) -> List[Player]:
+        """Players at rows of the columnar store."""
+        return [self.players[row] for row in rows.tolist()]
 
     @property
     def keepers(self) -> List[Player]:
         """All goalkeepers."""
-        return [player for player in self.players if player.element_type == 1]
+        return self._players_at(self.stats.rows(KEEPER))
 
     @property
     def defenders(self) -> List[Player]:
         """All defenders."""
-        return [player for player in self.players if player.element_type == 2]
+        return self._players_at(self.stats.rows(DEFENDER))
 
     @property
     def midfielders(self) -> List[Player]:
         """All midfielders."""
-        return [player for player in self.players if player.element_type == 3]
+        return self._players_at(self.stats.rows(MIDFIELDER))
 
     @property
     def attackers(self) -> List[Player]:
         """All attackers."""
-        return [player for player in self.players if player.element_type == 4]
-
-    def display_top_scorers(self):
-        """Display top scorers."""
-        print(f"Top goal scorer(s) with {self.get_top_goals_scored()} goal(s): ")
-        for player in self.get_top_scorers():
-            print("\t" + player.name)
-
-    def display_top_assisters(self):
-        """Display top assisters."""
-        print(f"Top assister(s) with {self.get_top_assists_number()} assist(s):")
-        for player in self.get_top_assisters():
-            print("\t" + player.name)
-
-    def display_keepers_with_most_clean_sheets(self):
-        """Display keepers with the most clean sheets."""
-        print(
+        return self._players_at(self.stats.rows(ATTACKER))
+
+    def get_player_with_id(self, player_id: int) -> Optional[Player]:
+        """Get player with given id.
+
+        Args:
+            player_id (int): id of a player.
+
+        Returns:
+            Optional[Player]: player with the given id.
+        """
+        row = self.stats.row_of_id.get(player_id)
+        if row is not None:
+            return self.players[row]
+
+    def top_k(self, stat: str, k: int, position: Optional[int] = None) -> List[Player]:
+        """Get the players with the highest value of any numeric stat.
+
+        Args:
+            stat (str): numeric field of the raw player data.
+            k (int): number of players.
+            position (Optional[int]): element type to restrict to.
+
+        Returns:
+            List[Player]: up to k players, highest first.
+        """
+        return self._players_at(self.stats.top_k(stat, k, position))
+
+    def leaders(
+        self, stat: str, position: Optional[int] = None
+    ) -> Tuple[float, List[Player]]:
+        """Get the highest value of a stat and all players tied on it.
+
+        Args:
+            stat (str): numeric field of the raw player data.
+            position (Optional[int]): element type to restrict to.
+
+        Returns:
+            Tuple[float, List[Player]]: highest value and the players with it.
+        """
+        best, rows = self.stats.leaders(stat, position)
+        return best, self._players_at(rows)
+
+    def display_top_scorers(self, fmt: str = "text"):
+        """Display top scorers as text, json or csv."""
+        most_goals, top_scorers = self.leaders("goals_scored")
+        render.player_leaders(
+            f"Top goal scorer(s) with {most_goals} goal(s): ",
+            "goals_scored",
+            most_goals,
+            top_scorers,
+        ).write(fmt)
+
+    def display_top_assisters(self, fmt: str = "text"):
+        """Display top assisters as text, json or csv."""
+        most_assists, top_assisters = self.leaders("assists")
+        render.player_leaders(
+            f"Top assister(s) with {most_assists} assist(s):",
+            "assists",
+            most_assists,
+            top_assisters,
+        ).write(fmt)
+
+    def display_keepers_with_most_clean_sheets(self, fmt: str = "text"):
+        """Display keepers with the most clean sheets as text, json or csv."""
+        most_clean_sheets, keepers = self.leaders("clean_sheets", KEEPER)
+        render.player_leaders(
             "Keeper(s) with the most clean sheets with "
-            f"{self.get_most_clean_sheets_by_keeper()} clean sheet(s):"
-        )
-        for keeper in self.get_keepers_with_most_clean_sheets():
-            print("\t" + keeper.name)
+            f"{most_clean_sheets} clean sheet(s):",
+            "clean_sheets",
+            most_clean_sheets,
+            keepers,
+        ).write(fmt)
 
     def get_top_goals_scored(self) -> int:
         """Get the highest number of goals scored by a single player.
@@ -78,11 +278,7 @@ class AllPlayers:
         Returns:
             int: most goals scored by a single player.
         """
-        most_goals = 0
-        for player in self.players:
-            if player.goals_scored > most_goals:
-                most_goals = player.goals_scored
-        return most_goals
+        return self.stats.leaders("goals_scored")[0]
 
     def get_top_scorers(self) -> List[Player]:
         """Get list of top scorers.
@@ -90,8 +286,7 @@ class AllPlayers:
         Returns:
             List[dict]: list of all players that have the highest number of goals.
         """
-        most_goals = self.get_top_goals_scored()
-        return [player for player in self.players if player.goals_scored == most_goals]
+        return self.leaders("goals_scored")[1]
 
     def get_top_assists_number(self) -> int:
         """Get the highest number of assists made by a single player.
@@ -99,11 +294,7 @@ class AllPlayers:
         Returns:
             int: most assists made by a single player.
         """
-        most_assists = 0
-        for player in self.players:
-            if player.assists > most_assists:
-                most_assists = player.assists
-        return most_assists
+        return self.stats.leaders("assists")[0]
 
     def get_top_assisters(self) -> List[Player]:
         """Get list of top assisters.
@@ -111,8 +302,7 @@ class AllPlayers:
         Returns:
             List[dict]: list of all players that have the highest number of assists.
         """
-        most_assists = self.get_top_assists_number()
-        return [player for player in self.players if player.assists == most_assists]
+        return self.leaders("assists")[1]
 
     def get_most_clean_sheets_by_keeper(self) -> int:
         """Get the highest number of clean sheets by a single keeper.
@@ -120,11 +310,7 @@ class AllPlayers:
         Returns:
             int: highest number of clean sheets kepy by a keeper.
         """
-        most_clean_sheets = 0
-        for player in self.players:
-            if player.element_type == 1 and player.element_type > most_clean_sheets:
-                most_clean_sheets = player.element_type
-        return most_clean_sheets
+        return self.stats.leaders("clean_sheets", KEEPER)[0]
 
     def get_keepers_with_most_clean_sheets(self) -> List[Player]:
         """Get the keepers with the most clean sheets.
@@ -132,13 +318,7 @@ class AllPlayers:
         Returns:
             List[dict]: list of all keepers with highest number of clean sheets.
         """
-
-        most_clean_sheets = self.get_most_clean_sheets_by_keeper()
-        return [
-            player
-            for player in self.players
-            if player.clean_sheets == most_clean_sheets and player.element_type == 1
-        ]
+        return self.leaders("clean_sheets", KEEPER)[1]
 
     def get_player_names(self, players=None) -> List[str]:
         """Get all player names.
@@ -154,7 +334,7 @@ class AllPlayers:
         return [player.name for player in players]
 
 
-class Team(BaseModel):
+class Team(ApiModel):
     """Hold information about a team."""
 
     id: int
@@ -181,7 +361,7 @@ class Team(BaseModel):
         self.goals_against = 0
 
 
-class Fixture(BaseModel):
+class Fixture(ApiModel):
     """Object to represent fixtures."""
 
     id: int
@@ -192,6 +372,207 @@ class Fixture(BaseModel):
     minutes: int
     kickoff_time: Optional[datetime]
     finished: bool
+    event: Optional[int] = None
+
+    @classmethod
+    def from_trusted(cls, raw: dict) -> "Fixture":
+        """Build the fixture from trusted data.
+
+        Pydantic 2 parses the kickoff time while validating, pydantic 1
+        constructs without parsing, so there it is parsed here.
+        """
+        fixture = super().from_trusted(raw)
+        if isinstance(fixture.kickoff_time, str):
+            fixture.kickoff_time = datetime.fromisoformat(
+                fixture.kickoff_time.replace("Z", "+00:00")
+            )
+        return fixture
+
+
+@dataclass
+class FixtureColumns:
+    """Columnar representation of fixtures.
+
+    Teams are given by their index in the league rather than their id and
+    missing scores are stored as zero with ``scored`` masking them out.
+    """
+
+    ids: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    home_score: np.ndarray
+    away_score: np.ndarray
+    kicked_off: np.ndarray
+    scored: np.ndarray
+    kickoff: np.ndarray
+    event: np.ndarray
+
+    @classmethod
+    def from_fixtures(
+        cls,
+        fixtures: List[Fixture],
+        team_index: Dict[int, int],
+        now: Optional[datetime] = None,
+    ) -> "FixtureColumns":
+        """Build columns from fixtures.
+
+        Fixtures without a kickoff time or with unknown teams are ignored.
+
+        Args:
+            fixtures (List[Fixture]): fixtures of the league.
+            team_index (Dict[int, int]): index of each team id in the league.
+            now (Optional[datetime]): time games must have kicked off before.
+
+        Returns:
+            FixtureColumns: columnar fixtures.
+        """
+        now = (now or datetime.now()).timestamp()
+        size = len(fixtures)
+        ids = np.fromiter((fixture.id for fixture in fixtures), np.int64, size)
+        # lookup array from team id to team index, -1 for unknown teams
+        lookup = np.full(max(team_index, default=0) + 1, -1, dtype=np.int64)
+        lookup[list(team_index)] = list(team_index.values())
+
+        def indexes(team_ids: np.ndarray) -> np.ndarray:
+            known = (team_ids >= 0) & (team_ids < len(lookup))
+            return np.where(known, lookup[np.where(known, team_ids, 0)], -1)
+
+        home = indexes(np.fromiter((f.team_h for f in fixtures), np.int64, size))
+        away = indexes(np.fromiter((f.team_a for f in fixtures), np.int64, size))
+        # None becomes nan for missing kickoff times and scores
+        kickoff = np.array(
+            [f.kickoff_time and f.kickoff_time.timestamp() for f in fixtures],
+            dtype=float,
+        )
+        event = np.array([f.event for f in fixtures], dtype=float)
+        home_score = np.array([f.team_h_score for f in fixtures], dtype=float)
+        away_score = np.array([f.team_a_score for f in fixtures], dtype=float)
+
+        valid = ~np.isnan(kickoff) & (home >= 0) & (away >= 0)
+        kicked_off = valid & (np.nan_to_num(kickoff, nan=np.inf) < now)
+        scored = valid & ~np.isnan(home_score) & ~np.isnan(away_score)
+        return cls(
+            ids,
+            home,
+            away,
+            np.nan_to_num(home_score).astype(np.int64),
+            np.nan_to_num(away_score).astype(np.int64),
+            kicked_off,
+            scored,
+            kickoff,
+            np.nan_to_num(event, nan=-1).astype(np.int64),
+        )
+
+    def states(self) -> Dict[int, Optional[Tuple[int, ...]]]:
+        """Get what each fixture contributes to the table, by fixture id.
+
+        Returns:
+            Dict[int, Optional[Tuple[int, ...]]]: home index, away index,
+                kicked off, scored, home score and away score of each fixture,
+                None for fixtures that contribute nothing.
+        """
+        rows = zip(
+            self.home.tolist(),
+            self.away.tolist(),
+            self.kicked_off.tolist(),
+            self.scored.tolist(),
+            self.home_score.tolist(),
+            self.away_score.tolist(),
+        )
+        return {
+            fixture_id: state if state[2] or state[3] else None
+            for fixture_id, state in zip(self.ids.tolist(), rows)
+        }
+
+    def team_entries(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the contribution of each fixture to each of its two teams.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: fixture row and team
+                index of each entry, and a (4, entries) array of the played,
+                goals for, goals against and points it adds.
+        """
+        rows = np.arange(len(self.ids))
+        home_score = self.home_score * self.scored
+        away_score = self.away_score * self.scored
+        home_points = np.where(
+            home_score > away_score, 3, np.where(home_score == away_score, 1, 0)
+        )
+        away_points = np.where(
+            away_score > home_score, 3, np.where(home_score == away_score, 1, 0)
+        )
+        stats = np.stack(
+            [
+                np.concatenate([self.kicked_off, self.kicked_off]),
+                np.concatenate([home_score, away_score]),
+                np.concatenate([away_score, home_score]),
+                np.concatenate([home_points, away_points]) * np.tile(self.scored, 2),
+            ]
+        ).astype(np.int64)
+        keep = np.tile(self.kicked_off | self.scored, 2)
+        teams = np.concatenate([self.home, self.away])
+        return np.tile(rows, 2)[keep], teams[keep], stats[:, keep]
+
+    def team_stats(self, team_count: int) -> Tuple[np.ndarray, ...]:
+        """Calculate played, goals for, goals against and points per team.
+
+        Args:
+            team_count (int): number of teams in the league.
+
+        Returns:
+            Tuple[np.ndarray, ...]: played, goals for, goals against and
+                points arrays indexed by team index.
+        """
+        _, teams, stats = self.team_entries()
+        totals = np.zeros((4, team_count), dtype=np.int64)
+        for stat in range(4):
+            np.add.at(totals[stat], teams, stats[stat])
+        return tuple(totals)
+
+
+class TableHistory:
+    """Cumulative team stats over gameweeks and kickoff order.
+
+    Row ``g`` of ``by_gameweek`` holds the stats after gameweek ``g`` and row
+    ``k`` of ``by_kickoff`` the stats after the first ``k`` fixtures to kick
+    off, so the table at any point of the season is a single row lookup.
+    """
+
+    def __init__(self, columns: FixtureColumns, team_count: int):
+        rows, teams, stats = columns.team_entries()
+
+        events = columns.event[rows]
+        scheduled = events >= 0
+        self.by_gameweek = np.zeros(
+            (4, max(columns.event.max(initial=0), 0) + 1, team_count), dtype=np.int64
+        )
+        for stat in range(4):
+            np.add.at(
+                self.by_gameweek[stat],
+                (events[scheduled], teams[scheduled]),
+                stats[stat][scheduled],
+            )
+        self.by_gameweek = self.by_gameweek.cumsum(axis=1)
+
+        kickoff = columns.kickoff[rows]
+        order = np.argsort(kickoff, kind="stable")
+        self.kickoffs = kickoff[order]
+        self.by_kickoff = np.zeros((4, len(rows) + 1, team_count), dtype=np.int64)
+        for stat in range(4):
+            self.by_kickoff[stat, np.arange(1, len(rows) + 1), teams[order]] = stats[
+                stat
+            ][order]
+        self.by_kickoff = self.by_kickoff.cumsum(axis=1)
+
+    def at_gameweek(self, gameweek: int) -> np.ndarray:
+        """Stats of every team after a gameweek, as a (4, teams) array."""
+        gameweek = min(max(gameweek, 0), self.by_gameweek.shape[1] - 1)
+        return self.by_gameweek[:, gameweek]
+
+    def at_time(self, time: datetime) -> np.ndarray:
+        """Stats of every team from games kicked off before a time."""
+        count = np.searchsorted(self.kickoffs, time.timestamp(), side="left")
+        return self.by_kickoff[:, count]
 
 
 @dataclass
@@ -203,55 +584,149 @@ class League:
     players: AllPlayers
 
     def __post_init__(self):
+        self.team_index = {team.id: index for index, team in enumerate(self.teams)}
         self.calculate_team_stats()
 
+    def _stats_changed(self):
+        """Drop everything derived from team stats."""
+        self._table = None
+        self._history = None
+
     @property
     def table(self):
         """Get the current table."""
-        return sorted(self.teams, key=cmp_to_key(self._compare))
-
-    def display_table(self):
-        """Display the current table."""
-        current_table = self.table
-        print("\tTEAM\tP\tGD\tGF\tGA\tPOINTS")
-        print("\t===============================================")
-        for pos, team in enumerate(current_table):
-            print(f"{pos+1}.", end="\t")
-            print(team.short_name, end="\t")
-            print(team.played, end="\t")
-            print(team.goal_difference, end="\t")
-            print(team.goals_for, end="\t")
-            print(team.goals_against, end="\t")
-            print(team.points)
+        if self._table is None:
+            with tracing.span("League.table"):
+                self._table = sorted(self.teams, key=self._sort_key)
+        return self._table
+
+    @property
+    def history(self) -> TableHistory:
+        """Cumulative stats of the season for time travel queries."""
+        if self._history is None:
+            self._history = TableHistory(
+                FixtureColumns.from_fixtures(self.fixtures, self.team_index),
+                len(self.teams),
+            )
+        return self._history
+
+    def table_at(self, when: Union[int, datetime]) -> List[Team]:
+        """Get the table as it was after a gameweek or at a point in time.
+
+        Args:
+            when (Union[int, datetime]): gameweek number, or time before
+                which games must have kicked off.
+
+        Returns:
+            List[Team]: copies of the teams with their stats at that point,
+                in table order.
+        """
+        if isinstance(when, datetime):
+            stats = self.history.at_time(when)
+        else:
+            stats = self.history.at_gameweek(when)
+        # copy is deprecated in pydantic 2 in favour of model_copy
+        copy = Team.model_copy if hasattr(Team, "model_copy") else Team.copy
+        teams = [
+            copy(
+                team,
+                update={
+                    "played": played,
+                    "goals_for": goals_for,
+                    "goals_against": goals_against,
+                    "points": points,
+                },
+            )
+            for team, played, goals_for, goals_against, points in zip(
+                self.teams, *stats.tolist()
+            )
+        ]
+        return sorted(teams, key=self._sort_key)
+
+    def display_table(self, fmt: str = "text"):
+        """Display the current table as text, json or csv."""
+        render.league_table(self.table).write(fmt)
+
+    def display_gameweek_tables(self, fmt: str = "text"):
+        """Display the table after every gameweek played so far as text, json
+        or csv."""
+        last = max(
+            (fixture.event or 0 for fixture in self.fixtures if fixture.finished),
+            default=0,
+        )
+        render.gameweek_tables(
+            (gameweek, self.table_at(gameweek)) for gameweek in range(1, last + 1)
+        ).write(fmt)
 
+    @tracing.traced("League.calculate_team_stats")
     def calculate_team_stats(self):
         """Calculate the points and score statistics."""
-        for fixture in self.fixtures:
-            try:
-                home_team = self.get_team_with_id(fixture.team_h)
-                away_team = self.get_team_with_id(fixture.team_a)
-                # add games played
-                if fixture.kickoff_time.timestamp() < datetime.now().timestamp():
-                    home_team.played += 1
-                    away_team.played += 1
-                # update home team goals for/against
-                home_team.goals_for += fixture.team_h_score
-                home_team.goals_against += fixture.team_a_score
-                # update away team goals for/against
-                away_team.goals_for += fixture.team_a_score
-                away_team.goals_against += fixture.team_h_score
-
-                if fixture.team_h_score > fixture.team_a_score:
-                    home_team.points += 3
-                elif fixture.team_h_score < fixture.team_a_score:
-                    away_team.points += 3
-                else:
-                    home_team.points += 1
-                    away_team.points += 1
-            except TypeError:
-                pass
-            except AttributeError:
-                pass
+        columns = FixtureColumns.from_fixtures(self.fixtures, self.team_index)
+        stats = columns.team_stats(len(self.teams))
+        for team, played, goals_for, goals_against, points in zip(
+            self.teams, *(stat.tolist() for stat in stats)
+        ):
+            team.played = played
+            team.goals_for = goals_for
+            team.goals_against = goals_against
+            team.points = points
+        self._applied = columns.states()
+        self._stats_changed()
+
+    def _apply_fixture(self, state: Tuple[int, ...], sign: int):
+        """Add (sign 1) or revert (sign -1) the contribution of a fixture."""
+        home, away, kicked_off, scored, home_score, away_score = state
+        home_team, away_team = self.teams[home], self.teams[away]
+        if kicked_off:
+            home_team.played += sign
+            away_team.played += sign
+        if not scored:
+            return
+        home_team.goals_for += sign * home_score
+        home_team.goals_against += sign * away_score
+        away_team.goals_for += sign * away_score
+        away_team.goals_against += sign * home_score
+        if home_score > away_score:
+            home_team.points += sign * 3
+        elif home_score < away_score:
+            away_team.points += sign * 3
+        else:
+            home_team.points += sign
+            away_team.points += sign
+
+    def update_fixtures(self, fixtures: List[Fixture]) -> List[int]:
+        """Apply only the fixtures that changed since they were last applied.
+
+        Fixtures whose kickoff, score or teams changed have their previous
+        contribution reverted and their new one applied, so polling during a
+        matchday only touches the handful of games in progress.
+
+        Args:
+            fixtures (List[Fixture]): new or updated fixtures, all or some.
+
+        Returns:
+            List[int]: ids of the fixtures that changed the table.
+        """
+        states = FixtureColumns.from_fixtures(fixtures, self.team_index).states()
+        changed = []
+        for fixture_id, state in states.items():
+            previous = self._applied.get(fixture_id)
+            if state == previous:
+                continue
+            if previous is not None:
+                self._apply_fixture(previous, -1)
+            if state is not None:
+                self._apply_fixture(state, 1)
+            self._applied[fixture_id] = state
+            changed.append(fixture_id)
+
+        updated = {fixture.id: fixture for fixture in fixtures}
+        self.fixtures = [
+            updated.pop(fixture.id, fixture) for fixture in self.fixtures
+        ] + list(updated.values())
+        if changed:
+            self._stats_changed()
+        return changed
 
     def get_team_with_id(self, team_id: int) -> Team:
         """Get team with given id.
@@ -262,40 +737,21 @@ class League:
         Returns:
             Team: team with the given id.
         """
-        for team in self.teams:
-            if team.id == team_id:
-                return team
+        index = self.team_index.get(team_id)
+        if index is not None:
+            return self.teams[index]
 
     @staticmethod
-    def _compare(team1: Team, team2: Team):
-        """Compare teams as leagues do."""
-
-        # compare points
-        if team1.points < team2.points:
-            return 1
-        elif team1.points > team2.points:
-            return -1
-        else:
-            # compare goal difference
-            if team1.goal_difference < team2.goal_difference:
-                return 1
-            elif team1.goal_difference > team2.goal_difference:
-                return -1
-            else:
-                # compare goals for
-                if team1.goals_for < team2.goals_for:
-                    return 1
-                elif team2.goals_for > team2.goals_for:
-                    return -1
-                else:
-                    # compare goals against
-                    if team1.goals_against < team2.goals_against:
-                        return -1
-                    elif team2.goals_against > team2.goals_against:
-                        return 1
-                    else:
-                        # default to alphabet
-                        if team1.name < team2.name:
-                            return -1
-                        else:
-                            return 1
+    def _sort_key(team: Team) -> Tuple:
+        """Order teams as leagues do.
+
+        Points, goal difference and goals for descending, then goals against
+        ascending and finally alphabetically.
+        """
+        return (
+            -team.points,
+            -team.goal_difference,
+            -team.goals_for,
+            team.goals_against,
+            team.name,
+        )
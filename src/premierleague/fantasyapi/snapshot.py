@@ -0,0 +1,227 @@
+"""Record and replay snapshots of fantasy premier league api payloads."""
+import hashlib
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_SNAPSHOT_DIR = Path(
+    os.environ.get(
+        "PREMIERLEAGUE_SNAPSHOT_DIR",
+        Path.home() / ".cache" / "premierleague" / "snapshots",
+    )
+)
+# longest chain of deltas before a full snapshot is stored again
+MAX_DELTA_CHAIN = 16
+
+
+def _is_records(value: Any) -> bool:
+    """Whether value is a list of objects identified by an id."""
+    return isinstance(value, list) and all(
+        isinstance(item, dict) and "id" in item for item in value
+    )
+
+
+def diff(old: Any, new: Any) -> Optional[dict]:
+    """Get the delta turning one payload into another.
+
+    Objects are diffed key by key and lists of records are diffed by their
+    ``id`` so that a changed fixture or player only stores its changed fields.
+
+    Args:
+        old (Any): previous payload.
+        new (Any): current payload.
+
+    Returns:
+        Optional[dict]: delta to pass to ``patch``, None if nothing changed.
+    """
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = {}
+        for key, value in new.items():
+            if key not in old:
+                changes[key] = {"=": value}
+                continue
+            delta = diff(old[key], value)
+            if delta is not None:
+                changes[key] = delta
+        delta = {"d": changes}
+        removed = [key for key in old if key not in new]
+        if removed:
+            delta["r"] = removed
+        return delta
+    if old and new and _is_records(old) and _is_records(new):
+        old_by_id = {record["id"]: record for record in old}
+        changes = []
+        for record in new:
+            if record["id"] not in old_by_id:
+                changes.append([record["id"], {"=": record}])
+                continue
+            delta = diff(old_by_id[record["id"]], record)
+            if delta is not None:
+                changes.append([record["id"], delta])
+        delta = {"l": changes}
+        order = [record["id"] for record in new]
+        if order != [record["id"] for record in old]:
+            delta["o"] = order
+        return delta
+    return {"=": new}
+
+
+def patch(old: Any, delta: Optional[dict]) -> Any:
+    """Apply a delta produced by ``diff``.
+
+    Args:
+        old (Any): payload the delta was taken against.
+        delta (Optional[dict]): delta to apply.
+
+    Returns:
+        Any: the new payload.
+    """
+    if delta is None:
+        return old
+    if "=" in delta:
+        return delta["="]
+    if "d" in delta:
+        new = {
+            key: value for key, value in old.items() if key not in delta.get("r", ())
+        }
+        for key, sub_delta in delta["d"].items():
+            new[key] = patch(old.get(key), sub_delta)
+        return new
+    old_by_id = {record["id"]: record for record in old}
+    changes = {record_id: sub_delta for record_id, sub_delta in delta["l"]}
+    order = delta.get("o") or [record["id"] for record in old]
+    return [
+        patch(old_by_id.get(record_id), changes[record_id])
+        if record_id in changes
+        else old_by_id[record_id]
+        for record_id in order
+    ]
+
+
+def snapshot_id(payloads: Dict[str, Any]) -> str:
+    """Content address of a set of payloads."""
+    canonical = json.dumps(payloads, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SnapshotStore:
+    """Compressed, content addressed store of recorded api payloads.
+
+    Each snapshot is a mapping of endpoint to parsed payload. Consecutive
+    snapshots are stored as deltas against the previous one so recording every
+    few minutes during a matchday stays small.
+    """
+
+    def __init__(self, root: Path = DEFAULT_SNAPSHOT_DIR):
+        self.root = Path(root)
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def _objects(self) -> Path:
+        return self.root / "objects"
+
+    @property
+    def _index(self) -> Path:
+        return self.root / "index"
+
+    def _read_object(self, snap_id: str) -> dict:
+        """Read a stored snapshot object."""
+        with open(self._objects / f"{snap_id}.z", "rb") as object_file:
+            return json.loads(zlib.decompress(object_file.read()))
+
+    def _write_object(self, snap_id: str, stored: dict):
+        """Write a snapshot object atomically."""
+        self._objects.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._objects / f"{snap_id}.tmp"
+        with open(tmp_path, "wb") as object_file:
+            object_file.write(
+                zlib.compress(json.dumps(stored, separators=(",", ":")).encode(), 9)
+            )
+        os.replace(tmp_path, self._objects / f"{snap_id}.z")
+
+    def list(self) -> List[str]:
+        """Get all snapshot ids, least recently recorded first."""
+        if not self._index.exists():
+            return []
+        with open(self._index, "r") as index_file:
+            recorded = [line.split()[0] for line in index_file if line.strip()]
+        # a snapshot recorded again moves to the end
+        return [*dict.fromkeys(reversed(recorded))][::-1]
+
+    def resolve(self, name: str) -> str:
+        """Get the full snapshot id for an id, unique prefix or ``latest``.
+
+        Args:
+            name (str): snapshot id, prefix of one, or ``latest``.
+
+        Returns:
+            str: full snapshot id.
+        """
+        snapshots = self.list()
+        if name == "latest":
+            if not snapshots:
+                raise ValueError("No snapshots have been recorded.")
+            return snapshots[-1]
+        matches = {snap_id for snap_id in snapshots if snap_id.startswith(name)}
+        if len(matches) != 1:
+            raise ValueError(
+                f"{name} does not identify a snapshot ({len(matches)} matches)."
+            )
+        return matches.pop()
+
+    def record(self, payloads: Dict[str, Any]) -> str:
+        """Store a snapshot and make it the latest.
+
+        A snapshot with the same content as a stored one is not written
+        again, only moved to the head of the index.
+
+        Args:
+            payloads (Dict[str, Any]): parsed payload per endpoint.
+
+        Returns:
+            str: id of the stored snapshot.
+        """
+        snap_id = snapshot_id(payloads)
+        snapshots = self.list()
+        if snapshots and snapshots[-1] == snap_id:
+            return snap_id
+        if snap_id not in snapshots:
+            stored = {"base": None, "depth": 0, "full": payloads}
+            if snapshots:
+                base_id = snapshots[-1]
+                depth = self._read_object(base_id)["depth"] + 1
+                if depth <= MAX_DELTA_CHAIN:
+                    stored = {
+                        "base": base_id,
+                        "depth": depth,
+                        "delta": diff(self.load(base_id), payloads),
+                    }
+            self._write_object(snap_id, stored)
+        with open(self._index, "a") as index_file:
+            index_file.write(f"{snap_id} {int(time.time())}\n")
+        self._loaded[snap_id] = payloads
+        return snap_id
+
+    def load(self, name: str) -> Dict[str, Any]:
+        """Load the payloads of a snapshot.
+
+        Args:
+            name (str): snapshot id, prefix of one, or ``latest``.
+
+        Returns:
+            Dict[str, Any]: parsed payload per endpoint.
+        """
+        snap_id = self.resolve(name)
+        if snap_id not in self._loaded:
+            stored = self._read_object(snap_id)
+            if stored["base"] is None:
+                payloads = stored["full"]
+            else:
+                payloads = patch(self.load(stored["base"]), stored["delta"])
+            self._loaded[snap_id] = payloads
+        return self._loaded[snap_id]
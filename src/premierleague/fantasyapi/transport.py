@@ -0,0 +1,64 @@
+"""Http transport for the fantasy premier league api."""
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 20)
+
+
+class Transport:
+    """Pooled keep-alive http session with timeouts and retries.
+
+    Connections are reused between requests so only the first fetch of a
+    command pays for the TCP and TLS handshakes. Idempotent requests that fail
+    to connect or get a 429/5xx response are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff_factor: float = 0.3,
+        pool_maxsize: int = 8,
+    ):
+        self.timeout = timeout
+        # connections kept per host, more concurrent requests open and drop
+        # extra ones
+        self.pool_maxsize = pool_maxsize
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None, stream=False
+    ) -> requests.Response:
+        """Send a GET request over the pooled session.
+
+        Args:
+            url (str): url to request.
+            headers (Optional[Dict[str, str]]): extra request headers.
+            stream (bool): leave the body to be read from ``response.raw``.
+
+        Returns:
+            requests.Response: response to the request.
+        """
+        return self.session.get(
+            url, headers=headers, timeout=self.timeout, stream=stream
+        )
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
@@ -0,0 +1,372 @@
+"""Analysis of archived seasons, processed in parallel and cached as columns.
+
+An archive is a directory with one subdirectory per season, each holding the
+``bootstrap-static.json`` (teams, and players if kept) and ``fixtures.json``
+payloads of that season::
+
+    seasons/
+        2022-23/bootstrap-static.json
+        2022-23/fixtures.json
+        2023-24/...
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from premierleague.fantasyapi.decoding import loads
+from premierleague.fantasyapi.objects import (
+    KEEPER,
+    Fixture,
+    FixtureColumns,
+    PlayerColumns,
+    TableHistory,
+    Team,
+)
+
+DEFAULT_HISTORY_CACHE = Path(
+    os.environ.get(
+        "PREMIERLEAGUE_HISTORY_CACHE",
+        Path.home() / ".cache" / "premierleague" / "history",
+    )
+)
+# bumped whenever the cached arrays change meaning
+CACHE_VERSION = 1
+# every archived fixture has kicked off
+ARCHIVE_NOW = datetime(9999, 1, 1)
+# player stats with leaders kept per season, and the position they are for
+LEADER_STATS: Dict[str, Optional[int]] = {
+    "goals_scored": None,
+    "assists": None,
+    "clean_sheets": KEEPER,
+}
+TOP_PLAYERS = 10
+PLAYED, GOALS_FOR, GOALS_AGAINST, POINTS = range(4)
+
+
+@dataclass
+class SeasonSummary:
+    """Tables and player leaders of one season as arrays.
+
+    ``stats[:, g]`` holds the played, goals for, goals against and points of
+    every team after gameweek ``g`` and ``positions[g]`` the table position of
+    every team at that point, so any table of the season is a row lookup.
+    """
+
+    season: str
+    team_ids: np.ndarray
+    team_names: np.ndarray
+    stats: np.ndarray
+    positions: np.ndarray
+    leader_ids: Dict[str, np.ndarray]
+    leader_names: Dict[str, np.ndarray]
+    leader_values: Dict[str, np.ndarray]
+
+    @property
+    def gameweeks(self) -> int:
+        """Number of gameweeks in the season."""
+        return self.stats.shape[1] - 1
+
+    def order_after(self, gameweek: Optional[int] = None) -> np.ndarray:
+        """Team ids in table order after a gameweek, the final table if None."""
+        row = (
+            self.gameweeks
+            if gameweek is None
+            else min(max(gameweek, 0), self.gameweeks)
+        )
+        return self.team_ids[np.argsort(self.positions[row])]
+
+    @property
+    def final_order(self) -> np.ndarray:
+        """Team ids in final table order."""
+        return self.order_after()
+
+    @property
+    def final_names(self) -> np.ndarray:
+        """Team names in final table order.
+
+        The api numbers teams 1 to 20 alphabetically every season, so an id
+        is a different club from one season to the next and teams are
+        matched across seasons by name instead.
+        """
+        return self.team_names[np.argsort(self.positions[-1])]
+
+    def final_table(self) -> List[Tuple[str, int, int, int, int, int]]:
+        """Final table as rows of name, played, goal difference, goals for,
+        goals against and points."""
+        final = self.stats[:, -1]
+        rows = np.argsort(self.positions[-1])
+        return [
+            (
+                str(self.team_names[row]),
+                int(final[PLAYED, row]),
+                int(final[GOALS_FOR, row] - final[GOALS_AGAINST, row]),
+                int(final[GOALS_FOR, row]),
+                int(final[GOALS_AGAINST, row]),
+                int(final[POINTS, row]),
+            )
+            for row in rows.tolist()
+        ]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Flat arrays of the summary, for ``np.savez``."""
+        arrays = {
+            "version": np.array(CACHE_VERSION),
+            "team_ids": self.team_ids,
+            "team_names": self.team_names,
+            "stats": self.stats,
+            "positions": self.positions,
+        }
+        for stat in LEADER_STATS:
+            arrays[f"{stat}_ids"] = self.leader_ids[stat]
+            arrays[f"{stat}_names"] = self.leader_names[stat]
+            arrays[f"{stat}_values"] = self.leader_values[stat]
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, season: str, arrays) -> "SeasonSummary":
+        """Summary from the arrays written by ``to_arrays``."""
+        return cls(
+            season=season,
+            team_ids=arrays["team_ids"],
+            team_names=arrays["team_names"],
+            stats=arrays["stats"],
+            positions=arrays["positions"],
+            leader_ids={stat: arrays[f"{stat}_ids"] for stat in LEADER_STATS},
+            leader_names={stat: arrays[f"{stat}_names"] for stat in LEADER_STATS},
+            leader_values={stat: arrays[f"{stat}_values"] for stat in LEADER_STATS},
+        )
+
+
+def _read_json(path: Path):
+    with open(path, "rb") as json_file:
+        return loads(json_file.read())
+
+
+def summarize_season(season: str, directory: Path) -> SeasonSummary:
+    """Compute the tables and player leaders of an archived season.
+
+    Builds only what the summary needs: the fixture columns and cumulative
+    table history rather than a full ``League``.
+
+    Args:
+        season (str): name of the season.
+        directory (Path): directory with the season's payloads.
+
+    Returns:
+        SeasonSummary: the season's tables and leaders.
+    """
+    bootstrap = _read_json(directory / "bootstrap-static.json")
+    fixtures = [
+        Fixture.from_trusted(raw) for raw in _read_json(directory / "fixtures.json")
+    ]
+    teams = [Team.from_trusted(raw) for raw in bootstrap["teams"]]
+    team_index = {team.id: index for index, team in enumerate(teams)}
+    columns = FixtureColumns.from_fixtures(fixtures, team_index, now=ARCHIVE_NOW)
+    stats = TableHistory(columns, len(teams)).by_gameweek
+
+    # same ordering as League.table for every gameweek at once
+    names = np.array([team.name for team in teams])
+    name_rank = np.broadcast_to(
+        np.argsort(np.argsort(names, kind="stable")), stats.shape[1:]
+    )
+    goal_difference = stats[GOALS_FOR] - stats[GOALS_AGAINST]
+    order = np.lexsort(
+        (
+            name_rank,
+            stats[GOALS_AGAINST],
+            -stats[GOALS_FOR],
+            -goal_difference,
+            -stats[POINTS],
+        ),
+        axis=-1,
+    )
+    positions = np.empty_like(order, dtype=np.int16)
+    np.put_along_axis(
+        positions, order, np.arange(1, len(teams) + 1, dtype=np.int16), axis=-1
+    )
+
+    players_raw = bootstrap.get("elements") or []
+    player_columns = PlayerColumns(players_raw)
+    leader_ids, leader_names, leader_values = {}, {}, {}
+    for stat, position in LEADER_STATS.items():
+        if stat in player_columns.columns:
+            rows = player_columns.top_k(stat, TOP_PLAYERS, position)
+        else:
+            rows = np.zeros(0, dtype=np.int64)
+        leader_ids[stat] = player_columns.ids[rows]
+        leader_names[stat] = np.array(
+            [
+                f"{players_raw[row]['first_name']} {players_raw[row]['second_name']}"
+                for row in rows.tolist()
+            ],
+            dtype=str,
+        )
+        leader_values[stat] = player_columns.columns.get(stat, rows)[rows]
+    return SeasonSummary(
+        season=season,
+        team_ids=np.array([team.id for team in teams], dtype=np.int32),
+        team_names=names,
+        stats=stats.astype(np.int32),
+        positions=positions,
+        leader_ids=leader_ids,
+        leader_names=leader_names,
+        leader_values=leader_values,
+    )
+
+
+class SeasonArchive:
+    """Directory of archived seasons with a columnar cache of their summaries.
+
+    Each summary is cached as an ``.npz`` file keyed by the size and
+    modification time of the season's payloads, so only new or changed
+    seasons are recomputed, and those are processed in parallel.
+    """
+
+    def __init__(self, root: Path, cache_dir: Path = DEFAULT_HISTORY_CACHE):
+        self.root = Path(root)
+        self.cache_dir = Path(cache_dir)
+
+    def seasons(self) -> List[str]:
+        """Names of the archived seasons, in order."""
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if (path / "fixtures.json").exists()
+            and (path / "bootstrap-static.json").exists()
+        )
+
+    def _cache_path(self, season: str) -> Path:
+        """Cache file of a season's current payloads."""
+        key = hashlib.sha1(str(self.root.resolve() / season).encode())
+        for name in ("bootstrap-static.json", "fixtures.json"):
+            status = (self.root / season / name).stat()
+            key.update(f"{status.st_size}:{status.st_mtime_ns}".encode())
+        key.update(str(CACHE_VERSION).encode())
+        return self.cache_dir / f"{season}-{key.hexdigest()[:16]}.npz"
+
+    def _read_cache(self, season: str) -> Optional[SeasonSummary]:
+        """Cached summary of a season, None if missing or stale."""
+        try:
+            with np.load(self._cache_path(season)) as arrays:
+                if int(arrays["version"]) != CACHE_VERSION:
+                    return None
+                return SeasonSummary.from_arrays(season, dict(arrays))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _write_cache(self, summary: SeasonSummary):
+        """Cache a summary, ignoring unwritable directories."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._cache_path(summary.season)
+            for stale in self.cache_dir.glob(f"{summary.season}-*.npz"):
+                stale.unlink()
+            np.savez_compressed(path, **summary.to_arrays())
+        except OSError:
+            pass
+
+    def load(
+        self, seasons: Optional[List[str]] = None, workers: Optional[int] = None
+    ) -> Dict[str, SeasonSummary]:
+        """Summaries of archived seasons, computing uncached ones in parallel.
+
+        Args:
+            seasons (Optional[List[str]]): seasons to load, all if not given.
+            workers (Optional[int]): worker processes, defaults to cpu count.
+
+        Returns:
+            Dict[str, SeasonSummary]: summary of each season, in order.
+        """
+        seasons = seasons or self.seasons()
+        summaries = {season: self._read_cache(season) for season in seasons}
+        missing = [season for season, summary in summaries.items() if summary is None]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(missing)))
+        if workers == 1:
+            computed = [
+                summarize_season(season, self.root / season) for season in missing
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                computed = list(
+                    executor.map(
+                        summarize_season,
+                        missing,
+                        [self.root / season for season in missing],
+                    )
+                )
+        for summary in computed:
+            self._write_cache(summary)
+            summaries[summary.season] = summary
+        return summaries
+
+
+Strategy = Callable[[List[SeasonSummary], np.ndarray], np.ndarray]
+
+
+def previous_table(previous: List[SeasonSummary], team_names: np.ndarray) -> np.ndarray:
+    """Predict last season's final order, promoted teams at the bottom."""
+    if not previous:
+        return team_names
+    last = previous[-1].final_names
+    kept = last[np.isin(last, team_names)]
+    return np.concatenate([kept, team_names[~np.isin(team_names, last)]])
+
+
+def average_points(
+    previous: List[SeasonSummary], team_names: np.ndarray, seasons: int = 3
+) -> np.ndarray:
+    """Predict by points per game over recent seasons, unknown teams last."""
+    points = np.zeros(len(team_names))
+    games = np.zeros(len(team_names))
+    for summary in previous[-seasons:]:
+        rows = {name: row for row, name in enumerate(summary.team_names.tolist())}
+        for index, name in enumerate(team_names.tolist()):
+            if name in rows:
+                points[index] += summary.stats[POINTS, -1, rows[name]]
+                games[index] += summary.stats[PLAYED, -1, rows[name]]
+    per_game = np.divide(
+        points, games, out=np.full(len(team_names), -1.0), where=games > 0
+    )
+    return team_names[np.argsort(-per_game, kind="stable")]
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "previous": previous_table,
+    "average": average_points,
+}
+
+
+def backtest(
+    summaries: Dict[str, SeasonSummary], strategy: Strategy
+) -> List[Tuple[str, int]]:
+    """Score a table prediction strategy on every season after the first.
+
+    Args:
+        summaries (Dict[str, SeasonSummary]): seasons in order.
+        strategy (Strategy): predicts the final order of the given team
+            names from the seasons before.
+
+    Returns:
+        List[Tuple[str, int]]: each season with the number of teams the
+            strategy put in the correct position.
+    """
+    ordered = list(summaries.values())
+    results = []
+    for index, summary in enumerate(ordered[1:], 1):
+        predicted_names = strategy(ordered[:index], summary.team_names)
+        # back to this season's ids, which may name other clubs last season
+        ids_by_name = dict(zip(summary.team_names.tolist(), summary.team_ids.tolist()))
+        predicted = np.array(
+            [ids_by_name[name] for name in predicted_names.tolist()],
+            dtype=summary.team_ids.dtype,
+        )
+        actual = summary.final_order
+        size = min(len(predicted), len(actual))
+        results.append((summary.season, int((predicted[:size] == actual[:size]).sum())))
+    return results
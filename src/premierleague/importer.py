@@ -0,0 +1,340 @@
+"""Bulk import of predictions from CSV or JSON lines files.
+
+Each row has a ``name``, a ``table`` of team names or ids in predicted order
+and a ``top_scorer``, ``top_assister`` and ``top_keeper`` given by name or id.
+In CSV files the table is one column with the teams separated by ``;``::
+
+    name,table,top_scorer,top_assister,top_keeper
+    Sam,Arsenal;Man City;...,Erling Haaland,Kevin De Bruyne,Alisson Becker
+
+Rows are validated against one reference snapshot of the teams and players,
+in worker processes for large files, and every problem of every row is
+reported at once rather than prompted for.
+"""
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from premierleague.fantasyapi.objects import KEEPER
+from premierleague.names import NameIndex
+from premierleague.store import PredictionRecord, PredictionStore
+
+TABLE_SEPARATOR = ";"
+PICKS = ("top_scorer", "top_assister", "top_keeper")
+# rows validated per task sent to a worker
+CHUNK_SIZE = 500
+
+
+@dataclass
+class RowError:
+    """Problem with a field of an imported row."""
+
+    line: int
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.field}: {self.message}"
+
+
+@dataclass
+class ImportReport:
+    """Outcome of validating the rows of an import file."""
+
+    rows: int = 0
+    records: List[PredictionRecord] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+    stored: int = 0
+
+    @property
+    def invalid_rows(self) -> int:
+        """Number of rows with at least one error."""
+        return len({error.line for error in self.errors})
+
+    def display(self):
+        """Display every error and a summary of the import."""
+        for error in self.errors:
+            print(error)
+        print(
+            f"{self.rows} row(s): {len(self.records)} valid, "
+            f"{self.invalid_rows} invalid, {self.stored} stored"
+        )
+
+
+class Reference:
+    """Teams and players predictions are resolved against.
+
+    Holds only ids and names, so it is cheap to send to worker processes.
+    """
+
+    def __init__(
+        self,
+        teams_raw: List[dict],
+        players_raw: List[dict],
+        snapshot: Optional[str] = None,
+    ):
+        self.snapshot = snapshot
+        teams = [(team["id"], team["name"]) for team in teams_raw]
+        players = [
+            (
+                player["id"],
+                f"{player['first_name']} {player['second_name']}",
+                player["element_type"],
+            )
+            for player in players_raw
+        ]
+        self.team_ids = {team_id for team_id, _ in teams}
+        # exact names resolve with one lookup, the index handles the rest
+        self.team_ids_by_name = {name: team_id for team_id, name in teams}
+        self.player_ids = {player[0] for player in players}
+        self.keeper_ids = {player[0] for player in players if player[2] == KEEPER}
+        self.team_index = NameIndex(teams, lambda team: team[1])
+        self.player_index = NameIndex(players, lambda player: player[1])
+
+    @classmethod
+    def from_api(cls, snapshot: Optional[str] = None) -> "Reference":
+        """Reference of the current (or replayed) api payloads."""
+        from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+
+        return cls(pl_api.get_teams_raw_data(), pl_api.get_players_raw_data(), snapshot)
+
+    @staticmethod
+    def _unknown(kind: str, value: Any, index: NameIndex) -> str:
+        """Message for a name or id not in the reference."""
+        message = f"unknown {kind} {value!r}"
+        suggestions = index.suggest(str(value), limit=3)
+        if suggestions:
+            message += f", did you mean {' or '.join(suggestions)}?"
+        return message
+
+    def team_id(self, value: Any) -> Tuple[Optional[int], Optional[str]]:
+        """Id of a team given by name or id, or the error."""
+        if isinstance(value, str) and value in self.team_ids_by_name:
+            return self.team_ids_by_name[value], None
+        if isinstance(value, int) or str(value).strip().isdigit():
+            team_id = int(value)
+            if team_id in self.team_ids:
+                return team_id, None
+            return None, f"unknown team id {team_id}"
+        team = self.team_index.get(str(value).strip())
+        if team is None:
+            return None, self._unknown("team", value, self.team_index)
+        return team[0], None
+
+    def player_id(
+        self, value: Any, keepers_only: bool = False
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """Id of a player given by name or id, or the error."""
+        if isinstance(value, int) or str(value).strip().isdigit():
+            player_id = int(value)
+            if player_id not in self.player_ids:
+                return None, f"unknown player id {player_id}"
+        else:
+            player = self.player_index.get(str(value).strip())
+            if player is None:
+                return None, self._unknown("player", value, self.player_index)
+            player_id = player[0]
+        if keepers_only and player_id not in self.keeper_ids:
+            return None, f"{value!r} is not a goalkeeper"
+        return player_id, None
+
+
+def read_rows(path: Path) -> List[Tuple[int, Dict[str, Any]]]:
+    """Rows of a CSV or JSON lines file with their line numbers.
+
+    Args:
+        path (Path): ``.csv`` file with a header, or ``.jsonl`` file.
+
+    Returns:
+        List[Tuple[int, Dict[str, Any]]]: each row with the line it is on.
+    """
+    path = Path(path)
+    with open(path, "r", newline="", encoding="utf-8") as rows_file:
+        if path.suffix == ".csv":
+            reader = csv.DictReader(rows_file)
+            return [(reader.line_num, row) for row in reader]
+        rows = []
+        for line, text in enumerate(rows_file, 1):
+            if text.strip():
+                try:
+                    rows.append((line, json.loads(text)))
+                except json.JSONDecodeError as error:
+                    rows.append((line, {"_error": f"invalid json: {error.msg}"}))
+        return rows
+
+
+def _is_name_or_id(value: Any) -> bool:
+    """Whether a value can name a team or player."""
+    return isinstance(value, str) or (
+        isinstance(value, int) and not isinstance(value, bool)
+    )
+
+
+def validate_row(
+    line: int, row: Dict[str, Any], reference: Reference
+) -> Tuple[Optional[PredictionRecord], List[RowError]]:
+    """Resolve a row into a record, collecting every error on the way.
+
+    Args:
+        line (int): line of the row, for the errors.
+        row (Dict[str, Any]): the row read from the file.
+        reference (Reference): teams and players to resolve against.
+
+    Returns:
+        Tuple[Optional[PredictionRecord], List[RowError]]: the record, None
+            if the row has errors, and the errors.
+    """
+    if not isinstance(row, dict):
+        return None, [RowError(line, "row", "not an object")]
+    if "_error" in row:
+        return None, [RowError(line, "row", row["_error"])]
+    errors = []
+    name = str(row.get("name") or "").strip()
+    if not name:
+        errors.append(RowError(line, "name", "missing"))
+
+    table = row.get("table") or []
+    if isinstance(table, str):
+        table = [team for team in table.split(TABLE_SEPARATOR) if team.strip()]
+    elif not isinstance(table, list):
+        errors.append(RowError(line, "table", "expected a list of teams"))
+        table = None
+    table_ids = []
+    seen = set()
+    for position, value in enumerate(table or (), 1):
+        if not _is_name_or_id(value):
+            errors.append(RowError(line, f"table[{position}]", "expected a name or id"))
+            continue
+        team_id, error = reference.team_id(value)
+        if error is not None:
+            errors.append(RowError(line, f"table[{position}]", error))
+        elif team_id in seen:
+            errors.append(RowError(line, f"table[{position}]", f"{value!r} repeated"))
+        else:
+            seen.add(team_id)
+            table_ids.append(team_id)
+    if table is not None and len(table) != len(reference.team_ids):
+        errors.append(
+            RowError(
+                line,
+                "table",
+                f"{len(table)} team(s), expected {len(reference.team_ids)}",
+            )
+        )
+
+    picks = {}
+    for pick in PICKS:
+        value = row.get(pick)
+        if value is None or str(value).strip() == "":
+            errors.append(RowError(line, pick, "missing"))
+            continue
+        if not _is_name_or_id(value):
+            errors.append(RowError(line, pick, "expected a name or id"))
+            continue
+        picks[pick], error = reference.player_id(value, pick == "top_keeper")
+        if error is not None:
+            errors.append(RowError(line, pick, error))
+    if errors:
+        return None, errors
+    return (
+        PredictionRecord(name, table_ids, snapshot=reference.snapshot, **picks),
+        errors,
+    )
+
+
+# reference of a worker process, set once by its initializer
+_reference: Optional[Reference] = None
+
+
+def _init_worker(reference: Reference):
+    global _reference
+    _reference = reference
+
+
+def _validate_chunk(
+    rows: List[Tuple[int, Dict[str, Any]]]
+) -> List[Tuple[Optional[PredictionRecord], List[RowError]]]:
+    return [validate_row(line, row, _reference) for line, row in rows]
+
+
+def validate_rows(
+    rows: List[Tuple[int, Dict[str, Any]]],
+    reference: Reference,
+    workers: Optional[int] = None,
+) -> ImportReport:
+    """Validate rows, in worker processes when there is more than one chunk.
+
+    The reference is sent to each worker once, and names repeated within the
+    rows are reported against every repeat after the first.
+
+    Args:
+        rows (List[Tuple[int, Dict[str, Any]]]): rows with their line numbers.
+        reference (Reference): teams and players to resolve against.
+        workers (Optional[int]): worker processes, defaults to cpu count.
+
+    Returns:
+        ImportReport: valid records and errors, in row order.
+    """
+    chunks = [
+        rows[start : start + CHUNK_SIZE] for start in range(0, len(rows), CHUNK_SIZE)
+    ]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks)))
+    if workers == 1:
+        results = [validate_row(line, row, reference) for line, row in rows]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(reference,)
+        ) as executor:
+            results = [
+                result
+                for chunk in executor.map(_validate_chunk, chunks)
+                for result in chunk
+            ]
+
+    report = ImportReport(rows=len(rows))
+    created_at = time.time()
+    first_lines: Dict[str, int] = {}
+    for (line, _), (record, errors) in zip(rows, results):
+        report.errors.extend(errors)
+        if record is None:
+            continue
+        if record.name in first_lines:
+            report.errors.append(
+                RowError(
+                    line,
+                    "name",
+                    f"{record.name!r} already on line {first_lines[record.name]}",
+                )
+            )
+            continue
+        first_lines[record.name] = line
+        record.created_at = created_at
+        report.records.append(record)
+    return report
+
+
+def import_predictions(
+    path: Path,
+    store: PredictionStore,
+    reference: Reference,
+    workers: Optional[int] = None,
+) -> ImportReport:
+    """Validate a file of predictions and store the valid ones in one batch.
+
+    Args:
+        path (Path): CSV or JSON lines file of predictions.
+        store (PredictionStore): store to write to.
+        reference (Reference): teams and players to resolve against.
+        workers (Optional[int]): worker processes, defaults to cpu count.
+
+    Returns:
+        ImportReport: valid records, errors and the number stored.
+    """
+    report = validate_rows(read_rows(path), reference, workers)
+    report.stored = store.add_many(report.records)
+    return report
@@ -0,0 +1,213 @@
+"""Leaderboard of every stored prediction with memoized scores."""
+import hashlib
+import json
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from premierleague import render, tracing
+from premierleague.fantasyapi.decoding import loads
+from premierleague.scoring import PredictionScore, PredictionScorer
+from premierleague.store import TABLE_DTYPE, PredictionStore
+
+
+def prediction_digest(
+    table_ids: bytes, top_scorer: int, top_assister: int, top_keeper: int
+) -> bytes:
+    """Hash of a stored prediction, changes whenever the prediction does."""
+    picks = struct.pack("<3q", top_scorer, top_assister, top_keeper)
+    return hashlib.blake2b(table_ids + picks, digest_size=16).digest()
+
+
+@dataclass
+class LeaderboardReport:
+    """Ranked prediction scores with how many had to be recomputed."""
+
+    scores: List[PredictionScore] = field(default_factory=list)
+    ranks: List[int] = field(default_factory=list)
+    tables_scored: int = 0
+    players_scored: int = 0
+    seconds: float = 0.0
+
+    def display(self, fmt: str = "text"):
+        """Display the leaderboard as text, json or csv."""
+        render.leaderboard(
+            self.ranks,
+            self.scores,
+            footer=f"Ranked {len(self.scores)} prediction(s) in {self.seconds:.4f}s, "
+            f"rescored {self.tables_scored} table(s) and "
+            f"{self.players_scored} player pick(s)",
+        ).write(fmt)
+
+
+class Leaderboard:
+    """Rank stored predictions, reusing scores while their inputs are unchanged.
+
+    Scores are memoized in the prediction database at two levels. The whole
+    ranking is kept against the store revision and the keys of the league
+    snapshot, so asking again with nothing changed is a single row read.
+    Below that each prediction's score is kept in two parts, keyed by a hash
+    of the prediction: the teams in the correct position, keyed by the actual
+    table order, and the scorer, assister and keeper hits, keyed by the
+    current leaders. After a refresh only the part whose key changed is
+    recomputed, so a change in the player stats leaves the table scores alone
+    and vice versa. Scores of predictions no longer in the store are dropped
+    whenever the ranking is recomputed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            name TEXT PRIMARY KEY,
+            digest BLOB NOT NULL,
+            table_key TEXT NOT NULL,
+            teams_in_correct_position INTEGER NOT NULL,
+            players_key TEXT NOT NULL,
+            is_top_scorer_correct INTEGER NOT NULL,
+            is_top_assister_correct INTEGER NOT NULL,
+            is_top_keeper_correct INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS leaderboard (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            revision INTEGER NOT NULL,
+            table_key TEXT NOT NULL,
+            players_key TEXT NOT NULL,
+            ranking BLOB NOT NULL
+        );
+    """
+
+    def __init__(self, store: PredictionStore, scorer: PredictionScorer):
+        self.store = store
+        self.scorer = scorer
+        self.store.connection.executescript(self.SCHEMA)
+
+    @property
+    def key(self) -> Tuple[int, str, str]:
+        """What the whole ranking depends on."""
+        return self.store.revision, self.scorer.table_key, self.scorer.players_key
+
+    @tracing.traced("Leaderboard.rank")
+    def rank(self) -> LeaderboardReport:
+        """Score and rank every stored prediction.
+
+        Returns:
+            LeaderboardReport: predictions by total score, best first, ties
+                sharing a position and ordered by name.
+        """
+        start = time.perf_counter()
+        key = self.key
+        row = self.store.connection.execute(
+            "SELECT revision, table_key, players_key, ranking FROM leaderboard"
+        ).fetchone()
+        if row is not None and tuple(row[:3]) == key:
+            report = LeaderboardReport()
+            for rank, *score in loads(zlib.decompress(row[3])):
+                report.ranks.append(rank)
+                report.scores.append(PredictionScore(*score))
+        else:
+            report = self._rescore()
+            ranking = [
+                [
+                    rank,
+                    score.name,
+                    score.teams_in_correct_position,
+                    score.is_top_scorer_correct,
+                    score.is_top_assister_correct,
+                    score.is_top_keeper_correct,
+                ]
+                for rank, score in zip(report.ranks, report.scores)
+            ]
+            with self.store.connection:
+                self.store.connection.execute(
+                    "INSERT OR REPLACE INTO leaderboard VALUES (0, ?, ?, ?, ?)",
+                    (*key, zlib.compress(json.dumps(ranking).encode())),
+                )
+        report.seconds = time.perf_counter() - start
+        return report
+
+    @tracing.traced("Leaderboard.rescore")
+    def _rescore(self) -> LeaderboardReport:
+        """Rank every prediction, recomputing only the stale score parts."""
+        rows = self.store.connection.execute(
+            """
+            SELECT p.name, p.table_ids, p.top_scorer, p.top_assister,
+                p.top_keeper, s.digest, s.table_key,
+                s.teams_in_correct_position, s.players_key,
+                s.is_top_scorer_correct, s.is_top_assister_correct,
+                s.is_top_keeper_correct
+            FROM predictions AS p LEFT JOIN scores AS s USING (name)
+            ORDER BY p.name
+            """
+        ).fetchall()
+        # scores of predictions that were removed are never read again
+        with self.store.connection:
+            self.store.connection.execute(
+                "DELETE FROM scores WHERE name NOT IN (SELECT name FROM predictions)"
+            )
+        if not rows:
+            return LeaderboardReport()
+        names, tables, scorers, assisters, keepers, *cached = zip(*rows)
+        digests = list(map(prediction_digest, tables, scorers, assisters, keepers))
+        unchanged = np.array(
+            [old == new for old, new in zip(cached[0], digests)], dtype=bool
+        )
+        # missing scores are read as NaN, their rows are stale anyway
+        teams_correct = np.array(cached[2], dtype=float)
+        hits = np.array(cached[4:], dtype=float)
+        stale_table = ~unchanged | (np.array(cached[1]) != self.scorer.table_key)
+        stale_players = ~unchanged | (np.array(cached[3]) != self.scorer.players_key)
+
+        table_rows = np.flatnonzero(stale_table)
+        if len(table_rows):
+            teams_correct[table_rows] = self.scorer.score_tables(
+                [np.frombuffer(tables[row], dtype=TABLE_DTYPE) for row in table_rows]
+            )
+        player_rows = np.flatnonzero(stale_players)
+        if len(player_rows):
+            hits[:, player_rows] = self.scorer.score_players(
+                *(
+                    [column[row] for row in player_rows]
+                    for column in (scorers, assisters, keepers)
+                )
+            )
+        teams_correct = teams_correct.astype(np.int64)
+        hits = hits.astype(bool)
+
+        changed = np.flatnonzero(stale_table | stale_players).tolist()
+        with self.store.connection:
+            self.store.connection.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        names[row],
+                        digests[row],
+                        self.scorer.table_key,
+                        int(teams_correct[row]),
+                        self.scorer.players_key,
+                        *hits[:, row].tolist(),
+                    )
+                    for row in changed
+                ],
+            )
+
+        # rows are in name order, so a stable sort on total breaks ties by name
+        totals = teams_correct + hits.sum(axis=0)
+        order = np.argsort(-totals, kind="stable")
+        ordered_totals = -totals[order]
+        ranks = np.searchsorted(ordered_totals, ordered_totals, side="left") + 1
+        return LeaderboardReport(
+            scores=[
+                PredictionScore(names[row], *values)
+                for row, *values in zip(
+                    order.tolist(),
+                    teams_correct[order].tolist(),
+                    *hits[:, order].tolist(),
+                )
+            ],
+            ranks=ranks.tolist(),
+            tables_scored=len(table_rows),
+            players_scored=len(player_rows),
+        )
@@ -0,0 +1,120 @@
+"""Name index for looking up players and teams."""
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+_NOT_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(name: str) -> str:
+    """Fold case, accents and punctuation out of a name.
+
+    Args:
+        name (str): name as typed or as given by the api.
+
+    Returns:
+        str: lower case ascii words separated by single spaces, so that
+            "Ødegaard" and "odegaard" or "Nott'm Forest" and "nottm forest"
+            compare equal.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.replace("Ø", "O").replace("ø", "o"))
+    ascii_name = "".join(char for char in decomposed if not unicodedata.combining(char))
+    ascii_name = ascii_name.casefold().replace("'", "")
+    return _NOT_ALPHANUMERIC.sub(" ", ascii_name).strip()
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Character trigrams of a normalized name.
+
+    The name is padded with two spaces at either end, so its first and last
+    letters start and end grams of their own, as do the letters around the
+    single spaces between words: "bruno fernandes" gives "  b", " br",
+    " fe", "es " and "s  " among others.
+    """
+    padded = f"  {normalized}  "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex(Generic[T]):
+    """Exact and fuzzy lookup of items by name.
+
+    Names are mapped to items exactly and by normalized form, and every
+    normalized name is entered in a trigram inverted index so suggestions for
+    a mistyped name only look at names sharing part of it.
+    """
+
+    def __init__(self, items: Iterable[T], name: Callable[[T], str]):
+        self._exact: Dict[str, T] = {}
+        self._normalized: Dict[str, T] = {}
+        self._names: List[str] = []
+        self._normalized_names: List[str] = []
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for item in items:
+            item_name = name(item)
+            if item_name in self._exact:
+                continue
+            normalized = normalize(item_name)
+            self._exact[item_name] = item
+            self._normalized.setdefault(normalized, item)
+            entry = len(self._names)
+            self._names.append(item_name)
+            self._normalized_names.append(normalized)
+            grams = trigrams(normalized)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(entry)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, item_name: str) -> bool:
+        return self.get(item_name) is not None
+
+    def get(self, item_name: str) -> Optional[T]:
+        """Get the item with a name, ignoring case, accents and punctuation.
+
+        Args:
+            item_name (str): name to look up.
+
+        Returns:
+            Optional[T]: item with the name, None if there is none.
+        """
+        item = self._exact.get(item_name)
+        if item is None:
+            item = self._normalized.get(normalize(item_name))
+        return item
+
+    def suggest(self, item_name: str, limit: int = 5, cutoff: float = 0.3) -> List[str]:
+        """Get the names closest to a mistyped name, best first.
+
+        Names are ranked by trigram similarity (Dice coefficient), with names
+        containing the query as a substring ranked above all others.
+
+        Args:
+            item_name (str): name to find suggestions for.
+            limit (int): most suggestions to return.
+            cutoff (float): lowest similarity worth suggesting.
+
+        Returns:
+            List[str]: suggested names.
+        """
+        query = normalize(item_name)
+        if not query:
+            return []
+        grams = trigrams(query)
+        shared = Counter(
+            entry for gram in grams for entry in self._postings.get(gram, ())
+        )
+        scores = {}
+        for entry, count in shared.items():
+            score = 2 * count / (len(grams) + self._gram_counts[entry])
+            if query in self._normalized_names[entry]:
+                score += 1
+            if score >= cutoff:
+                scores[entry] = score
+        ranked = sorted(scores, key=lambda entry: (-scores[entry], self._names[entry]))
+        return [self._names[entry] for entry in ranked[:limit]]
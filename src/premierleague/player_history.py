@@ -0,0 +1,342 @@
+"""Per-gameweek player stats in a memory-mapped columnar store.
+
+``bootstrap-static`` only has season totals. The ingester fetches every
+player's ``element-summary/{id}/`` with bounded concurrency and a request
+rate limit and writes each player's gameweeks into one ``int32`` array of
+shape (stats, players, gameweeks + 1) memory-mapped from disk, so top-N
+queries over any gameweek range read only the columns they sum.
+"""
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.decoding import loads
+
+DEFAULT_PLAYER_HISTORY_DIR = Path(
+    os.environ.get(
+        "PREMIERLEAGUE_PLAYER_HISTORY_DIR",
+        Path.home() / ".cache" / "premierleague" / "player-history",
+    )
+)
+# per fixture stats of element-summary history that are kept
+HISTORY_STATS = (
+    "minutes",
+    "goals_scored",
+    "assists",
+    "clean_sheets",
+    "goals_conceded",
+    "own_goals",
+    "penalties_saved",
+    "penalties_missed",
+    "yellow_cards",
+    "red_cards",
+    "saves",
+    "bonus",
+    "bps",
+    "total_points",
+)
+GAMEWEEKS = 38
+
+
+class PlayerHistoryStore:
+    """Per-gameweek stats of every player, memory-mapped from a directory.
+
+    ``values[stat, row, gameweek]`` holds a player's stat in a gameweek,
+    summed over double gameweeks, with rows in player id order. ``done``
+    marks the players already ingested so an interrupted ingest resumes.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_PLAYER_HISTORY_DIR):
+        self.directory = Path(directory)
+        with open(self.directory / "meta.json", "r") as meta_file:
+            meta = json.load(meta_file)
+        self.stats: Tuple[str, ...] = tuple(meta["stats"])
+        self.gameweeks: int = meta["gameweeks"]
+        self.ids = np.load(self.directory / "ids.npy")
+        self.positions = np.load(self.directory / "positions.npy")
+        self.names = np.load(self.directory / "names.npy")
+        self.values = np.load(self.directory / "values.npy", mmap_mode="r+")
+        self.done = np.load(self.directory / "done.npy", mmap_mode="r+")
+
+    @classmethod
+    def create(
+        cls,
+        players_raw: List[dict],
+        directory: Path = DEFAULT_PLAYER_HISTORY_DIR,
+        gameweeks: int = GAMEWEEKS,
+        stats: Sequence[str] = HISTORY_STATS,
+    ) -> "PlayerHistoryStore":
+        """Open the store for a set of players, creating it if needed.
+
+        An existing store with the same stats and gameweeks is kept, and the
+        rows of players already ingested are carried over if players were
+        added or removed since.
+
+        Args:
+            players_raw (List[dict]): raw players of bootstrap-static.
+            directory (Path): directory of the store.
+            gameweeks (int): gameweeks in the season.
+            stats (Sequence[str]): stats to keep.
+
+        Returns:
+            PlayerHistoryStore: the opened store.
+        """
+        directory = Path(directory)
+        ids = np.array(sorted(player["id"] for player in players_raw), dtype=np.int64)
+        previous = None
+        if (directory / "meta.json").exists():
+            previous = cls(directory)
+            if (
+                previous.stats == tuple(stats)
+                and previous.gameweeks == gameweeks
+                and np.array_equal(previous.ids, ids)
+            ):
+                return previous
+
+        players_by_id = {player["id"]: player for player in players_raw}
+        values = np.zeros((len(stats), len(ids), gameweeks + 1), dtype=np.int32)
+        done = np.zeros(len(ids), dtype=bool)
+        if previous is not None:
+            kept = [
+                previous.stats.index(stat) if stat in previous.stats else -1
+                for stat in stats
+            ]
+            _, new_rows, old_rows = np.intersect1d(
+                ids, previous.ids[previous.done], return_indices=True
+            )
+            old_rows = np.flatnonzero(previous.done)[old_rows]
+            width = min(gameweeks, previous.gameweeks) + 1
+            for stat, old_stat in enumerate(kept):
+                if old_stat >= 0:
+                    values[stat, new_rows, :width] = previous.values[
+                        old_stat, old_rows, :width
+                    ]
+            done[new_rows] = all(old_stat >= 0 for old_stat in kept)
+            del previous
+        # build the new store beside the old one and swap it in whole, so an
+        # interrupted create leaves the old store as it was
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        building = Path(
+            tempfile.mkdtemp(prefix=f".{directory.name}-", dir=directory.parent)
+        )
+        try:
+            np.save(building / "ids.npy", ids)
+            ordered = [players_by_id[player_id] for player_id in ids.tolist()]
+            np.save(
+                building / "positions.npy",
+                np.array([player["element_type"] for player in ordered], dtype=np.int8),
+            )
+            np.save(
+                building / "names.npy",
+                np.array(
+                    [
+                        f"{player['first_name']} {player['second_name']}"
+                        for player in ordered
+                    ],
+                    dtype=str,
+                ),
+            )
+            np.save(building / "values.npy", values)
+            np.save(building / "done.npy", done)
+            with open(building / "meta.json", "w") as meta_file:
+                json.dump({"stats": list(stats), "gameweeks": gameweeks}, meta_file)
+            if directory.exists():
+                replaced = building.with_name(building.name + "-old")
+                os.replace(directory, replaced)
+                os.replace(building, directory)
+                shutil.rmtree(replaced)
+            else:
+                os.replace(building, directory)
+        finally:
+            if building.exists():
+                shutil.rmtree(building)
+        return cls(directory)
+
+    def pending(self) -> List[int]:
+        """Ids of the players not ingested yet."""
+        return self.ids[~self.done].tolist()
+
+    def row(self, player_id: int) -> int:
+        """Row of a player id."""
+        row = int(np.searchsorted(self.ids, player_id))
+        if row >= len(self.ids) or self.ids[row] != player_id:
+            raise KeyError(f"{player_id} is not in the player history.")
+        return row
+
+    def write(self, player_id: int, history: List[dict]):
+        """Store the fixtures a player has played and mark them ingested.
+
+        Args:
+            player_id (int): id of the player.
+            history (List[dict]): ``history`` of the player's element-summary.
+        """
+        row = self.row(player_id)
+        rounds = np.array(
+            [fixture.get("round") or 0 for fixture in history], dtype=np.int64
+        )
+        valid = (rounds > 0) & (rounds <= self.gameweeks)
+        player_values = np.zeros((len(self.stats), self.gameweeks + 1), dtype=np.int32)
+        for stat, name in enumerate(self.stats):
+            column = np.array(
+                [fixture.get(name) or 0 for fixture in history], dtype=np.int64
+            )
+            np.add.at(player_values[stat], rounds[valid], column[valid])
+        self.values[:, row] = player_values
+        self.done[row] = True
+
+    def flush(self):
+        """Write pending changes to disk."""
+        self.values.flush()
+        self.done.flush()
+
+    def totals(
+        self, stat: str, first: int = 1, last: Optional[int] = None
+    ) -> np.ndarray:
+        """Sum of a stat over a gameweek range for every player.
+
+        Args:
+            stat (str): stat to sum.
+            first (int): first gameweek of the range.
+            last (Optional[int]): last gameweek of the range, the last
+                gameweek of the season if not given.
+
+        Returns:
+            np.ndarray: total of each player, in row order.
+        """
+        last = self.gameweeks if last is None else min(last, self.gameweeks)
+        return self.values[self.stats.index(stat), :, max(first, 1) : last + 1].sum(
+            axis=1
+        )
+
+    def top_k(
+        self,
+        stat: str,
+        k: int,
+        first: int = 1,
+        last: Optional[int] = None,
+        position: Optional[int] = None,
+    ) -> List[Tuple[int, str, int]]:
+        """The players with the most of a stat over a gameweek range.
+
+        Args:
+            stat (str): stat to rank by.
+            k (int): number of players.
+            first (int): first gameweek of the range.
+            last (Optional[int]): last gameweek of the range.
+            position (Optional[int]): element type to restrict to.
+
+        Returns:
+            List[Tuple[int, str, int]]: id, name and total of up to k
+                players, highest first, ties by id.
+        """
+        if k <= 0:
+            return []
+        totals = self.totals(stat, first, last)
+        rows = np.arange(len(self.ids))
+        if position is not None:
+            rows = rows[self.positions == position]
+        values = totals[rows]
+        if k < len(rows):
+            # stable top k: partition on value, then sort the candidates
+            threshold = np.partition(values, len(values) - k)[len(values) - k]
+            candidates = np.flatnonzero(values >= threshold)
+        else:
+            candidates = np.arange(len(rows))
+        order = candidates[np.lexsort((rows[candidates], -values[candidates]))][:k]
+        return list(
+            zip(
+                self.ids[rows[order]].tolist(),
+                self.names[rows[order]].tolist(),
+                values[order].tolist(),
+            )
+        )
+
+
+class RateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        """Wait for the next free request slot."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class PlayerHistoryIngester:
+    """Fetch the element-summary of every pending player into a store.
+
+    At most ``concurrency`` requests are in flight, over the api client's
+    pooled transport, and no more than ``rate`` are started per second. The
+    concurrency is capped at the transport's pool size, past which requests
+    would each open a connection that the pool then discards.
+    Each player is written and marked done as soon as it arrives, so
+    stopping and rerunning the ingest only fetches the players left.
+    """
+
+    def __init__(
+        self, store: PlayerHistoryStore, concurrency: int = 8, rate: float = 10.0
+    ):
+        self.store = store
+        self.concurrency = min(concurrency, pl_api.transport.pool_maxsize)
+        self.limiter = RateLimiter(rate)
+        self.failed: Dict[int, str] = {}
+
+    def _fetch(self, player_id: int) -> List[dict]:
+        """Request the match history of a player, blocking."""
+        response = pl_api.transport.get(
+            f"{pl_api.BASE_URL}/element-summary/{player_id}/"
+        )
+        response.raise_for_status()
+        return loads(response.content).get("history", [])
+
+    async def run(self, progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """Ingest every pending player.
+
+        Args:
+            progress (Optional[Callable[[int, int], None]]): called with the
+                players done and the total after each one.
+
+        Returns:
+            int: players ingested by this run.
+        """
+        pending = self.store.pending()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        ingested = 0
+
+        async def ingest(player_id: int):
+            nonlocal ingested
+            async with semaphore:
+                await self.limiter.wait()
+                try:
+                    history = await asyncio.to_thread(self._fetch, player_id)
+                except Exception as error:
+                    self.failed[player_id] = str(error)
+                    return
+            self.store.write(player_id, history)
+            ingested += 1
+            if ingested % 50 == 0:
+                self.store.flush()
+            if progress is not None:
+                progress(ingested, len(pending))
+
+        try:
+            await asyncio.gather(*(ingest(player_id) for player_id in pending))
+        finally:
+            self.store.flush()
+        return ingested
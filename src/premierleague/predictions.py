@@ -10,6 +10,10 @@ from pydantic import BaseModel
 
 from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
 from premierleague.fantasyapi.objects import Player, Team
+from premierleague.names import NameIndex
+from premierleague.registry import Registry
+
+PREDICTIONS_PATH = Path(__file__).parent / "predictions"
 
 
 class Validator:
@@ -18,56 +22,33 @@ class Validator:
     def __init__(self):
         self.players = pl_api.get_players()
         self.teams = pl_api.get_teams()
+        self.player_index = NameIndex(self.players.players, lambda player: player.name)
+        self.keeper_index = NameIndex(self.players.keepers, lambda player: player.name)
+        self.team_index = NameIndex(self.teams, lambda team: team.name)
 
     @staticmethod
-    def _get_close_player_names(
-        player_name: str, valid_player_names: List[str]
-    ) -> List[str]:
-        """Get close matches for player names."""
-        return [
-            name for name in valid_player_names if player_name.lower() in name.lower()
-        ]
-
-    @staticmethod
-    def _get_close_team_names(team_name: str, valid_team_names: List[str]) -> List[str]:
-        """Get close matches for team names."""
-        return [name for name in valid_team_names if team_name.lower() in name.lower()]
+    def _validate_name(name: str, index: NameIndex) -> bool:
+        """Check a name is in an index, suggesting close matches if not."""
+        if name in index:
+            return True
+        close_matches = index.suggest(name)
+        if close_matches:
+            print("Did you mean...")
+            for match in close_matches:
+                print(f"\t{match}")
+        else:
+            print("No matches found.")
+        return False
 
-    # TODO: make the lower case checking work everywhere
     def validate_player_name(self, player_name: str, keepers_only=False) -> bool:
         """Validate the name of a player."""
         if keepers_only:
-            valid_player_names = self.players.get_player_names(self.players.keepers)
-        else:
-            valid_player_names = self.players.get_player_names()
-        if player_name in valid_player_names:
-            return True
-        else:
-            close_matches = self._get_close_player_names(
-                player_name, valid_player_names
-            )
-            if close_matches:
-                print("Did you mean...")
-                for match in close_matches:
-                    print(f"\t{match}")
-            else:
-                print("No matches found.")
-            return False
+            return self._validate_name(player_name, self.keeper_index)
+        return self._validate_name(player_name, self.player_index)
 
     def validate_team_name(self, team_name: str) -> bool:
         """Validate the name of a team."""
-        valid_team_names = [team.name for team in self.teams]
-        if team_name in valid_team_names:
-            return True
-        else:
-            close_matches = self._get_close_team_names(team_name, valid_team_names)
-            if close_matches:
-                print("Did you mean...")
-                for match in close_matches:
-                    print(f"\t{match}")
-            else:
-                print("No matches found.")
-            return False
+        return self._validate_name(team_name, self.team_index)
 
 
 class Prediction(BaseModel):
@@ -79,6 +60,68 @@ class Prediction(BaseModel):
     top_assister: Player
     top_keeper: Player
 
+    @classmethod
+    def from_instances(
+        cls,
+        name: str,
+        table: List[Team],
+        top_scorer: Player,
+        top_assister: Player,
+        top_keeper: Player,
+    ) -> "Prediction":
+        """Build a prediction holding the given instances, without copying.
+
+        Args:
+            name (str): name of the predictor.
+            table (List[Team]): teams in predicted order.
+            top_scorer (Player): predicted top scorer.
+            top_assister (Player): predicted top assister.
+            top_keeper (Player): predicted keeper with most clean sheets.
+
+        Returns:
+            Prediction: prediction referencing the instances.
+        """
+        fields = dict(
+            name=name,
+            table=table,
+            top_scorer=top_scorer,
+            top_assister=top_assister,
+            top_keeper=top_keeper,
+        )
+        if hasattr(cls, "model_construct"):
+            return cls.model_construct(**fields)
+        return cls.construct(**fields)
+
+    @classmethod
+    def load(cls, data: dict, registry: Registry) -> "Prediction":
+        """Build a saved prediction from the teams and players of a registry.
+
+        Args:
+            data (dict): saved prediction, with teams and players given by id
+                or as full objects.
+            registry (Registry): registry to resolve them with.
+
+        Returns:
+            Prediction: prediction sharing the registry's instances.
+        """
+        return cls.from_instances(
+            name=data["name"],
+            table=[registry.team(team) for team in data["table"]],
+            top_scorer=registry.player(data["top_scorer"]),
+            top_assister=registry.player(data["top_assister"]),
+            top_keeper=registry.player(data["top_keeper"]),
+        )
+
+    def to_ids(self) -> dict:
+        """Saved form of the prediction, with teams and players as ids."""
+        return {
+            "name": self.name,
+            "table": [team.id for team in self.table],
+            "top_scorer": self.top_scorer.id,
+            "top_assister": self.top_assister.id,
+            "top_keeper": self.top_keeper.id,
+        }
+
     @staticmethod
     def _correctness_message(correct: bool) -> str:
         """Get string from bool.
@@ -106,19 +149,24 @@ class Prediction(BaseModel):
     @property
     def is_top_scorer_correct(self) -> bool:
         """Check if top scorer is correct."""
-        return self.top_scorer in pl_api.get_players().get_top_scorers()
+        return self.top_scorer.id in {
+            player.id for player in pl_api.get_players().get_top_scorers()
+        }
 
     @property
     def is_top_assister_correct(self) -> bool:
         """Check if top assister is correct."""
-        return self.top_assister in pl_api.get_players().get_top_assisters()
+        return self.top_assister.id in {
+            player.id for player in pl_api.get_players().get_top_assisters()
+        }
 
     @property
     def is_top_keeper_correct(self) -> bool:
         """Check if top keeper is correct."""
-        return (
-            self.top_keeper in pl_api.get_players().get_keepers_with_most_clean_sheets()
-        )
+        return self.top_keeper.id in {
+            player.id
+            for player in pl_api.get_players().get_keepers_with_most_clean_sheets()
+        }
 
     def display_correctness(self):
         """Output how correct the prediction was."""
@@ -139,29 +187,54 @@ class Prediction(BaseModel):
     def save(self):
         """Save prediction to JSON file."""
         # TODO: check if file exists and then ask user if they want to overwrite
-        predictions_path = Path(__file__).parent / "predictions"
-        if not os.path.exists(predictions_path):
-            os.makedirs(predictions_path)
-        with open(
-            Path(predictions_path) / f"{self.name}.json", "w"
-        ) as prediction_file:
-            json.dump(self.dict(), prediction_file)
+        if not os.path.exists(PREDICTIONS_PATH):
+            os.makedirs(PREDICTIONS_PATH)
+        with open(PREDICTIONS_PATH / f"{self.name}.json", "w") as prediction_file:
+            json.dump(self.to_ids(), prediction_file)
 
     @staticmethod
-    def read_from_file(file_name: str) -> BaseModel:
+    def read_from_file(
+        file_name: str, registry: Optional[Registry] = None
+    ) -> BaseModel:
         """Read prediction from given JSON file.
         
         Args:
             file_name (str): name of file with .json.
+            registry (Optional[Registry]): registry to resolve teams and
+                players with, the current api's if not given.
 
         Returns:
             Prediction: prediction object for the stored prediction. 
         """
         # TODO: add validation for file path
-        predictions_path = Path(__file__).parent / "predictions"
-        with open(predictions_path / file_name, "r") as prediction_file:
+        with open(PREDICTIONS_PATH / file_name, "r") as prediction_file:
             prediction_json = json.load(prediction_file)
-        return Prediction(**prediction_json)
+        return Prediction.load(prediction_json, registry or Registry.from_api())
+
+    @staticmethod
+    def read_all(
+        directory: Path = PREDICTIONS_PATH, registry: Optional[Registry] = None
+    ) -> List[BaseModel]:
+        """Read every prediction saved in a directory.
+
+        All predictions share the registry's team and player instances.
+
+        Args:
+            directory (Path): directory of prediction JSON files.
+            registry (Optional[Registry]): registry to resolve teams and
+                players with, the current api's if not given.
+
+        Returns:
+            List[Prediction]: the saved predictions, ordered by file name.
+        """
+        registry = registry or Registry.from_api()
+        predictions = []
+        for path in sorted(Path(directory).glob("*.json")):
+            with open(path, "r") as prediction_file:
+                predictions.append(
+                    Prediction.load(json.load(prediction_file), registry)
+                )
+        return predictions
 
 
 @dataclass
@@ -184,36 +257,35 @@ class PredictionReader:
         Returns:
             Team: team with given team name.
         """
-        for team in self.validator.teams:
-            if team.name == team_name:
-                return team
+        return self.validator.team_index.get(team_name)
 
-    def _player_with_name(self, player_name: str) -> Player:
+    def _player_with_name(self, player_name: str, keepers_only=False) -> Player:
         """Get player with specific name.
 
         Args:
             player_name (str): player name.
+            keepers_only (bool): only look for goalkeepers.
 
         Returns:
             Player: player with given name.
         """
-        for player in self.validator.players.players:
-            if player.name == player_name:
-                return player
+        if keepers_only:
+            return self.validator.keeper_index.get(player_name)
+        return self.validator.player_index.get(player_name)
 
     def _read_table_prediction(self):
         """Read predictions for the table state."""
-        team_names = []
+        self.table = []
         for i in range(1, 21):
             while True:
                 next_team = input(f"{i}. ")
                 if self.validator.validate_team_name(next_team):
-                    if next_team in team_names:
+                    team = self._team_with_name(next_team)
+                    if team.id in {chosen.id for chosen in self.table}:
                         print("Team has already been inputted.")
                     else:
-                        team_names.append(next_team)
+                        self.table.append(team)
                         break
-        self.table = [self._team_with_name(team_name) for team_name in team_names]
 
     def _read_top_scorer_prediction(self):
         """Read prediction for top scorer."""
@@ -236,7 +308,7 @@ class PredictionReader:
         while True:
             player_name = input("Top keeper: ")
             if self.validator.validate_player_name(player_name, keepers_only=True):
-                self.top_keeper = self._player_with_name(player_name)
+                self.top_keeper = self._player_with_name(player_name, keepers_only=True)
                 break
 
     def read_predictions(self) -> Prediction:
@@ -0,0 +1,475 @@
+"""Team strength ratings updated result by result.
+
+Two ratings are kept for every team and advanced together over the finished
+fixtures in kickoff order:
+
+* an Elo rating, with a home advantage and updates scaled by the goal margin;
+* Poisson attack and defence strengths, as log multipliers of the league's
+  home and away scoring rates, nudged after every result towards the goals
+  actually scored and conceded.
+
+Every state holds ratings for ``P`` parameter settings at once, as (P, teams)
+arrays, so a backtest of many settings costs the same loop over fixtures as
+fitting one. ``RatingsEngine`` keeps a checkpoint per gameweek, on disk, so a
+new result only advances the ratings from the last checkpoint before it.
+"""
+import hashlib
+import os
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from premierleague import tracing
+from premierleague.fantasyapi.objects import Fixture, FixtureColumns, Team
+from premierleague.simulation import StrengthModel
+
+DEFAULT_RATINGS_CACHE = Path(
+    os.environ.get(
+        "PREMIERLEAGUE_RATINGS_CACHE",
+        Path.home() / ".cache" / "premierleague" / "ratings",
+    )
+)
+# bumped whenever the cached arrays change meaning
+CACHE_VERSION = 1
+INITIAL_ELO = 1500.0
+# starting home and away goals per game before any result is seen
+INITIAL_HOME_GOALS = 1.5
+INITIAL_AWAY_GOALS = 1.2
+
+
+@dataclass(frozen=True)
+class RatingParams:
+    """Settings of the ratings.
+
+    Attributes:
+        k (float): Elo points exchanged by a one goal result at even odds.
+        home_advantage (float): Elo points added to the home team.
+        poisson_rate (float): step of the attack and defence updates.
+    """
+
+    k: float = 20.0
+    home_advantage: float = 60.0
+    poisson_rate: float = 0.05
+
+
+STATE_ARRAYS = (
+    "elo",
+    "attack",
+    "defence",
+    "home_goals",
+    "away_goals",
+    "brier",
+    "log_loss",
+)
+
+
+@dataclass
+class RatingState:
+    """Ratings after some fixtures, for one or many parameter settings.
+
+    ``brier`` and ``log_loss`` total how well the ratings predicted each
+    result before seeing it: the Brier score of the Elo win expectancy and
+    the Poisson negative log likelihood of the score.
+    """
+
+    elo: np.ndarray
+    attack: np.ndarray
+    defence: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    brier: np.ndarray
+    log_loss: np.ndarray
+    fixtures: int = 0
+
+    @classmethod
+    def initial(cls, settings: int, team_count: int) -> "RatingState":
+        """Everyone average, nothing played."""
+        return cls(
+            elo=np.full((settings, team_count), INITIAL_ELO),
+            attack=np.zeros((settings, team_count)),
+            defence=np.zeros((settings, team_count)),
+            home_goals=np.full(settings, np.log(INITIAL_HOME_GOALS)),
+            away_goals=np.full(settings, np.log(INITIAL_AWAY_GOALS)),
+            brier=np.zeros(settings),
+            log_loss=np.zeros(settings),
+        )
+
+    def copy(self) -> "RatingState":
+        """Independent copy of the state."""
+        return replace(
+            self, **{name: getattr(self, name).copy() for name in STATE_ARRAYS}
+        )
+
+    def strength_model(self, setting: int = 0) -> StrengthModel:
+        """Poisson strengths of one setting as a season simulation model."""
+        return StrengthModel(
+            home_goals=float(np.exp(self.home_goals[setting])),
+            away_goals=float(np.exp(self.away_goals[setting])),
+            attack=np.exp(self.attack[setting]),
+            defence=np.exp(self.defence[setting]),
+        )
+
+
+def _log_factorial(goals: np.ndarray) -> np.ndarray:
+    """log(goals!) of small goal counts."""
+    return np.cumsum(np.log(np.maximum(np.arange(16), 1)))[np.minimum(goals, 15)]
+
+
+def advance(
+    state: RatingState,
+    params: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    home: np.ndarray,
+    away: np.ndarray,
+    home_score: np.ndarray,
+    away_score: np.ndarray,
+):
+    """Apply results to a state in place, in the given order.
+
+    Each result is applied to every parameter setting at once.
+
+    Args:
+        state (RatingState): state to advance.
+        params (Tuple[np.ndarray, np.ndarray, np.ndarray]): k, home advantage
+            and Poisson rate of each setting, each of shape (P,).
+        home (np.ndarray): home team index of each fixture.
+        away (np.ndarray): away team index of each fixture.
+        home_score (np.ndarray): home goals of each fixture.
+        away_score (np.ndarray): away goals of each fixture.
+    """
+    k, home_advantage, rate = params
+    elo, attack, defence = state.elo, state.attack, state.defence
+    # everything that only depends on the result, for all fixtures at once
+    outcome = (np.sign(home_score - away_score) + 1) / 2
+    margin = np.log1p(np.abs(home_score - away_score)) + 1
+    factorials = _log_factorial(home_score) + _log_factorial(away_score)
+    for h, a, outcome_, margin_, home_goals, away_goals, factorial in zip(
+        home.tolist(),
+        away.tolist(),
+        outcome.tolist(),
+        margin.tolist(),
+        home_score.tolist(),
+        away_score.tolist(),
+        factorials.tolist(),
+    ):
+        expected = 1 / (1 + 10 ** ((elo[:, a] - elo[:, h] - home_advantage) / 400))
+        change = k * margin_ * (outcome_ - expected)
+        elo[:, h] += change
+        elo[:, a] -= change
+
+        home_rate = np.exp(state.home_goals + attack[:, h] + defence[:, a])
+        away_rate = np.exp(state.away_goals + attack[:, a] + defence[:, h])
+        state.brier += (outcome_ - expected) ** 2
+        state.log_loss += (
+            home_rate
+            + away_rate
+            - home_goals * np.log(home_rate)
+            - away_goals * np.log(away_rate)
+            + factorial
+        )
+        home_error = rate * (home_goals - home_rate)
+        away_error = rate * (away_goals - away_rate)
+        attack[:, h] += home_error
+        defence[:, a] += home_error
+        attack[:, a] += away_error
+        defence[:, h] += away_error
+        # the league scoring rates move more slowly than single teams
+        state.home_goals += home_error / 10
+        state.away_goals += away_error / 10
+    state.fixtures += len(home)
+
+
+def _results(columns: FixtureColumns) -> np.ndarray:
+    """Rows of the scored fixtures in kickoff order, ties by id."""
+    rows = np.flatnonzero(columns.scored)
+    return rows[np.lexsort((columns.ids[rows], columns.kickoff[rows]))]
+
+
+@tracing.traced("ratings.batch_fit")
+def batch_fit(
+    columns: FixtureColumns,
+    team_count: int,
+    k=RatingParams.k,
+    home_advantage=RatingParams.home_advantage,
+    poisson_rate=RatingParams.poisson_rate,
+) -> RatingState:
+    """Fit the ratings of a season for many parameter settings at once.
+
+    The parameters broadcast against each other, so a grid is given as
+    arrays with one axis each, flattened into settings in C order.
+
+    Args:
+        columns (FixtureColumns): fixtures of the season.
+        team_count (int): number of teams.
+        k: Elo k of each setting.
+        home_advantage: Elo home advantage of each setting.
+        poisson_rate: Poisson update step of each setting.
+
+    Returns:
+        RatingState: final ratings and prediction scores of every setting.
+    """
+    params = tuple(
+        param.ravel()
+        for param in np.broadcast_arrays(
+            np.asarray(k, dtype=float),
+            np.asarray(home_advantage, dtype=float),
+            np.asarray(poisson_rate, dtype=float),
+        )
+    )
+    state = RatingState.initial(len(params[0]), team_count)
+    rows = _results(columns)
+    advance(
+        state,
+        params,
+        columns.home[rows],
+        columns.away[rows],
+        columns.home_score[rows],
+        columns.away_score[rows],
+    )
+    return state
+
+
+def grid_search(
+    columns: FixtureColumns,
+    team_count: int,
+    ks: List[float],
+    home_advantages: List[float],
+    poisson_rates: List[float],
+) -> List[Tuple[RatingParams, float, float]]:
+    """Backtest every combination of parameters on a season.
+
+    Args:
+        columns (FixtureColumns): fixtures of the season.
+        team_count (int): number of teams.
+        ks (List[float]): Elo k values to try.
+        home_advantages (List[float]): home advantages to try.
+        poisson_rates (List[float]): Poisson steps to try.
+
+    Returns:
+        List[Tuple[RatingParams, float, float]]: each setting with its mean
+            Brier score and Poisson log loss per fixture, best Brier first.
+    """
+    k, home_advantage, rate = np.meshgrid(
+        np.asarray(ks, dtype=float),
+        np.asarray(home_advantages, dtype=float),
+        np.asarray(poisson_rates, dtype=float),
+        indexing="ij",
+    )
+    state = batch_fit(columns, team_count, k, home_advantage, rate)
+    fixtures = max(state.fixtures, 1)
+    results = [
+        (RatingParams(*setting), brier / fixtures, log_loss / fixtures)
+        for setting, brier, log_loss in zip(
+            zip(
+                k.ravel().tolist(),
+                home_advantage.ravel().tolist(),
+                rate.ravel().tolist(),
+            ),
+            state.brier.tolist(),
+            state.log_loss.tolist(),
+        )
+    ]
+    return sorted(results, key=lambda result: (result[1], result[2]))
+
+
+class RatingsEngine:
+    """Ratings of a league kept up to date incrementally.
+
+    The results applied so far are remembered in kickoff order along with a
+    checkpoint of the state as each new gameweek starts. On ``update`` the
+    longest unchanged prefix of results is kept, the state is restored from
+    the last checkpoint inside it and only the results after that are
+    applied, so a new result costs one step rather than a refit, and a
+    corrected result only replays from its gameweek. The checkpoints are
+    cached on disk between runs.
+    """
+
+    def __init__(
+        self,
+        teams: List[Team],
+        params: RatingParams = RatingParams(),
+        cache_dir: Optional[Path] = DEFAULT_RATINGS_CACHE,
+    ):
+        self.teams = teams
+        self.team_index = {team.id: index for index, team in enumerate(teams)}
+        self.params = params
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.state = RatingState.initial(1, len(teams))
+        # latest gameweek with a result applied
+        self.reached = 0
+        # fixture id, home and away goals of each applied result, in order
+        self.applied = np.zeros((0, 3), dtype=np.int64)
+        # results applied, gameweek reached and state before each gameweek
+        self.checkpoints: List[Tuple[int, int, RatingState]] = [
+            (0, 0, self.state.copy())
+        ]
+        self._read_cache()
+
+    @property
+    def _cache_path(self) -> Optional[Path]:
+        """Cache file of the teams and parameters, None if not caching."""
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha1(
+            repr((CACHE_VERSION, self.params, sorted(self.team_index))).encode()
+        )
+        return self.cache_dir / f"ratings-{key.hexdigest()[:16]}.npz"
+
+    def _read_cache(self):
+        """Restore the applied results and checkpoints, if cached."""
+        path = self._cache_path
+        if path is None or not path.exists():
+            return
+        try:
+            with np.load(path) as arrays:
+                if int(arrays["version"]) != CACHE_VERSION:
+                    return
+                applied = arrays["applied"]
+                lengths = arrays["lengths"].tolist()
+                reached = arrays["reached"].tolist()
+                states = [
+                    RatingState(
+                        **{name: arrays[name][index] for name in STATE_ARRAYS},
+                        fixtures=length,
+                    )
+                    for index, length in enumerate(lengths)
+                ]
+        except (OSError, KeyError, ValueError):
+            return
+        self.applied = applied
+        self.checkpoints = list(zip(lengths, reached, states))[:-1]
+        self.reached, self.state = reached[-1], states[-1]
+
+    def _write_cache(self):
+        """Cache the applied results and the checkpoints, followed by the
+        current state, ignoring unwritable directories."""
+        path = self._cache_path
+        if path is None:
+            return
+        checkpoints = self.checkpoints + [(len(self.applied), self.reached, self.state)]
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                path,
+                version=np.array(CACHE_VERSION),
+                applied=self.applied,
+                lengths=np.array([length for length, _, _ in checkpoints]),
+                reached=np.array([reached for _, reached, _ in checkpoints]),
+                **{
+                    name: np.stack(
+                        [getattr(state, name) for _, _, state in checkpoints]
+                    )
+                    for name in STATE_ARRAYS
+                },
+            )
+        except OSError:
+            pass
+
+    @tracing.traced("RatingsEngine.update")
+    def update(self, fixtures: List[Fixture]) -> int:
+        """Bring the ratings up to date with the finished fixtures.
+
+        Args:
+            fixtures (List[Fixture]): fixtures of the league.
+
+        Returns:
+            int: results applied, 0 if nothing changed.
+        """
+        finished = [fixture for fixture in fixtures if fixture.finished]
+        columns = FixtureColumns.from_fixtures(finished, self.team_index)
+        rows = _results(columns)
+        results = np.stack(
+            [columns.ids[rows], columns.home_score[rows], columns.away_score[rows]],
+            axis=1,
+        )
+        common = min(len(results), len(self.applied))
+        differs = np.flatnonzero(
+            np.any(results[:common] != self.applied[:common], axis=1)
+        )
+        kept = int(differs[0]) if len(differs) else common
+        if kept == len(results) == len(self.applied):
+            return 0
+
+        if kept < len(self.applied):
+            while self.checkpoints[-1][0] > kept:
+                self.checkpoints.pop()
+            start, self.reached, checkpoint = self.checkpoints[-1]
+            self.state = checkpoint.copy()
+        else:
+            start = len(self.applied)
+        params = tuple(
+            np.array([value])
+            for value in (
+                self.params.k,
+                self.params.home_advantage,
+                self.params.poisson_rate,
+            )
+        )
+        events = columns.event[rows]
+        position = start
+        while position < len(rows):
+            # a later gameweek starts: checkpoint, then apply all of it, with
+            # any rescheduled fixtures of earlier gameweeks played meanwhile
+            if events[position] > self.reached:
+                if self.checkpoints[-1][0] != position:
+                    self.checkpoints.append((position, self.reached, self.state.copy()))
+                self.reached = int(events[position])
+            end = position + 1
+            while end < len(rows) and events[end] <= self.reached:
+                end += 1
+            batch = rows[position:end]
+            advance(
+                self.state,
+                params,
+                columns.home[batch],
+                columns.away[batch],
+                columns.home_score[batch],
+                columns.away_score[batch],
+            )
+            position = end
+        self.applied = results
+        self._write_cache()
+        return len(rows) - start
+
+    def after(self, gameweek: int) -> RatingState:
+        """Ratings as they stood once a gameweek was complete.
+
+        Args:
+            gameweek (int): gameweek, the ratings before any result if 0.
+
+        Returns:
+            RatingState: the ratings before the first result of any later
+                gameweek.
+        """
+        if self.reached <= gameweek:
+            return self.state
+        for _, reached, state in reversed(self.checkpoints):
+            if reached <= gameweek:
+                return state
+        return self.checkpoints[0][2]
+
+    def table(
+        self, gameweek: Optional[int] = None
+    ) -> List[Tuple[Team, float, float, float]]:
+        """Teams by Elo rating, with their attack and defence multipliers.
+
+        Args:
+            gameweek (Optional[int]): gameweek to rate after, latest if None.
+
+        Returns:
+            List[Tuple[Team, float, float, float]]: team, Elo rating, attack
+                and defence, highest rated first.
+        """
+        state = self.state if gameweek is None else self.after(gameweek)
+        elo = state.elo[0]
+        order = np.lexsort((np.arange(len(elo)), -elo))
+        return [
+            (
+                self.teams[row],
+                float(elo[row]),
+                float(np.exp(state.attack[0, row])),
+                float(np.exp(state.defence[0, row])),
+            )
+            for row in order.tolist()
+        ]
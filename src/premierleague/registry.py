@@ -0,0 +1,83 @@
+"""Interned teams and players of one snapshot of the api."""
+from typing import Dict, List, Optional, Tuple, Union
+
+from premierleague.fantasyapi.objects import Player, Team
+
+
+class Registry:
+    """One ``Team`` and ``Player`` instance per id for a snapshot.
+
+    Everything resolved through the same registry shares these instances, so
+    tens of thousands of predictions hold references to the same 20 teams
+    and a few hundred players rather than copies of them, and two entries are
+    the same team or player exactly when their ids are equal.
+    """
+
+    # registry of the last api payload, with the payload it was built from
+    _current: Optional[Tuple[List[dict], "Registry"]] = None
+
+    def __init__(self, teams_raw: List[dict] = (), players_raw: List[dict] = ()):
+        self.teams: Dict[int, Team] = {}
+        self.players: Dict[int, Player] = {}
+        for raw in teams_raw:
+            self.team(raw, trusted=True)
+        for raw in players_raw:
+            self.player(raw, trusted=True)
+
+    @classmethod
+    def from_api(cls) -> "Registry":
+        """Registry of the current (or replayed) api payloads.
+
+        The registry is rebuilt only when the api returns a new payload, so
+        every caller in between shares one.
+        """
+        from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+
+        players_raw = pl_api.get_players_raw_data()
+        if cls._current is None or cls._current[0] is not players_raw:
+            cls._current = (
+                players_raw,
+                cls(pl_api.get_teams_raw_data(), players_raw),
+            )
+        return cls._current[1]
+
+    def team(self, value: Union[int, dict, Team], trusted: bool = False) -> Team:
+        """Interned team for an id, a raw or saved team, or a team.
+
+        Args:
+            value (Union[int, dict, Team]): team or its id.
+            trusted (bool): build new teams with the trusted loader.
+
+        Returns:
+            Team: the registry's instance of the team.
+        """
+        return self._intern(self.teams, Team, value, trusted)
+
+    def player(self, value: Union[int, dict, Player], trusted: bool = False) -> Player:
+        """Interned player for an id, a raw or saved player, or a player.
+
+        Args:
+            value (Union[int, dict, Player]): player or its id.
+            trusted (bool): build new players with the trusted loader.
+
+        Returns:
+            Player: the registry's instance of the player.
+        """
+        return self._intern(self.players, Player, value, trusted)
+
+    @staticmethod
+    def _intern(interned: dict, model: type, value, trusted: bool):
+        """Look up or add the instance of an id."""
+        if isinstance(value, int):
+            if value not in interned:
+                raise KeyError(f"No {model.__name__.lower()} with id {value}.")
+            return interned[value]
+        item_id = value.id if isinstance(value, model) else value["id"]
+        if item_id not in interned:
+            if isinstance(value, model):
+                interned[item_id] = value
+            elif trusted:
+                interned[item_id] = model.from_trusted(value)
+            else:
+                interned[item_id] = model(**value)
+        return interned[item_id]
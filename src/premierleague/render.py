@@ -0,0 +1,250 @@
+"""Render tables of results as text, json or csv.
+
+Output is built in one buffer and written with a single call, rather than a
+print per cell, and the json and csv forms carry raw values under stable
+field names so scripts can consume them without scraping the text.
+"""
+import csv
+import io
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, TextIO, Tuple
+
+FORMATS = ("text", "json", "csv")
+
+
+def position_text(position: int) -> str:
+    """Table position as shown in text, e.g. ``1.``."""
+    return f"{position}."
+
+
+def yes_no(value: bool) -> str:
+    """Boolean as shown in text."""
+    return "Yes" if value else "No"
+
+
+@dataclass
+class Column:
+    """Column of a rendered table.
+
+    ``key`` names the field in json and csv output and ``heading`` heads the
+    column in text, where values are formatted by ``text``. Columns with
+    ``in_text`` unset only appear in json and csv.
+    """
+
+    key: str
+    heading: str
+    text: Callable[[Any], str] = str
+    in_text: bool = True
+
+
+@dataclass
+class Table:
+    """Rows of values with the columns they are rendered under.
+
+    Text output is tab separated, optionally preceded by a title line and a
+    heading line with a rule under it, and followed by a footer line. Json
+    output is a list of objects and csv output has a header of the keys.
+    """
+
+    columns: List[Column]
+    rows: List[Tuple[Any, ...]] = field(default_factory=list)
+    title: Optional[str] = None
+    header: bool = True
+    rule: Optional[str] = None
+    indent: str = ""
+    footer: Optional[str] = None
+
+    def render(self, fmt: str = "text") -> str:
+        """Render the table.
+
+        Args:
+            fmt (str): ``text``, ``json`` or ``csv``.
+
+        Returns:
+            str: the rendered table, ending in a newline.
+        """
+        if fmt == "json":
+            keys = [column.key for column in self.columns]
+            return json.dumps([dict(zip(keys, row)) for row in self.rows]) + "\n"
+        buffer = io.StringIO()
+        if fmt == "csv":
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(column.key for column in self.columns)
+            writer.writerows(self.rows)
+        elif fmt == "text":
+            self._render_text(buffer)
+        else:
+            raise ValueError(f"{fmt} is not one of {', '.join(FORMATS)}.")
+        return buffer.getvalue()
+
+    def _render_text(self, buffer: io.StringIO):
+        """Write the text form of the table to a buffer."""
+        shown = [
+            (index, column)
+            for index, column in enumerate(self.columns)
+            if column.in_text
+        ]
+        if self.title is not None:
+            buffer.write(self.title + "\n")
+        if self.header:
+            buffer.write("\t".join(column.heading for _, column in shown) + "\n")
+            if self.rule is not None:
+                buffer.write(self.rule + "\n")
+        for row in self.rows:
+            buffer.write(
+                self.indent
+                + "\t".join(column.text(row[index]) for index, column in shown)
+                + "\n"
+            )
+        if self.footer is not None:
+            buffer.write(self.footer + "\n")
+
+    def write(self, fmt: str = "text", stream: Optional[TextIO] = None):
+        """Render the table and write it in one call.
+
+        Args:
+            fmt (str): ``text``, ``json`` or ``csv``.
+            stream (Optional[TextIO]): stream to write to, stdout if not given.
+        """
+        (stream or sys.stdout).write(self.render(fmt))
+
+
+TEAM_COLUMNS = [
+    Column("id", "ID", in_text=False),
+    Column("short_name", "TEAM"),
+    Column("name", "NAME", in_text=False),
+    Column("played", "P"),
+    Column("goal_difference", "GD"),
+    Column("goals_for", "GF"),
+    Column("goals_against", "GA"),
+    Column("points", "POINTS"),
+]
+
+
+def _team_row(team) -> Tuple[Any, ...]:
+    return (
+        team.id,
+        team.short_name,
+        team.name,
+        team.played,
+        team.goal_difference,
+        team.goals_for,
+        team.goals_against,
+        team.points,
+    )
+
+
+def league_table(teams: Iterable) -> Table:
+    """Table of teams in table order."""
+    return Table(
+        [Column("position", "", position_text)] + TEAM_COLUMNS,
+        [(position,) + _team_row(team) for position, team in enumerate(teams, 1)],
+        rule="\t===============================================",
+    )
+
+
+def gameweek_tables(tables: Iterable[Tuple[int, Iterable]]) -> Table:
+    """Tables after each of several gameweeks, as one table.
+
+    Args:
+        tables (Iterable[Tuple[int, Iterable]]): gameweek and the teams in
+            table order after it.
+
+    Returns:
+        Table: a row per team per gameweek.
+    """
+    return Table(
+        [Column("gameweek", "GW"), Column("position", "POS", position_text)]
+        + TEAM_COLUMNS,
+        [
+            (gameweek, position) + _team_row(team)
+            for gameweek, teams in tables
+            for position, team in enumerate(teams, 1)
+        ],
+        rule="=" * 55,
+    )
+
+
+def player_leaders(title: str, stat: str, value: Any, players: Iterable) -> Table:
+    """Players tied on the highest value of a stat.
+
+    Text shows the title and the indented names, json and csv a row per
+    player with its id, name and value.
+    """
+    return Table(
+        [
+            Column("id", "ID", in_text=False),
+            Column("name", "NAME"),
+            Column(stat, stat.upper(), in_text=False),
+        ],
+        [(player.id, player.name, value) for player in players],
+        title=title,
+        header=False,
+        indent="\t",
+    )
+
+
+def ratings(rows: Iterable[Tuple[Any, float, float, float]]) -> Table:
+    """Teams by rating, with their Elo rating and attack and defence
+    multipliers."""
+    return Table(
+        [
+            Column("position", "", position_text),
+            Column("id", "ID", in_text=False),
+            Column("short_name", "TEAM"),
+            Column("name", "NAME", in_text=False),
+            Column("elo", "ELO", lambda value: f"{value:.0f}"),
+            Column("attack", "ATT", lambda value: f"{value:.2f}"),
+            Column("defence", "DEF", lambda value: f"{value:.2f}"),
+        ],
+        [
+            (position, team.id, team.short_name, team.name, elo, attack, defence)
+            for position, (team, elo, attack, defence) in enumerate(rows, 1)
+        ],
+        rule="\t" + "=" * 31,
+    )
+
+
+SCORE_COLUMNS = [
+    Column("name", "NAME"),
+    Column("teams_in_correct_position", "TABLE"),
+    Column("is_top_scorer_correct", "SCORER", yes_no),
+    Column("is_top_assister_correct", "ASSIST", yes_no),
+    Column("is_top_keeper_correct", "KEEPER", yes_no),
+    Column("total", "TOTAL"),
+]
+
+
+def _score_row(score) -> Tuple[Any, ...]:
+    return (
+        score.name,
+        score.teams_in_correct_position,
+        score.is_top_scorer_correct,
+        score.is_top_assister_correct,
+        score.is_top_keeper_correct,
+        score.total,
+    )
+
+
+def scores(scores: Iterable, footer: Optional[str] = None) -> Table:
+    """Scores of predictions."""
+    return Table(
+        SCORE_COLUMNS,
+        [_score_row(score) for score in scores],
+        rule="=" * 46,
+        footer=footer,
+    )
+
+
+def leaderboard(
+    ranks: Iterable[int], scores: Iterable, footer: Optional[str] = None
+) -> Table:
+    """Ranked scores of predictions."""
+    return Table(
+        [Column("rank", "POS", position_text)] + SCORE_COLUMNS,
+        [(rank,) + _score_row(score) for rank, score in zip(ranks, scores)],
+        rule="=" * 54,
+        footer=footer,
+    )
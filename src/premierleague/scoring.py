@@ -0,0 +1,237 @@
+"""Batch scoring of predictions against a single league snapshot."""
+import hashlib
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from premierleague import render, tracing
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.objects import AllPlayers, League
+from premierleague.predictions import PREDICTIONS_PATH, Prediction
+from premierleague.store import PredictionRecord, PredictionStore
+
+
+@dataclass
+class PredictionScore:
+    """Score of a single prediction."""
+
+    name: str
+    teams_in_correct_position: int
+    is_top_scorer_correct: bool
+    is_top_assister_correct: bool
+    is_top_keeper_correct: bool
+
+    @property
+    def total(self) -> int:
+        """Teams in the correct position plus one for each correct player."""
+        return (
+            self.teams_in_correct_position
+            + self.is_top_scorer_correct
+            + self.is_top_assister_correct
+            + self.is_top_keeper_correct
+        )
+
+
+@dataclass
+class ScoringReport:
+    """Scores of a batch of predictions with timings."""
+
+    scores: List[PredictionScore] = field(default_factory=list)
+    load_seconds: float = 0.0
+    score_seconds: float = 0.0
+
+    @property
+    def predictions_per_second(self) -> float:
+        """Scoring throughput."""
+        if not self.score_seconds:
+            return float("inf") if self.scores else 0.0
+        return len(self.scores) / self.score_seconds
+
+    def display(self, fmt: str = "text"):
+        """Display the result table and throughput as text, json or csv."""
+        render.scores(
+            self.scores,
+            footer=f"Scored {len(self.scores)} prediction(s) in "
+            f"{self.score_seconds:.4f}s "
+            f"({self.predictions_per_second:.0f} predictions/s), "
+            f"loaded in {self.load_seconds:.4f}s",
+        ).write(fmt)
+
+
+class PredictionScorer:
+    """Score predictions against one precomputed league snapshot.
+
+    The actual table order and the ids of the top scorers, assisters and
+    keepers are computed once, so scoring needs no further api calls and a
+    whole batch of predictions is compared with a few array operations.
+    """
+
+    def __init__(self, league: League, players: Optional[AllPlayers] = None):
+        players = players or league.players
+        self.table_ids = np.array([team.id for team in league.table], dtype=np.int64)
+        self.top_scorer_ids = np.array(
+            [player.id for player in players.get_top_scorers()], dtype=np.int64
+        )
+        self.top_assister_ids = np.array(
+            [player.id for player in players.get_top_assisters()], dtype=np.int64
+        )
+        self.top_keeper_ids = np.array(
+            [player.id for player in players.get_keepers_with_most_clean_sheets()],
+            dtype=np.int64,
+        )
+        # the table scores only change when the table order does and the
+        # player scores only when one of the leaders does
+        self.table_key = hashlib.sha256(self.table_ids.tobytes()).hexdigest()
+        self.players_key = hashlib.sha256(
+            b"|".join(
+                np.sort(ids).tobytes()
+                for ids in (
+                    self.top_scorer_ids,
+                    self.top_assister_ids,
+                    self.top_keeper_ids,
+                )
+            )
+        ).hexdigest()
+
+    @classmethod
+    def from_api(cls) -> "PredictionScorer":
+        """Create a scorer for the current state of the league."""
+        return cls(pl_api.get_league())
+
+    def _table_matrix(self, tables: List[List[int]]) -> np.ndarray:
+        """Predicted team ids as a matrix, padded to the league size."""
+        size = len(self.table_ids)
+        matrix = np.full((len(tables), size), -1, dtype=np.int64)
+        for row, table in enumerate(tables):
+            table = table[:size]
+            matrix[row, : len(table)] = table
+        return matrix
+
+    def score_tables(self, tables: List[List[int]]) -> np.ndarray:
+        """Number of teams each predicted table has in the correct position."""
+        return (self._table_matrix(tables) == self.table_ids).sum(axis=1)
+
+    def score_players(
+        self,
+        top_scorer_ids: List[int],
+        top_assister_ids: List[int],
+        top_keeper_ids: List[int],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Whether each predicted top scorer, assister and keeper is correct."""
+        return (
+            np.isin(np.asarray(top_scorer_ids), self.top_scorer_ids),
+            np.isin(np.asarray(top_assister_ids), self.top_assister_ids),
+            np.isin(np.asarray(top_keeper_ids), self.top_keeper_ids),
+        )
+
+    def score_ids(
+        self,
+        names: List[str],
+        tables: List[List[int]],
+        top_scorer_ids: List[int],
+        top_assister_ids: List[int],
+        top_keeper_ids: List[int],
+    ) -> List[PredictionScore]:
+        """Score predictions given as team and player ids.
+
+        Args:
+            names (List[str]): names of the predictions.
+            tables (List[List[int]]): predicted team ids in table order.
+            top_scorer_ids (List[int]): predicted top scorer ids.
+            top_assister_ids (List[int]): predicted top assister ids.
+            top_keeper_ids (List[int]): predicted top keeper ids.
+
+        Returns:
+            List[PredictionScore]: score of each prediction.
+        """
+        with tracing.span("score predictions", predictions=len(names)):
+            teams_correct = self.score_tables(tables)
+            scorers, assisters, keepers = self.score_players(
+                top_scorer_ids, top_assister_ids, top_keeper_ids
+            )
+        return [
+            PredictionScore(*row)
+            for row in zip(
+                names,
+                teams_correct.tolist(),
+                scorers.tolist(),
+                assisters.tolist(),
+                keepers.tolist(),
+            )
+        ]
+
+    def score(self, predictions: Iterable[Prediction]) -> List[PredictionScore]:
+        """Score predictions.
+
+        Args:
+            predictions (Iterable[Prediction]): predictions to score.
+
+        Returns:
+            List[PredictionScore]: score of each prediction.
+        """
+        predictions = list(predictions)
+        return self.score_ids(
+            [prediction.name for prediction in predictions],
+            [[team.id for team in prediction.table] for prediction in predictions],
+            [prediction.top_scorer.id for prediction in predictions],
+            [prediction.top_assister.id for prediction in predictions],
+            [prediction.top_keeper.id for prediction in predictions],
+        )
+
+    def score_records(self, records: List[PredictionRecord]) -> List[PredictionScore]:
+        """Score predictions stored as ids.
+
+        Args:
+            records (List[PredictionRecord]): stored predictions.
+
+        Returns:
+            List[PredictionScore]: score of each prediction.
+        """
+        return self.score_ids(
+            [record.name for record in records],
+            [record.table for record in records],
+            [record.top_scorer for record in records],
+            [record.top_assister for record in records],
+            [record.top_keeper for record in records],
+        )
+
+    def score_store(self, store: PredictionStore) -> ScoringReport:
+        """Score every prediction in a store.
+
+        Args:
+            store (PredictionStore): store to load the predictions from.
+
+        Returns:
+            ScoringReport: scores of all predictions with timings.
+        """
+        start = time.perf_counter()
+        records = store.load_all()
+        loaded = time.perf_counter()
+        scores = self.score_records(records)
+        return ScoringReport(
+            scores=scores,
+            load_seconds=loaded - start,
+            score_seconds=time.perf_counter() - loaded,
+        )
+
+    def score_directory(self, directory: Path = PREDICTIONS_PATH) -> ScoringReport:
+        """Score every saved prediction in a directory.
+
+        Args:
+            directory (Path): directory of prediction JSON files.
+
+        Returns:
+            ScoringReport: scores of all predictions with timings.
+        """
+        start = time.perf_counter()
+        predictions = Prediction.read_all(directory)
+        loaded = time.perf_counter()
+        scores = self.score(predictions)
+        return ScoringReport(
+            scores=scores,
+            load_seconds=loaded - start,
+            score_seconds=time.perf_counter() - loaded,
+        )
@@ -0,0 +1,235 @@
+"""Long-running local http server of the table, stats and leaderboard.
+
+``prem serve`` keeps the league, players and predictions in memory, refreshes
+them in the background and answers every request from json rendered at the
+last refresh, so polling dashboards never wait on the fantasy api.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.objects import KEEPER, AllPlayers, League
+from premierleague.leaderboard import Leaderboard
+from premierleague.scoring import PredictionScorer
+from premierleague.store import DEFAULT_DATABASE, PredictionStore
+
+DEFAULT_INTERVAL = 60.0
+# players listed by the stat endpoints
+TOP_PLAYERS = 20
+STATUS_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
+
+
+def table_json(league: League) -> List[dict]:
+    """The table as json rows."""
+    return [
+        {
+            "position": position,
+            "id": team.id,
+            "name": team.name,
+            "short_name": team.short_name,
+            "played": team.played,
+            "points": team.points,
+            "goal_difference": team.goal_difference,
+            "goals_for": team.goals_for,
+            "goals_against": team.goals_against,
+        }
+        for position, team in enumerate(league.table, 1)
+    ]
+
+
+def players_json(
+    players: AllPlayers, stat: str, position: Optional[int] = None
+) -> List[dict]:
+    """The players with the most of a stat as json rows."""
+    rows = players.stats.top_k(stat, TOP_PLAYERS, position)
+    values = players.stats.column(stat)[rows].tolist()
+    return [
+        {"id": player.id, "name": player.name, stat: value}
+        for player, value in zip((players.players[row] for row in rows), values)
+    ]
+
+
+def raw_response(
+    status: int,
+    body: bytes = b"",
+    etag: Optional[str] = None,
+    length: Optional[int] = None,
+) -> bytes:
+    """Serialize an http response with its headers."""
+    headers = [
+        f"HTTP/1.1 {status} {STATUS_REASONS[status]}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body) if length is None else length}",
+    ]
+    if etag is not None:
+        headers.append(f"ETag: {etag}")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+
+
+class Response:
+    """Endpoint data rendered to complete http responses."""
+
+    def __init__(self, data: object):
+        body = json.dumps(data, separators=(",", ":")).encode()
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.ok = raw_response(200, body, self.etag)
+        self.head = raw_response(200, etag=self.etag, length=len(body))
+        self.not_modified = raw_response(304, etag=self.etag)
+
+
+class LeagueServer:
+    """Asyncio http server of precomputed league json.
+
+    The league is built once and then refreshed every ``interval`` seconds in
+    a worker thread: new fixtures are applied incrementally, players are
+    rebuilt and the leaderboard is reranked from its score cache. Each
+    refresh renders every endpoint to bytes and swaps them in at once, so a
+    request is a dict lookup and a socket write. Responses carry an ETag and
+    a poll with a matching ``If-None-Match`` gets an empty 304.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        interval: float = DEFAULT_INTERVAL,
+        database=DEFAULT_DATABASE,
+    ):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.database = database
+        self.league: Optional[League] = None
+        self.responses: Dict[str, Response] = {}
+        self.refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        # payloads are cached no longer than a refresh interval
+        pl_api.cache.ttl = min(pl_api.cache.ttl, interval)
+
+    def routes(self) -> Dict[str, Callable[[], object]]:
+        """Endpoint paths and the data each renders."""
+        league = self.league
+        return {
+            "/table": lambda: table_json(league),
+            "/topscorers": lambda: players_json(league.players, "goals_scored"),
+            "/topassisters": lambda: players_json(league.players, "assists"),
+            "/topkeepers": lambda: players_json(league.players, "clean_sheets", KEEPER),
+            "/leaderboard": self._leaderboard,
+        }
+
+    def _leaderboard(self) -> List[dict]:
+        """Ranked predictions as json rows."""
+        with PredictionStore(self.database) as store:
+            report = Leaderboard(store, PredictionScorer(self.league)).rank()
+        return [
+            {
+                "rank": rank,
+                "name": score.name,
+                "teams_in_correct_position": score.teams_in_correct_position,
+                "is_top_scorer_correct": score.is_top_scorer_correct,
+                "is_top_assister_correct": score.is_top_assister_correct,
+                "is_top_keeper_correct": score.is_top_keeper_correct,
+                "total": score.total,
+            }
+            for rank, score in zip(report.ranks, report.scores)
+        ]
+
+    def refresh(self):
+        """Fetch the latest data and render every endpoint, blocking."""
+        if self.league is None:
+            self.league = pl_api.get_league()
+        else:
+            pl_api.refresh_league(self.league)
+            self.league.players = pl_api.get_players()
+        responses = {path: Response(render()) for path, render in self.routes().items()}
+        self.refreshed_at = time.time()
+        self.refreshes += 1
+        responses["/"] = Response(
+            {
+                "endpoints": sorted(responses),
+                "refreshed_at": self.refreshed_at,
+                "refreshes": self.refreshes,
+                "interval": self.interval,
+            }
+        )
+        self.responses = responses
+
+    async def refresh_forever(self):
+        """Refresh every interval, keeping the last data if a refresh fails."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as error:
+                print(f"Refresh failed, serving data from the last refresh: {error}")
+
+    def respond(self, method: str, path: str, headers: Dict[str, str]) -> bytes:
+        """Raw http response to a request."""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if method not in ("GET", "HEAD"):
+            return raw_response(405)
+        response = self.responses.get(path)
+        if response is None:
+            return raw_response(503 if not self.responses else 404)
+        if headers.get("if-none-match") == response.etag:
+            return response.not_modified
+        return response.head if method == "HEAD" else response.ok
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer requests on a keep-alive connection until it closes."""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers = request
+                writer.write(self.respond(method, path, headers))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """Read a request line and headers, None once the client is done."""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return method, path, headers
+
+    async def serve(self):
+        """Build the data, then serve and refresh until cancelled."""
+        await asyncio.to_thread(self.refresh)
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(
+            f"Serving on http://{self.host}:{self.port}, refreshing every "
+            f"{self.interval:.0f}s"
+        )
+        refresher = asyncio.create_task(self.refresh_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresher.cancel()
@@ -0,0 +1,277 @@
+"""Monte Carlo simulation of the rest of the season."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from premierleague.fantasyapi.objects import FixtureColumns, League, Team
+from premierleague.predictions import Prediction
+
+# runs simulated at once inside a worker, bounds memory per batch
+CHUNK_RUNS = 2000
+
+
+@dataclass
+class StrengthModel:
+    """Poisson goal model with an attack and defence strength per team."""
+
+    home_goals: float
+    away_goals: float
+    attack: np.ndarray
+    defence: np.ndarray
+
+    @classmethod
+    def fit(
+        cls, columns: FixtureColumns, team_count: int, prior_games: float = 3.0
+    ) -> "StrengthModel":
+        """Fit strengths on the scored fixtures.
+
+        Strengths are goals scored and conceded per game relative to the league
+        average, shrunk towards average by ``prior_games`` average games so
+        teams with few games played do not get extreme strengths.
+
+        Args:
+            columns (FixtureColumns): fixtures of the league.
+            team_count (int): number of teams in the league.
+            prior_games (float): weight of the league average.
+
+        Returns:
+            StrengthModel: the fitted model.
+        """
+        home, away = columns.home[columns.scored], columns.away[columns.scored]
+        home_score = columns.home_score[columns.scored]
+        away_score = columns.away_score[columns.scored]
+        home_goals = home_score.mean() if len(home_score) else 1.5
+        away_goals = away_score.mean() if len(away_score) else 1.2
+        mean_goals = (home_goals + away_goals) / 2
+
+        games = np.bincount(home, minlength=team_count) + np.bincount(
+            away, minlength=team_count
+        )
+        goals_for = np.bincount(home, home_score, minlength=team_count) + np.bincount(
+            away, away_score, minlength=team_count
+        )
+        goals_against = np.bincount(
+            home, away_score, minlength=team_count
+        ) + np.bincount(away, home_score, minlength=team_count)
+        expected = (games + prior_games) * mean_goals
+        return cls(
+            home_goals=float(home_goals),
+            away_goals=float(away_goals),
+            attack=(goals_for + prior_games * mean_goals) / expected,
+            defence=(goals_against + prior_games * mean_goals) / expected,
+        )
+
+    def rates(self, home: np.ndarray, away: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Expected home and away goals of fixtures between team indexes."""
+        return (
+            self.home_goals * self.attack[home] * self.defence[away],
+            self.away_goals * self.attack[away] * self.defence[home],
+        )
+
+
+def _simulate_batch(
+    home: np.ndarray,
+    away: np.ndarray,
+    home_rate: np.ndarray,
+    away_rate: np.ndarray,
+    current: np.ndarray,
+    name_rank: np.ndarray,
+    runs: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    """Simulate seasons and count finishing positions.
+
+    Returns:
+        np.ndarray: (teams, positions) count of each team finishing in each
+            position.
+    """
+    rng = np.random.default_rng(seed)
+    team_count = len(name_rank)
+    home_matrix = np.zeros((len(home), team_count))
+    home_matrix[np.arange(len(home)), home] = 1
+    away_matrix = np.zeros((len(away), team_count))
+    away_matrix[np.arange(len(away)), away] = 1
+    points, goals_for, goals_against = current
+    counts = np.zeros((team_count, team_count), dtype=np.int64)
+
+    for start in range(0, runs, CHUNK_RUNS):
+        size = min(CHUNK_RUNS, runs - start)
+        home_goals = rng.poisson(home_rate, (size, len(home))).astype(float)
+        away_goals = rng.poisson(away_rate, (size, len(away))).astype(float)
+        draws = home_goals == away_goals
+        home_points = 3 * (home_goals > away_goals) + draws
+        away_points = 3 * (away_goals > home_goals) + draws
+
+        run_points = points + home_points @ home_matrix + away_points @ away_matrix
+        run_for = goals_for + home_goals @ home_matrix + away_goals @ away_matrix
+        run_against = (
+            goals_against + away_goals @ home_matrix + home_goals @ away_matrix
+        )
+        order = np.lexsort(
+            (
+                np.broadcast_to(name_rank, run_points.shape),
+                run_against,
+                -run_for,
+                run_against - run_for,
+                -run_points,
+            )
+        )
+        for position in range(team_count):
+            counts[:, position] += np.bincount(order[:, position], minlength=team_count)
+    return counts
+
+
+@dataclass
+class SimulationResult:
+    """Finishing position probabilities of every team."""
+
+    teams: List[Team]
+    probabilities: np.ndarray
+    runs: int
+    seconds: float
+
+    @property
+    def expected_positions(self) -> np.ndarray:
+        """Expected finishing position of each team, counting from 1."""
+        return self.probabilities @ np.arange(1, len(self.teams) + 1)
+
+    def expected_correct(self, prediction: Prediction) -> float:
+        """Expected number of teams a prediction has in the correct position.
+
+        Args:
+            prediction (Prediction): prediction of the final table.
+
+        Returns:
+            float: expected teams in the correct position.
+        """
+        index = {team.id: row for row, team in enumerate(self.teams)}
+        return float(
+            sum(
+                self.probabilities[index[team.id], position]
+                for position, team in enumerate(prediction.table[: len(self.teams)])
+                if team.id in index
+            )
+        )
+
+    def display(self, predictions: Optional[List[Prediction]] = None):
+        """Display the position probabilities of every team."""
+        team_count = len(self.teams)
+        print(f"Simulated {self.runs} season(s) in {self.seconds:.2f}s")
+        print("\tTEAM\tEXP\tTITLE\tTOP 4\tBOTTOM 3")
+        print("\t===============================================")
+        for pos, row in enumerate(np.argsort(self.expected_positions, kind="stable")):
+            print(
+                f"{pos+1}.\t{self.teams[row].short_name}\t"
+                f"{self.expected_positions[row]:.1f}\t"
+                f"{self.probabilities[row, 0]:.1%}\t"
+                f"{self.probabilities[row, :4].sum():.1%}\t"
+                f"{self.probabilities[row, team_count - 3:].sum():.1%}"
+            )
+        for prediction in predictions or []:
+            print(
+                f"{prediction.name}: expected teams in correct position "
+                f"{self.expected_correct(prediction):.2f}"
+            )
+
+
+class SeasonSimulator:
+    """Simulate the unplayed fixtures of a league many times over."""
+
+    def __init__(self, league: League):
+        self.teams = league.teams
+        columns = FixtureColumns.from_fixtures(league.fixtures, league.team_index)
+        remaining = ~columns.scored & (columns.home >= 0) & (columns.away >= 0)
+        self.home = columns.home[remaining]
+        self.away = columns.away[remaining]
+        self.model = StrengthModel.fit(columns, len(self.teams))
+        self.home_rate, self.away_rate = self.model.rates(self.home, self.away)
+        self.current = np.array(
+            [
+                [team.points for team in self.teams],
+                [team.goals_for for team in self.teams],
+                [team.goals_against for team in self.teams],
+            ],
+            dtype=float,
+        )
+        names = [team.name for team in self.teams]
+        self.name_rank = np.argsort(np.argsort(names, kind="stable"))
+
+    def run(
+        self, runs: int, workers: Optional[int] = None, seed: Optional[int] = None
+    ) -> SimulationResult:
+        """Simulate the rest of the season.
+
+        Args:
+            runs (int): number of seasons to simulate.
+            workers (Optional[int]): worker processes, defaults to cpu count.
+            seed (Optional[int]): seed for reproducible results.
+
+        Returns:
+            SimulationResult: finishing position probabilities.
+        """
+        if runs < 1:
+            raise ValueError(f"{runs} is not a positive number of runs.")
+        workers = max(1, min(workers or os.cpu_count() or 1, runs))
+        batches = np.array_split(np.arange(runs), workers)
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        args = (
+            self.home,
+            self.away,
+            self.home_rate,
+            self.away_rate,
+            self.current,
+            self.name_rank,
+        )
+
+        start = time.perf_counter()
+        if workers == 1:
+            counts = _simulate_batch(*args, runs, seeds[0])
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_simulate_batch, *args, len(batch), batch_seed)
+                    for batch, batch_seed in zip(batches, seeds)
+                ]
+                counts = sum(future.result() for future in futures)
+        return SimulationResult(
+            teams=self.teams,
+            probabilities=counts / runs,
+            runs=runs,
+            seconds=time.perf_counter() - start,
+        )
+
+    def benchmark(self, runs: int, max_workers: Optional[int] = None) -> List[dict]:
+        """Time a simulation with increasing numbers of worker processes.
+
+        Args:
+            runs (int): number of seasons per measurement.
+            max_workers (Optional[int]): most workers to try, defaults to cpu
+                count.
+
+        Returns:
+            List[dict]: workers, seconds, runs per second and speedup over a
+                single worker for powers of two up to ``max_workers``.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= max_workers:
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != max_workers:
+            worker_counts.append(max_workers)
+
+        results = []
+        for workers in worker_counts:
+            seconds = self.run(runs, workers=workers, seed=0).seconds
+            results.append(
+                {
+                    "workers": workers,
+                    "seconds": seconds,
+                    "runs_per_second": runs / seconds,
+                    "speedup": results[0]["seconds"] / seconds if results else 1.0,
+                }
+            )
+        return results
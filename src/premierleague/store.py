@@ -0,0 +1,256 @@
+"""SQLite store of predictions."""
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from premierleague.predictions import PREDICTIONS_PATH, Prediction
+from premierleague.registry import Registry
+
+DEFAULT_DATABASE = Path(
+    os.environ.get(
+        "PREMIERLEAGUE_DATABASE",
+        Path.home() / ".local" / "share" / "premierleague" / "predictions.sqlite3",
+    )
+)
+# team ids are stored as little endian unsigned 16 bit integers
+TABLE_DTYPE = np.dtype("<u2")
+
+
+def _encode_table(table: List[int]) -> bytes:
+    """Pack the team ids of a table, rejecting ids the dtype cannot hold.
+
+    Args:
+        table (List[int]): team ids in predicted order.
+
+    Returns:
+        bytes: the packed ids.
+    """
+    ids = np.asarray(table, dtype=np.int64)
+    limits = np.iinfo(TABLE_DTYPE)
+    if ids.size and (ids.min() < limits.min or ids.max() > limits.max):
+        raise ValueError(
+            f"Team ids must be between {limits.min} and {limits.max}: {table}"
+        )
+    return ids.astype(TABLE_DTYPE).tobytes()
+
+
+@dataclass
+class PredictionRecord:
+    """Prediction stored as team and player ids."""
+
+    name: str
+    table: List[int]
+    top_scorer: int
+    top_assister: int
+    top_keeper: int
+    snapshot: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_prediction(
+        cls, prediction: Prediction, snapshot: Optional[str] = None
+    ) -> "PredictionRecord":
+        """Get the record of a prediction.
+
+        Args:
+            prediction (Prediction): prediction to store.
+            snapshot (Optional[str]): id of the snapshot it was made against.
+
+        Returns:
+            PredictionRecord: the record.
+        """
+        return cls(
+            name=prediction.name,
+            table=[team.id for team in prediction.table],
+            top_scorer=prediction.top_scorer.id,
+            top_assister=prediction.top_assister.id,
+            top_keeper=prediction.top_keeper.id,
+            snapshot=snapshot,
+        )
+
+    @classmethod
+    def from_saved(
+        cls, data: dict, snapshot: Optional[str] = None
+    ) -> "PredictionRecord":
+        """Get the record of a saved prediction without resolving it.
+
+        Args:
+            data (dict): saved prediction, with teams and players given by id
+                or as full objects.
+            snapshot (Optional[str]): id of the snapshot it was made against.
+
+        Returns:
+            PredictionRecord: the record.
+        """
+
+        def item_id(value) -> int:
+            return value if isinstance(value, int) else value["id"]
+
+        return cls(
+            name=data["name"],
+            table=[item_id(team) for team in data["table"]],
+            top_scorer=item_id(data["top_scorer"]),
+            top_assister=item_id(data["top_assister"]),
+            top_keeper=item_id(data["top_keeper"]),
+            snapshot=snapshot,
+        )
+
+    def to_prediction(self, registry: Registry) -> Prediction:
+        """Resolve the ids of the record into a prediction.
+
+        Args:
+            registry (Registry): registry of the teams and players, shared
+                by every prediction resolved with it.
+
+        Returns:
+            Prediction: the prediction.
+        """
+        return Prediction.from_instances(
+            name=self.name,
+            table=[registry.team(team_id) for team_id in self.table],
+            top_scorer=registry.player(self.top_scorer),
+            top_assister=registry.player(self.top_assister),
+            top_keeper=registry.player(self.top_keeper),
+        )
+
+
+class PredictionStore:
+    """Predictions in a local SQLite database.
+
+    Predictions are stored compactly as ids, one row each, and are written and
+    read in bulk inside a single transaction or query.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS predictions (
+            name TEXT PRIMARY KEY,
+            table_ids BLOB NOT NULL,
+            top_scorer INTEGER NOT NULL,
+            top_assister INTEGER NOT NULL,
+            top_keeper INTEGER NOT NULL,
+            snapshot TEXT,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS predictions_created_at
+            ON predictions (created_at);
+        CREATE TABLE IF NOT EXISTS revision (value INTEGER NOT NULL);
+        INSERT INTO revision SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM revision);
+    """
+
+    COLUMNS = (
+        "name, table_ids, top_scorer, top_assister, top_keeper, snapshot, created_at"
+    )
+
+    def __init__(self, path: Path = DEFAULT_DATABASE):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self) -> "PredictionStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    @property
+    def revision(self) -> int:
+        """Counter bumped by every write, for caching what is derived."""
+        return self.connection.execute("SELECT value FROM revision").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def add_many(self, records: Iterable[PredictionRecord]) -> int:
+        """Insert or replace predictions in one transaction.
+
+        Nothing is stored if any record has a team id out of range of
+        ``TABLE_DTYPE``.
+
+        Args:
+            records (Iterable[PredictionRecord]): predictions to store.
+
+        Returns:
+            int: number of predictions stored.
+        """
+        rows = [
+            (
+                record.name,
+                _encode_table(record.table),
+                record.top_scorer,
+                record.top_assister,
+                record.top_keeper,
+                record.snapshot,
+                record.created_at,
+            )
+            for record in records
+        ]
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO predictions ({self.COLUMNS})"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.connection.execute("UPDATE revision SET value = value + 1")
+        return len(rows)
+
+    def add(self, record: PredictionRecord):
+        """Insert or replace a prediction."""
+        self.add_many([record])
+
+    @staticmethod
+    def _record(row: tuple) -> PredictionRecord:
+        """Record of a database row."""
+        name, table_ids, *picks = row
+        return PredictionRecord(
+            name, np.frombuffer(table_ids, dtype=TABLE_DTYPE).tolist(), *picks
+        )
+
+    def load_all(self) -> List[PredictionRecord]:
+        """Load every prediction in one query, oldest first."""
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM predictions ORDER BY created_at, name"
+        )
+        return [self._record(row) for row in rows]
+
+    def get(self, name: str) -> Optional[PredictionRecord]:
+        """Load the prediction with a name."""
+        row = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM predictions WHERE name = ?", (name,)
+        ).fetchone()
+        return self._record(row) if row is not None else None
+
+    def import_json(
+        self, directory: Path = PREDICTIONS_PATH, snapshot: Optional[str] = None
+    ) -> int:
+        """Import predictions saved as JSON files.
+
+        Args:
+            directory (Path): directory of prediction JSON files.
+            snapshot (Optional[str]): snapshot the predictions were made
+                against, if known.
+
+        Returns:
+            int: number of predictions imported.
+        """
+        records = []
+        for path in sorted(Path(directory).glob("*.json")):
+            with open(path, "r") as prediction_file:
+                record = PredictionRecord.from_saved(
+                    json.load(prediction_file), snapshot
+                )
+            record.created_at = path.stat().st_mtime
+            records.append(record)
+        return self.add_many(records)
@@ -0,0 +1,237 @@
+"""Spans and counters for profiling where a command spends its time.
+
+Tracing is off unless ``enable`` is called, as the cli does for
+``--profile``. While off, ``span`` returns a shared no-op context manager and
+``count`` returns straight away, so instrumented code pays one attribute check.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """Timed section of a command, nested under the span it ran in."""
+
+    name: str
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    end: Optional[float] = None
+    thread: int = 0
+    children: List["Span"] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Seconds the span took, up to now if it is still open."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self, origin: float) -> dict:
+        """Nested dict of the span, with times in milliseconds from origin."""
+        return {
+            "name": self.name,
+            "start_ms": (self.start - origin) * 1000,
+            "duration_ms": self.duration * 1000,
+            "attributes": self.attributes,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+
+class _NullSpan:
+    """Context manager used in place of a span while tracing is off."""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _ActiveSpan:
+    """Context manager opening a span under the current one."""
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.span = Span(name, 0.0, attributes, thread=threading.get_ident())
+
+    def __enter__(self) -> Span:
+        parent = self.tracer._current.get()
+        (parent.children if parent is not None else self.tracer.roots).append(self.span)
+        self.token = self.tracer._current.set(self.span)
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc_info):
+        self.span.end = time.perf_counter()
+        self.tracer._current.reset(self.token)
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects the spans and counters of one command.
+
+    The current span is held in a context variable, so spans opened in
+    threads started with ``asyncio.to_thread`` or in concurrent tasks nest
+    under the span that started them.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.roots: List[Span] = []
+        self.counters: Counter = Counter()
+        self._current: ContextVar[Optional[Span]] = ContextVar(
+            "premierleague_span", default=None
+        )
+
+    def reset(self):
+        """Drop every recorded span and counter."""
+        self.origin = time.perf_counter()
+        self.roots = []
+        self.counters = Counter()
+
+    def span(self, name: str, **attributes):
+        """Context manager timing a section as a span.
+
+        Args:
+            name (str): name of the span.
+            **attributes: details shown with the span.
+
+        Returns:
+            context manager yielding the span, or None while tracing is off.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name, attributes)
+
+    def count(self, name: str, value: int = 1):
+        """Add to a counter while tracing is on."""
+        if self.enabled:
+            self.counters[name] += value
+
+    def format_tree(self) -> str:
+        """Spans as an indented tree with durations, then the counters."""
+        lines = []
+
+        def add(span: Span, depth: int):
+            details = " ".join(
+                f"{key}={value}" for key, value in span.attributes.items()
+            )
+            lines.append(
+                f"{span.duration * 1000:9.2f}ms  {'  ' * depth}{span.name}"
+                + (f"  [{details}]" if details else "")
+            )
+            for child in span.children:
+                add(child, depth + 1)
+
+        for root in self.roots:
+            add(root, 0)
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+    def to_json(self) -> dict:
+        """Spans as nested dicts, with the counters."""
+        return {
+            "spans": [root.to_dict(self.origin) for root in self.roots],
+            "counters": dict(self.counters),
+        }
+
+    def to_chrome_trace(self) -> dict:
+        """Spans in the Chrome trace event format.
+
+        Open the written file in ``chrome://tracing`` or Perfetto.
+        """
+        events = []
+        pid = os.getpid()
+
+        def add(span: Span):
+            events.append(
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": (span.start - self.origin) * 1e6,
+                    "dur": span.duration * 1e6,
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": {key: str(value) for key, value in span.attributes.items()},
+                }
+            )
+            for child in span.children:
+                add(child)
+
+        for root in self.roots:
+            add(root)
+        end = max((root.start + root.duration for root in self.roots), default=0.0)
+        events.append(
+            {
+                "name": "counters",
+                "ph": "C",
+                "ts": max(end - self.origin, 0.0) * 1e6,
+                "pid": pid,
+                "args": dict(self.counters),
+            }
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, output_format: str = "text") -> str:
+        """Spans and counters in a format: text, json or chrome."""
+        if output_format == "text":
+            return self.format_tree()
+        if output_format == "json":
+            return json.dumps(self.to_json(), indent=2)
+        if output_format == "chrome":
+            return json.dumps(self.to_chrome_trace())
+        raise ValueError(f"{output_format} is not a profile format.")
+
+
+tracer = Tracer()
+
+
+def enable():
+    """Start recording spans and counters."""
+    tracer.reset()
+    tracer.enabled = True
+
+
+def span(name: str, **attributes):
+    """Time a section as a span of the global tracer."""
+    return tracer.span(name, **attributes)
+
+
+def count(name: str, value: int = 1):
+    """Add to a counter of the global tracer."""
+    tracer.count(name, value)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate a function to run it in a span.
+
+    Args:
+        name (Optional[str]): span name, the function's qualified name if not
+            given.
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _ActiveSpan(tracer, span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
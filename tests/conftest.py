@@ -0,0 +1,32 @@
+"""Shared synthetic payloads, from ``premierleague.benchmarks.synthetic``."""
+import copy
+
+import pytest
+
+from premierleague.benchmarks import synthetic
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+
+
+@pytest.fixture(scope="session")
+def bootstrap_static():
+    return synthetic.bootstrap_static(player_count=200)
+
+
+@pytest.fixture(scope="session")
+def fixtures_raw():
+    return synthetic.fixtures()
+
+
+@pytest.fixture
+def bootstrap(bootstrap_static):
+    return copy.deepcopy(bootstrap_static)
+
+
+@pytest.fixture
+def fixtures(fixtures_raw):
+    return copy.deepcopy(fixtures_raw)
+
+
+@pytest.fixture
+def league(bootstrap, fixtures):
+    return pl_api.league_from_raw_data(bootstrap, fixtures)
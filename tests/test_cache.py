@@ -0,0 +1,143 @@
+"""Memory and disk tiers of the snapshot cache, behind a fake transport."""
+import io
+import json
+
+import pytest
+
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.cache import CacheEntry, SnapshotCache
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Sat, 17 Oct 2026 12:00:00 GMT"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+        self.raw = io.BytesIO(body)
+        self.raw.seek(0, io.SEEK_END)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeTransport:
+    """Serves a fixed payload, answering 304 when the validators match."""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload).encode()
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False):
+        headers = headers or {}
+        self.requests.append((url, headers))
+        if (
+            headers.get("If-None-Match") == ETAG
+            or headers.get("If-Modified-Since") == LAST_MODIFIED
+        ):
+            return FakeResponse(304)
+        return FakeResponse(
+            200, self.body, {"ETag": ETAG, "Last-Modified": LAST_MODIFIED}
+        )
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = FakeTransport([{"id": 1}])
+    monkeypatch.setattr(pl_api, "transport", transport)
+    monkeypatch.setattr(pl_api, "replay_payloads", None)
+    monkeypatch.setattr(pl_api, "BASE_URL", "http://fake")
+    return transport
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = SnapshotCache(ttl=60, cache_dir=tmp_path)
+    monkeypatch.setattr(pl_api, "cache", cache)
+    return cache
+
+
+def expire(cache, url):
+    cache.get(url).fetched_at -= cache.ttl + 1
+
+
+def test_fresh_entries_are_served_from_memory(transport, cache):
+    assert pl_api._get_json("fixtures/") == [{"id": 1}]
+    assert pl_api._get_json("fixtures/") == [{"id": 1}]
+    assert len(transport.requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entries_are_revalidated_with_their_validators(transport, cache):
+    pl_api._get_json("fixtures/")
+    expire(cache, "http://fake/fixtures/")
+    assert pl_api._get_json("fixtures/") == [{"id": 1}]
+    assert transport.requests[1][1] == {
+        "If-None-Match": ETAG,
+        "If-Modified-Since": LAST_MODIFIED,
+    }
+    assert cache.revalidations == 1
+    # a revalidated entry is fresh again
+    pl_api._get_json("fixtures/")
+    assert len(transport.requests) == 2
+
+
+def test_last_modified_alone_revalidates(transport, cache):
+    cache.put(
+        CacheEntry(
+            url="http://fake/fixtures/",
+            payload=[{"id": 1}],
+            fetched_at=0,
+            last_modified=LAST_MODIFIED,
+        )
+    )
+    assert pl_api._get_json("fixtures/") == [{"id": 1}]
+    assert transport.requests[0][1] == {"If-Modified-Since": LAST_MODIFIED}
+    assert cache.revalidations == 1
+
+
+def test_changed_entries_are_downloaded_again(transport, cache):
+    cache.put(
+        CacheEntry(url="http://fake/fixtures/", payload=[], fetched_at=0, etag='"v0"')
+    )
+    assert pl_api._get_json("fixtures/") == [{"id": 1}]
+    assert cache.revalidations == 0
+    assert cache.get("http://fake/fixtures/").etag == ETAG
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SnapshotCache(max_entries=2, cache_dir=None)
+    for url in ("a", "b"):
+        cache.put(CacheEntry(url=url, payload=url, fetched_at=0))
+    cache.get("a")
+    cache.put(CacheEntry(url="c", payload="c", fetched_at=0))
+    assert cache.get("b") is None
+    assert cache.get("a").payload == "a"
+    assert cache.get("c").payload == "c"
+
+
+def test_disk_tier_is_shared_between_caches(tmp_path):
+    SnapshotCache(cache_dir=tmp_path).put(
+        CacheEntry(url="a", payload={"x": 1}, fetched_at=0, etag=ETAG)
+    )
+    entry = SnapshotCache(cache_dir=tmp_path).get("a")
+    assert entry == CacheEntry(url="a", payload={"x": 1}, fetched_at=0, etag=ETAG)
+
+
+def test_evicted_entries_are_reloaded_from_disk(tmp_path):
+    cache = SnapshotCache(max_entries=1, cache_dir=tmp_path)
+    cache.put(CacheEntry(url="a", payload="a", fetched_at=0))
+    cache.put(CacheEntry(url="b", payload="b", fetched_at=0))
+    assert cache.stats["entries"] == 1
+    assert cache.get("a").payload == "a"
+
+
+def test_clear_disk_drops_both_tiers(tmp_path):
+    cache = SnapshotCache(cache_dir=tmp_path)
+    cache.put(CacheEntry(url="a", payload="a", fetched_at=0))
+    cache.clear(disk=True)
+    assert cache.get("a") is None
+    assert not list(tmp_path.glob("*.json"))
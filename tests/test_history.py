@@ -0,0 +1,70 @@
+"""Backtests across seasons whose team ids are reshuffled."""
+import json
+
+import numpy as np
+import pytest
+
+from premierleague.benchmarks import synthetic
+from premierleague.history import (
+    SeasonArchive,
+    average_points,
+    backtest,
+    previous_table,
+)
+
+
+def write_season(directory, teams, fixtures):
+    directory.mkdir(parents=True)
+    with open(directory / "bootstrap-static.json", "w") as bootstrap_file:
+        json.dump({"teams": teams, "elements": []}, bootstrap_file)
+    with open(directory / "fixtures.json", "w") as fixtures_file:
+        json.dump(fixtures, fixtures_file)
+
+
+@pytest.fixture
+def summaries(tmp_path):
+    """Two seasons with the same results, the second with ids reversed and
+    one club replaced by a promoted one."""
+    teams = synthetic.bootstrap_static(player_count=0)["teams"]
+    fixtures = synthetic.fixtures(played_fraction=1.0)
+    write_season(tmp_path / "seasons" / "2022-23", teams, fixtures)
+
+    new_id = {team["id"]: len(teams) + 1 - team["id"] for team in teams}
+    renamed = [dict(team, id=new_id[team["id"]]) for team in teams]
+    renamed[0]["name"] = "Promoted FC"
+    remapped = [
+        dict(raw, team_h=new_id[raw["team_h"]], team_a=new_id[raw["team_a"]])
+        for raw in fixtures
+    ]
+    write_season(tmp_path / "seasons" / "2023-24", renamed, remapped)
+    return SeasonArchive(tmp_path / "seasons", tmp_path / "cache").load(workers=1)
+
+
+def test_previous_table_matches_clubs_by_name(summaries):
+    first, second = summaries.values()
+    predicted = previous_table([first], second.team_names)
+    expected = [name for name in first.final_names if name != "Team 001"]
+    assert predicted.tolist() == expected + ["Promoted FC"]
+
+
+def test_average_points_matches_clubs_by_name(summaries):
+    first, second = summaries.values()
+    predicted = average_points([first], second.team_names)
+    assert predicted[-1] == "Promoted FC"
+    rows = {name: row for row, name in enumerate(first.team_names.tolist())}
+    points = [first.stats[3, -1, rows[name]] for name in predicted[:-1].tolist()]
+    assert sorted(predicted[:-1].tolist()) == sorted(
+        name for name in first.team_names.tolist() if name != "Team 001"
+    )
+    assert points == sorted(points, reverse=True)
+
+
+def test_backtest_compares_this_seasons_ids(summaries):
+    first, second = summaries.values()
+    ((season, correct),) = backtest(summaries, previous_table)
+    assert season == "2023-24"
+    # the same results give the same order with the promoted club in place
+    # of the replaced one, so every club above it is predicted correctly
+    position = int(np.flatnonzero(first.final_names == "Team 001")[0])
+    assert second.final_names[position] == "Promoted FC"
+    assert correct == position
@@ -0,0 +1,148 @@
+"""Validation of imported prediction rows, well formed and malformed."""
+import json
+
+import pytest
+
+from premierleague.importer import Reference, read_rows, validate_row, validate_rows
+from premierleague.store import PredictionStore
+
+
+@pytest.fixture(scope="module")
+def reference(bootstrap_static):
+    return Reference(bootstrap_static["teams"], bootstrap_static["elements"], "snap")
+
+
+@pytest.fixture(scope="module")
+def row(bootstrap_static):
+    teams = bootstrap_static["teams"]
+    players = bootstrap_static["elements"]
+    keeper = next(player for player in players if player["element_type"] == 1)
+    outfield = next(player for player in players if player["element_type"] == 4)
+    return {
+        "name": "Sam",
+        "table": [team["name"] for team in teams],
+        "top_scorer": f"{outfield['first_name']} {outfield['second_name']}",
+        "top_assister": outfield["id"],
+        "top_keeper": str(keeper["id"]),
+    }
+
+
+def errors(row, reference):
+    record, row_errors = validate_row(7, row, reference)
+    assert (record is None) == bool(row_errors)
+    return {error.field: error.message for error in row_errors}
+
+
+def test_valid_row(row, reference, bootstrap_static):
+    record, row_errors = validate_row(7, row, reference)
+    assert row_errors == []
+    assert record.table == [team["id"] for team in bootstrap_static["teams"]]
+    assert record.top_assister == row["top_assister"]
+    assert record.top_keeper == int(row["top_keeper"])
+    assert record.snapshot == "snap"
+
+
+def test_csv_table(row, reference):
+    assert errors(dict(row, table=";".join(row["table"])), reference) == {}
+
+
+@pytest.mark.parametrize("table", [5, 1.5, True, {"Arsenal": 1}])
+def test_table_of_the_wrong_type(row, reference, table):
+    assert errors(dict(row, table=table), reference) == {
+        "table": "expected a list of teams"
+    }
+
+
+def test_team_of_the_wrong_type(row, reference):
+    table = [["nested"]] + row["table"][1:]
+    assert errors(dict(row, table=table), reference) == {
+        "table[1]": "expected a name or id"
+    }
+
+
+@pytest.mark.parametrize("value", [[1], {"id": 1}, 1.5, True])
+def test_pick_of_the_wrong_type(row, reference, value):
+    assert errors(dict(row, top_scorer=value), reference) == {
+        "top_scorer": "expected a name or id"
+    }
+
+
+def test_unknown_and_repeated_teams(row, reference):
+    table = ["Nowhere Town", row["table"][0]] + row["table"][:-2]
+    found = errors(dict(row, table=table), reference)
+    assert found["table[1]"].startswith("unknown team 'Nowhere Town'")
+    assert found["table[3]"] == f"{row['table'][0]!r} repeated"
+
+
+def test_wrong_number_of_teams(row, reference):
+    assert errors(dict(row, table=row["table"][:-1]), reference) == {
+        "table": "19 team(s), expected 20"
+    }
+
+
+def test_missing_fields(reference):
+    assert errors({}, reference) == {
+        "name": "missing",
+        "table": "0 team(s), expected 20",
+        "top_scorer": "missing",
+        "top_assister": "missing",
+        "top_keeper": "missing",
+    }
+
+
+def test_keeper_must_be_a_goalkeeper(row, reference):
+    found = errors(dict(row, top_keeper=row["top_assister"]), reference)
+    assert found == {"top_keeper": f"{row['top_assister']!r} is not a goalkeeper"}
+
+
+def test_unknown_player_id(row, reference):
+    assert errors(dict(row, top_scorer=999999), reference) == {
+        "top_scorer": "unknown player id 999999"
+    }
+
+
+@pytest.mark.parametrize("value", ["not an object", [1, 2]])
+def test_row_that_is_not_an_object(reference, value):
+    assert errors(value, reference) == {"row": "not an object"}
+
+
+def test_file_rows_report_every_error(row, reference, tmp_path):
+    path = tmp_path / "predictions.jsonl"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps(row),
+                "{not json",
+                json.dumps(dict(row, table=5)),
+                "",
+                json.dumps(row),
+            ]
+        )
+    )
+    report = validate_rows(read_rows(path), reference, workers=1)
+    assert [record.name for record in report.records] == ["Sam"]
+    assert [(error.line, error.field) for error in report.errors] == [
+        (2, "row"),
+        (3, "table"),
+        (5, "name"),
+    ]
+    assert report.rows == 4
+    assert report.invalid_rows == 3
+
+    with PredictionStore(":memory:") as store:
+        assert store.add_many(report.records) == 1
+        assert store.get("Sam").table == report.records[0].table
+
+
+def test_worker_processes_match_one_process(row, reference, monkeypatch):
+    rows = [
+        (line, dict(row, name=f"Predictor {line % 7}", table=row["table"][::-1]))
+        for line in range(1, 30)
+    ] + [(30, dict(row, table=5))]
+    expected = validate_rows(rows, reference, workers=1)
+    monkeypatch.setattr("premierleague.importer.CHUNK_SIZE", 4)
+    report = validate_rows(rows, reference, workers=2)
+    assert [record.name for record in report.records] == [
+        record.name for record in expected.records
+    ]
+    assert report.errors == expected.errors
@@ -0,0 +1,82 @@
+"""Memoized leaderboard scores against scoring every prediction afresh."""
+import pytest
+
+from premierleague.benchmarks import synthetic
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.leaderboard import Leaderboard
+from premierleague.scoring import PredictionScorer
+from premierleague.store import PredictionRecord, PredictionStore
+
+
+@pytest.fixture
+def store(bootstrap):
+    store = PredictionStore(":memory:")
+    store.add_many(
+        PredictionRecord(**raw) for raw in synthetic.predictions(bootstrap, 300)
+    )
+    yield store
+    store.close()
+
+
+def assert_fresh(report, store, scorer):
+    fresh = {score.name: score for score in scorer.score_records(store.load_all())}
+    assert {score.name: score for score in report.scores} == fresh
+    totals = [score.total for score in report.scores]
+    assert totals == sorted(totals, reverse=True)
+
+
+def test_memo_hit_matches_fresh_scores(store, league):
+    scorer = PredictionScorer(league)
+    first = Leaderboard(store, scorer).rank()
+    assert first.tables_scored == first.players_scored == len(store)
+
+    again = Leaderboard(store, scorer).rank()
+    assert again.tables_scored == again.players_scored == 0
+    assert again.scores == first.scores
+    assert again.ranks == first.ranks
+    assert_fresh(again, store, scorer)
+
+
+def test_changed_players_rescore_only_player_picks(store, bootstrap, fixtures, league):
+    Leaderboard(store, PredictionScorer(league)).rank()
+    for player in bootstrap["elements"]:
+        player["goals_scored"] = (player["id"] * 7) % 31
+    scorer = PredictionScorer(pl_api.league_from_raw_data(bootstrap, fixtures))
+
+    report = Leaderboard(store, scorer).rank()
+    assert report.tables_scored == 0
+    assert report.players_scored == len(store)
+    assert_fresh(report, store, scorer)
+
+
+def test_changed_prediction_rescores_only_it(store, league):
+    scorer = PredictionScorer(league)
+    Leaderboard(store, scorer).rank()
+    record = store.load_all()[0]
+    store.add(
+        PredictionRecord(
+            record.name,
+            record.table[::-1],
+            record.top_scorer,
+            record.top_assister,
+            record.top_keeper,
+        )
+    )
+
+    report = Leaderboard(store, scorer).rank()
+    assert report.tables_scored == report.players_scored == 1
+    assert_fresh(report, store, scorer)
+
+
+def test_removed_predictions_are_purged(store, league):
+    scorer = PredictionScorer(league)
+    Leaderboard(store, scorer).rank()
+    with store.connection:
+        store.connection.execute("DELETE FROM predictions WHERE name LIKE '%1'")
+    # any write moves the revision on, so the ranking is recomputed
+    store.add(store.load_all()[0])
+
+    report = Leaderboard(store, scorer).rank()
+    memoized = store.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+    assert memoized == len(store) == len(report.scores)
+    assert_fresh(report, store, scorer)
@@ -0,0 +1,78 @@
+"""Incremental and time travel tables against tables rebuilt from scratch."""
+from datetime import datetime, timezone
+
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.objects import Fixture
+
+
+def rows(teams):
+    return [
+        (team.id, team.played, team.goals_for, team.goals_against, team.points)
+        for team in teams
+    ]
+
+
+def finish(raw, home_score, away_score):
+    return dict(
+        raw,
+        finished=True,
+        started=True,
+        minutes=90,
+        team_h_score=home_score,
+        team_a_score=away_score,
+    )
+
+
+def test_update_fixtures_matches_rebuilt_table(bootstrap, fixtures, league):
+    first_open = next(
+        index for index, raw in enumerate(fixtures) if not raw["finished"]
+    )
+    updated = {
+        # a corrected result, two new results and an unchanged fixture
+        0: finish(fixtures[0], 5, 0),
+        first_open: finish(fixtures[first_open], 1, 1),
+        first_open + 1: finish(fixtures[first_open + 1], 0, 2),
+        1: fixtures[1],
+    }
+    changed = league.update_fixtures([Fixture(**raw) for raw in updated.values()])
+
+    assert sorted(changed) == sorted(
+        fixtures[index]["id"] for index in (0, first_open, first_open + 1)
+    )
+    for index, raw in updated.items():
+        fixtures[index] = raw
+    rebuilt = pl_api.league_from_raw_data(bootstrap, fixtures)
+    assert rows(league.table) == rows(rebuilt.table)
+
+
+def test_update_fixtures_without_changes_keeps_table(fixtures, league):
+    table = rows(league.table)
+    assert league.update_fixtures([Fixture(**raw) for raw in fixtures]) == []
+    assert rows(league.table) == table
+
+
+def test_table_at_gameweek_matches_league_of_earlier_fixtures(
+    bootstrap, fixtures, league
+):
+    for gameweek in (0, 1, 10, 22):
+        earlier = [raw for raw in fixtures if raw["event"] <= gameweek]
+        rebuilt = pl_api.league_from_raw_data(bootstrap, earlier)
+        assert rows(league.table_at(gameweek)) == rows(rebuilt.table)
+
+
+def test_table_at_time_matches_league_of_earlier_kickoffs(bootstrap, fixtures, league):
+    when = datetime(2023, 11, 1, tzinfo=timezone.utc)
+    earlier = [
+        raw
+        for raw in fixtures
+        if datetime.fromisoformat(raw["kickoff_time"].replace("Z", "+00:00")) < when
+    ]
+    rebuilt = pl_api.league_from_raw_data(bootstrap, earlier)
+    assert rows(league.table_at(when)) == rows(rebuilt.table)
+
+
+def test_table_at_copies_teams(league):
+    current = rows(league.table)
+    past = league.table_at(1)
+    assert {id(team) for team in past}.isdisjoint(map(id, league.teams))
+    assert rows(league.table) == current
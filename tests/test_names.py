@@ -0,0 +1,14 @@
+"""Exact, normalized and fuzzy name lookups."""
+from premierleague.names import NameIndex, normalize, trigrams
+
+
+def test_trigrams_pad_both_ends():
+    grams = trigrams(normalize("Bruno Fernandes"))
+    assert {"  b", " br", " fe", "o f", "es ", "s  "} <= grams
+
+
+def test_repeated_names_are_indexed_once():
+    index = NameIndex(["Ødegaard", "Saka", "Ødegaard"], lambda name: name)
+    assert len(index) == 2
+    assert index.get("odegaard") == "Ødegaard"
+    assert index.suggest("Odegard") == ["Ødegaard"]
@@ -0,0 +1,92 @@
+"""Resumable player history ingest and top-k queries."""
+import asyncio
+
+import pytest
+
+from premierleague.benchmarks.server import StandInServer, synthetic_payloads
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.cache import SnapshotCache
+from premierleague.player_history import PlayerHistoryIngester, PlayerHistoryStore
+
+
+def player(player_id, element_type=4):
+    return {
+        "id": player_id,
+        "element_type": element_type,
+        "first_name": "Player",
+        "second_name": str(player_id),
+    }
+
+
+@pytest.fixture(scope="module")
+def payloads():
+    return synthetic_payloads(player_count=60, element_summaries=True)
+
+
+@pytest.fixture
+def server(payloads, monkeypatch):
+    with StandInServer(payloads) as server:
+        monkeypatch.setattr(pl_api, "BASE_URL", server.url)
+        monkeypatch.setattr(pl_api, "cache", SnapshotCache(ttl=0, cache_dir=None))
+        monkeypatch.setattr(pl_api, "replay_payloads", None)
+        yield server
+
+
+def goals(store, player_id):
+    return store.totals("goals_scored")[store.row(player_id)]
+
+
+def test_concurrency_is_capped_at_the_pool_size(tmp_path):
+    store = PlayerHistoryStore.create([player(1)], tmp_path / "history")
+    assert PlayerHistoryIngester(store, 64).concurrency == 8
+    assert PlayerHistoryIngester(store, 2).concurrency == 2
+
+
+def test_resumed_ingest_keeps_finished_rows(tmp_path, server, payloads):
+    players_raw = payloads["bootstrap-static/"]["elements"]
+    directory = tmp_path / "history"
+    store = PlayerHistoryStore.create(players_raw, directory)
+    finished = store.ids[:10].tolist()
+    for player_id in finished:
+        store.write(player_id, [{"round": 1, "goals_scored": 99}])
+    store.flush()
+    del store
+
+    # reopening with the same players keeps the store, dropping one rebuilds it
+    assert len(PlayerHistoryStore.create(players_raw, directory).pending()) == 50
+    store = PlayerHistoryStore.create(players_raw[:-1], directory)
+    pending = store.pending()
+    assert len(pending) == 49
+    assert not set(finished) & set(pending)
+
+    assert asyncio.run(PlayerHistoryIngester(store, rate=0).run()) == 49
+    assert server.stats["requests"] == 49
+    store = PlayerHistoryStore(directory)
+    assert store.pending() == []
+    assert all(goals(store, player_id) == 99 for player_id in finished)
+    for player_id in pending:
+        history = payloads[f"element-summary/{player_id}/"]["history"]
+        assert goals(store, player_id) == sum(
+            fixture["goals_scored"] for fixture in history
+        )
+    assert asyncio.run(PlayerHistoryIngester(store, rate=0).run()) == 0
+
+
+def test_top_k_breaks_ties_by_id(tmp_path):
+    totals = {40: 3, 7: 5, 23: 5, 12: 1, 31: 5, 5: 3}
+    store = PlayerHistoryStore.create(
+        [player(player_id, 4 if player_id > 20 else 3) for player_id in totals],
+        tmp_path / "history",
+    )
+    for player_id, total in totals.items():
+        store.write(player_id, [{"round": 2, "goals_scored": total}])
+    top = [(player_id, total) for player_id, _, total in store.top_k("goals_scored", 4)]
+    assert top == [(7, 5), (23, 5), (31, 5), (5, 3)]
+    assert [row[0] for row in store.top_k("goals_scored", 6)] == [7, 23, 31, 5, 40, 12]
+    assert [row[0] for row in store.top_k("goals_scored", 2, position=4)] == [23, 31]
+    assert [row[0] for row in store.top_k("goals_scored", 10, position=3)] == [7, 5, 12]
+    assert store.top_k("goals_scored", 3, first=3) == [
+        (5, "Player 5", 0),
+        (7, "Player 7", 0),
+        (12, "Player 12", 0),
+    ]
@@ -0,0 +1,69 @@
+"""Incremental ratings against a batch fit of the same results."""
+import numpy as np
+import pytest
+
+from premierleague.benchmarks import synthetic
+from premierleague.fantasyapi.objects import Fixture, FixtureColumns, Team
+from premierleague.ratings import STATE_ARRAYS, RatingsEngine, batch_fit
+
+
+@pytest.fixture(scope="module")
+def teams(bootstrap_static):
+    return [Team(**raw) for raw in bootstrap_static["teams"]]
+
+
+@pytest.fixture(scope="module")
+def season():
+    return [Fixture(**raw) for raw in synthetic.fixtures(played_fraction=1.0)]
+
+
+def fit(teams, fixtures):
+    team_index = {team.id: index for index, team in enumerate(teams)}
+    columns = FixtureColumns.from_fixtures(fixtures, team_index)
+    return batch_fit(columns, len(teams))
+
+
+def assert_same_state(state, expected):
+    for name in STATE_ARRAYS:
+        np.testing.assert_allclose(getattr(state, name), getattr(expected, name))
+
+
+def test_gameweek_by_gameweek_matches_batch_fit(teams, season):
+    engine = RatingsEngine(teams, cache_dir=None)
+    for gameweek in range(1, 39):
+        engine.update([fixture for fixture in season if fixture.event <= gameweek])
+    assert_same_state(engine.state, fit(teams, season))
+    assert_same_state(
+        engine.after(20), fit(teams, [f for f in season if f.event <= 20])
+    )
+
+
+def test_corrected_result_matches_batch_fit(teams, season):
+    engine = RatingsEngine(teams, cache_dir=None)
+    engine.update(season)
+    target = next(fixture for fixture in season if fixture.event == 30)
+    corrected = [
+        Fixture(**{**dict(fixture), "team_h_score": fixture.team_h_score + 3})
+        if fixture.id == target.id
+        else fixture
+        for fixture in season
+    ]
+    # only the results from the corrected gameweek on are replayed
+    assert engine.update(corrected) < len(season) // 2
+    assert_same_state(engine.state, fit(teams, corrected))
+
+
+def test_unchanged_results_apply_nothing(teams, season):
+    engine = RatingsEngine(teams, cache_dir=None)
+    assert engine.update(season) == len(season)
+    assert engine.update(season) == 0
+
+
+def test_cached_ratings_resume(teams, season, tmp_path):
+    first_half = [fixture for fixture in season if fixture.event <= 19]
+    RatingsEngine(teams, cache_dir=tmp_path).update(first_half)
+
+    engine = RatingsEngine(teams, cache_dir=tmp_path)
+    assert engine.update(first_half) == 0
+    assert engine.update(season) == len(season) - len(first_half)
+    assert_same_state(engine.state, fit(teams, season))
@@ -0,0 +1,48 @@
+"""Batch scoring of saved and stored predictions."""
+import json
+
+import pytest
+
+from premierleague.benchmarks import synthetic
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.predictions import Prediction
+from premierleague.scoring import PredictionScorer
+from premierleague.store import PredictionStore
+
+
+@pytest.fixture
+def scorer(monkeypatch, bootstrap, fixtures):
+    monkeypatch.setattr(
+        pl_api,
+        "replay_payloads",
+        {"bootstrap-static/": bootstrap, "fixtures/": fixtures},
+    )
+    return PredictionScorer.from_api()
+
+
+@pytest.fixture
+def directory(tmp_path, bootstrap_static, league):
+    saved = synthetic.predictions(bootstrap_static, 20)
+    # one exact table so the scores are not all near zero
+    saved[0]["table"] = [team.id for team in league.table]
+    for data in saved:
+        (tmp_path / f"{data['name']}.json").write_text(json.dumps(data))
+    return tmp_path
+
+
+def test_directory_and_store_scores_agree(scorer, directory):
+    report = scorer.score_directory(directory)
+    assert len(report.scores) == 20
+    assert report.scores[0].teams_in_correct_position == 20
+    with PredictionStore(":memory:") as store:
+        store.import_json(directory)
+        assert scorer.score_store(store).scores == report.scores
+
+
+def test_score_directory_matches_prediction_properties(scorer, directory):
+    report = scorer.score_directory(directory)
+    for prediction, score in zip(Prediction.read_all(directory), report.scores):
+        assert score.name == prediction.name
+        assert score.teams_in_correct_position == prediction.teams_in_correct_position
+        assert score.is_top_scorer_correct == prediction.is_top_scorer_correct
+        assert score.is_top_keeper_correct == prediction.is_top_keeper_correct
@@ -0,0 +1,101 @@
+"""Snapshot deltas and the content addressed store."""
+import copy
+
+import pytest
+
+from premierleague.fantasyapi.api import PremierLeagueAPI as pl_api
+from premierleague.fantasyapi.snapshot import (
+    MAX_DELTA_CHAIN,
+    SnapshotStore,
+    diff,
+    patch,
+)
+
+
+def payloads(fixtures, gameweek):
+    """Fixtures as they stand after ``gameweek`` more results are in."""
+    fixtures = copy.deepcopy(fixtures)
+    for fixture in fixtures[:gameweek]:
+        fixture.update(finished=True, team_h_score=gameweek % 4, team_a_score=1)
+    return {"fixtures/": fixtures, "meta": {"gameweek": gameweek}}
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ({"a": 1, "b": {"c": 2}}, {"a": 1, "b": {"c": 3}, "d": 4}),
+        ({"a": 1, "b": 2}, {"b": 2}),
+        ({"a": [1, 2]}, {"a": [2, 1]}),
+        ([{"id": 1, "x": 1}, {"id": 2, "x": 2}], [{"id": 1, "x": 5}]),
+        (
+            [{"id": 1, "x": 1}, {"id": 2, "x": 2}],
+            [{"id": 3, "x": 3}, {"id": 2, "x": 2}, {"id": 1, "x": 1}],
+        ),
+        ([], [{"id": 1}]),
+        ({"a": None}, {"a": [{"id": 1}]}),
+    ],
+)
+def test_patch_inverts_diff(old, new):
+    assert patch(old, diff(old, new)) == new
+
+
+def test_unchanged_payloads_have_no_delta():
+    assert diff({"a": [{"id": 1}]}, {"a": [{"id": 1}]}) is None
+    assert patch({"a": 1}, None) == {"a": 1}
+
+
+def test_record_deltas_store_only_changed_fields():
+    old = [{"id": 1, "x": 1, "y": 1}, {"id": 2, "x": 2, "y": 2}]
+    new = [{"id": 1, "x": 1, "y": 1}, {"id": 2, "x": 9, "y": 2}]
+    assert diff(old, new) == {"l": [[2, {"d": {"x": {"=": 9}}}]]}
+
+
+def test_chains_longer_than_the_limit_load_back(tmp_path, fixtures):
+    recorded = [
+        payloads(fixtures, gameweek) for gameweek in range(MAX_DELTA_CHAIN * 2 + 3)
+    ]
+    store = SnapshotStore(tmp_path)
+    ids = [store.record(snapshot) for snapshot in recorded]
+    depths = [store._read_object(snap_id)["depth"] for snap_id in ids]
+    assert max(depths) == MAX_DELTA_CHAIN
+    assert depths.count(0) == 3
+    reopened = SnapshotStore(tmp_path)
+    for snap_id, snapshot in zip(ids, recorded):
+        assert reopened.load(snap_id) == snapshot
+
+
+def test_recording_known_content_moves_latest(tmp_path, fixtures):
+    store = SnapshotStore(tmp_path)
+    first = store.record(payloads(fixtures, 1))
+    second = store.record(payloads(fixtures, 2))
+    assert store.record(payloads(fixtures, 1)) == first
+    assert store.resolve("latest") == first
+    assert store.list() == [second, first]
+    assert store.resolve(first[:8]) == first
+    reopened = SnapshotStore(tmp_path)
+    assert reopened.load("latest") == payloads(fixtures, 1)
+    # the next snapshot is a delta against the new head
+    third = store.record(payloads(fixtures, 3))
+    assert store._read_object(third)["base"] == first
+    assert SnapshotStore(tmp_path).load(third) == payloads(fixtures, 3)
+
+
+def test_recording_the_latest_again_is_a_no_op(tmp_path, fixtures):
+    store = SnapshotStore(tmp_path)
+    store.record(payloads(fixtures, 1))
+    store.record(payloads(fixtures, 1))
+    assert len((tmp_path / "index").read_text().splitlines()) == 1
+
+
+def test_recorded_id_does_not_record(tmp_path, monkeypatch, bootstrap, fixtures):
+    monkeypatch.setattr(
+        pl_api,
+        "replay_payloads",
+        {"bootstrap-static/": bootstrap, "fixtures/": fixtures},
+    )
+    store = SnapshotStore(tmp_path)
+    assert pl_api.recorded_id(store) is None
+    assert store.list() == []
+    recorded = pl_api.record(store)
+    assert pl_api.recorded_id(store) == recorded
+    assert store.list() == [recorded]
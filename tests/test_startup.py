@@ -0,0 +1,43 @@
+"""Startup cost of the prem cli, measured with ``-X importtime``."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import premierleague
+from premierleague.benchmarks import startup
+
+
+@pytest.fixture(autouse=True)
+def source_on_path(monkeypatch):
+    """Let the fresh interpreters import the package under test."""
+    monkeypatch.setenv("PYTHONPATH", str(Path(premierleague.__file__).parents[1]))
+
+
+def test_cli_import_within_budget():
+    assert startup.check() == []
+
+
+def test_help_imports_no_heavy_modules():
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys; from premierleague.cli.app import main; "
+            "sys.argv[1:] = ['--help']; main()",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0
+    assert "usage: " in completed.stdout
+    imported = {
+        line.rsplit("|", 1)[1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+    assert "premierleague.cli.app" in imported
+    assert imported.isdisjoint(startup.HEAVY_MODULES)
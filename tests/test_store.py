@@ -0,0 +1,81 @@
+"""Round trips through the SQLite prediction store."""
+import json
+import os
+
+import pytest
+
+from premierleague.benchmarks import synthetic
+from premierleague.registry import Registry
+from premierleague.store import PredictionRecord, PredictionStore
+
+
+@pytest.fixture
+def saved(bootstrap_static):
+    return synthetic.predictions(bootstrap_static, 5)
+
+
+@pytest.fixture
+def store():
+    with PredictionStore(":memory:") as store:
+        yield store
+
+
+def record(data, created_at):
+    record = PredictionRecord.from_saved(data, "snap")
+    record.created_at = created_at
+    return record
+
+
+def test_add_many_and_load_all_round_trip(store, saved):
+    records = [record(data, created_at) for created_at, data in enumerate(saved)]
+    assert store.add_many(reversed(records)) == 5
+    assert store.load_all() == records
+    assert store.get(saved[2]["name"]) == records[2]
+    assert store.get("nobody") is None
+
+
+def test_add_many_replaces_by_name_and_bumps_revision(store, saved):
+    store.add_many([record(saved[0], 1)])
+    revision = store.revision
+    replacement = record({**saved[1], "name": saved[0]["name"]}, 2)
+    store.add(replacement)
+    assert store.load_all() == [replacement]
+    assert store.revision == revision + 1
+
+
+@pytest.mark.parametrize("team_id", [-1, 2**16])
+def test_out_of_range_team_ids_are_rejected(store, saved, team_id):
+    bad = record({**saved[1], "table": [team_id, *saved[1]["table"][1:]]}, 2)
+    with pytest.raises(ValueError):
+        store.add_many([record(saved[0], 1), bad])
+    assert len(store) == 0
+
+
+def test_prediction_round_trip(store, saved, bootstrap_static):
+    registry = Registry(bootstrap_static["teams"], bootstrap_static["elements"])
+    prediction = record(saved[0], 1).to_prediction(registry)
+    store.add(PredictionRecord.from_prediction(prediction, "snap"))
+    loaded = store.get(prediction.name).to_prediction(registry)
+    assert loaded.to_ids() == prediction.to_ids() == saved[0]
+
+
+def test_import_json(store, saved, tmp_path):
+    for number, data in enumerate(saved):
+        path = tmp_path / f"{data['name']}.json"
+        path.write_text(json.dumps(data))
+        os.utime(path, (number, number))
+    (tmp_path / "notes.txt").write_text("not a prediction")
+    assert store.import_json(tmp_path, "snap") == 5
+    loaded = store.load_all()
+    assert [record.created_at for record in loaded] == [0, 1, 2, 3, 4]
+    assert [
+        {
+            "name": record.name,
+            "table": record.table,
+            "top_scorer": record.top_scorer,
+            "top_assister": record.top_assister,
+            "top_keeper": record.top_keeper,
+        }
+        for record in loaded
+    ] == saved
+    assert {record.snapshot for record in loaded} == {"snap"}